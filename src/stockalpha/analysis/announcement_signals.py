@@ -0,0 +1,113 @@
+# src/stockalpha/analysis/announcement_signals.py
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from stockalpha.utils.config import settings
+
+SIGNAL_TYPE = "announcement"
+
+# How much an announcement's category says about future returns; categories
+# not listed use DEFAULT_CATEGORY_WEIGHT
+CATEGORY_WEIGHTS = {
+    "earnings": 0.9,
+    "guidance": 0.9,
+    "merger_acquisition": 0.85,
+    "dividend": 0.8,
+    "buyback": 0.8,
+    "legal": 0.75,
+    "management_change": 0.7,
+    "product": 0.7,
+}
+DEFAULT_CATEGORY_WEIGHT = 0.5
+
+# Sentiment scores closer to zero than this produce no signal
+NEUTRAL_BAND = 0.1
+
+
+class AnnouncementSignalScorer:
+    """
+    Turn classified announcements into trading signals, a chunk at a time.
+
+    Direction follows the sign of the sentiment score and strength its
+    magnitude. Confidence scales the category weight by the magnitude, and
+    signals below min_confidence are dropped.
+    """
+
+    def __init__(
+        self,
+        category_weights: Optional[Mapping[str, float]] = None,
+        min_confidence: float = 0.7,
+        neutral_band: float = NEUTRAL_BAND,
+    ):
+        self.category_weights = dict(category_weights or CATEGORY_WEIGHTS)
+        self.min_confidence = min_confidence
+        self.neutral_band = neutral_band
+
+    @classmethod
+    def from_config(cls) -> "AnnouncementSignalScorer":
+        """Build from analysis.announcement_classification in config.yaml"""
+        config = settings.yaml_config.get("analysis", {}).get(
+            "announcement_classification", {}
+        )
+        return cls(
+            category_weights=config.get("category_weights"),
+            min_confidence=config.get("confidence_threshold", 0.7),
+        )
+
+    def score(self, announcements: Sequence[Any]) -> List[Dict[str, Any]]:
+        """
+        Build Signal rows for the announcements that warrant one.
+
+        announcements are rows with id, company_id, date, primary_category
+        and a non-null sentiment_score.
+        """
+        if not announcements:
+            return []
+
+        sentiment = np.clip(
+            np.fromiter(
+                (a.sentiment_score for a in announcements),
+                dtype=np.float64,
+                count=len(announcements),
+            ),
+            -1.0,
+            1.0,
+        )
+        weights = np.fromiter(
+            (
+                self.category_weights.get(a.primary_category, DEFAULT_CATEGORY_WEIGHT)
+                for a in announcements
+            ),
+            dtype=np.float64,
+            count=len(announcements),
+        )
+
+        magnitude = np.abs(sentiment)
+        direction = np.where(magnitude >= self.neutral_band, np.sign(sentiment), 0)
+        confidence = weights * (0.5 + 0.5 * magnitude)
+        emit = (direction != 0) & (confidence >= self.min_confidence)
+
+        signals = []
+        for i in np.flatnonzero(emit).tolist():
+            a = announcements[i]
+            signals.append(
+                {
+                    "company_id": a.company_id,
+                    "date": a.date,
+                    "signal_type": SIGNAL_TYPE,
+                    "direction": int(direction[i]),
+                    "strength": float(magnitude[i]),
+                    "confidence": float(confidence[i]),
+                    "reason": (
+                        f"{a.primary_category or 'Uncategorized'} "
+                        f"announcement with sentiment {sentiment[i]:+.2f}"
+                    ),
+                    "source_announcement_id": a.id,
+                    "source_details": {
+                        "primary_category": a.primary_category,
+                        "sentiment_score": float(sentiment[i]),
+                    },
+                }
+            )
+        return signals
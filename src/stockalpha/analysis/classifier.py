@@ -0,0 +1,161 @@
+# src/stockalpha/analysis/classifier.py
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from stockalpha.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Memoized classifications kept per process, by content hash
+CLASSIFICATION_CACHE_SIZE = 100_000
+
+# Categories below confidence_threshold are reported as this one
+FALLBACK_CATEGORY = "other"
+
+
+class Classification(NamedTuple):
+    primary_category: str
+    sub_categories: List[str]
+    sentiment_score: float
+
+
+def content_hash(title: str, content: Optional[str]) -> bytes:
+    """Hash of an announcement's text, ignoring surrounding whitespace"""
+    text = f"{title.strip()}\0{(content or '').strip()}"
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+class AnnouncementClassifier:
+    """
+    Classify announcements with a pickled scikit-learn style model.
+
+    The pickle holds a dict with a "category" classifier (predict_proba and
+    classes_) and a "sentiment" regressor (predict, scores in [-1, 1]), both
+    taking raw "title\\ncontent" strings. The model is loaded on first use,
+    every batch makes one call to each, and results are memoized by content
+    hash so duplicate announcements are only classified once per process.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        confidence_threshold: float = 0.7,
+        sub_category_threshold: float = 0.3,
+        cache_size: int = CLASSIFICATION_CACHE_SIZE,
+    ):
+        self.model_path = model_path
+        self.confidence_threshold = confidence_threshold
+        self.sub_category_threshold = sub_category_threshold
+        self.cache_size = cache_size
+        self._model: Optional[Dict[str, Any]] = None
+        self._load_lock = threading.Lock()
+        self._cache: "OrderedDict[bytes, Classification]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model(self) -> Dict[str, Any]:
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    logger.info(f"Loading announcement classifier {self.model_path}")
+                    with open(self.model_path, "rb") as f:
+                        self._model = pickle.load(f)
+        return self._model
+
+    def classify(
+        self, announcements: Sequence[Tuple[str, Optional[str]]]
+    ) -> List[Classification]:
+        """Classify (title, content) pairs, in order"""
+        keys = [content_hash(title, content) for title, content in announcements]
+
+        results: Dict[bytes, Classification] = {}
+        with self._cache_lock:
+            for key in keys:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[key] = cached
+            self.hits += sum(key in results for key in keys)
+
+        # Each distinct new text goes through the model once
+        pending: Dict[bytes, str] = {}
+        for key, (title, content) in zip(keys, announcements):
+            if key not in results and key not in pending:
+                pending[key] = f"{title}\n{content or ''}"
+
+        if pending:
+            computed = dict(zip(pending, self._predict(list(pending.values()))))
+            results.update(computed)
+            with self._cache_lock:
+                self.misses += len(computed)
+                self._cache.update(computed)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [results[key] for key in keys]
+
+    def _predict(self, texts: List[str]) -> List[Classification]:
+        category_model = self.model["category"]
+        probabilities = np.asarray(category_model.predict_proba(texts))
+        classes = np.asarray(category_model.classes_)
+        sentiment = np.clip(
+            np.asarray(self.model["sentiment"].predict(texts), dtype=np.float64),
+            -1.0,
+            1.0,
+        )
+
+        # Classes ordered by probability, most likely first
+        order = np.argsort(-probabilities, axis=1)
+        best = probabilities[np.arange(len(texts)), order[:, 0]]
+
+        classifications = []
+        for i in range(len(texts)):
+            primary = (
+                str(classes[order[i, 0]])
+                if best[i] >= self.confidence_threshold
+                else FALLBACK_CATEGORY
+            )
+            sub_categories = [
+                str(classes[j])
+                for j in order[i, 1:]
+                if probabilities[i, j] >= self.sub_category_threshold
+            ]
+            classifications.append(
+                Classification(primary, sub_categories, float(sentiment[i]))
+            )
+        return classifications
+
+
+@lru_cache()
+def get_classifier() -> Optional[AnnouncementClassifier]:
+    """
+    The process-wide classifier from analysis.announcement_classification.
+
+    None when use_ml_model is off or the model file is missing. The model
+    itself is only loaded by the first classification.
+    """
+    config = settings.yaml_config.get("analysis", {}).get(
+        "announcement_classification", {}
+    )
+    model_path = config.get("model_path")
+    if not config.get("use_ml_model") or not model_path:
+        return None
+    if not os.path.exists(model_path):
+        logger.warning(f"Announcement classifier {model_path} not found")
+        return None
+
+    return AnnouncementClassifier(
+        model_path,
+        confidence_threshold=config.get("confidence_threshold", 0.7),
+        sub_category_threshold=config.get("sub_category_threshold", 0.3),
+    )
@@ -0,0 +1,521 @@
+# src/stockalpha/analysis/indicators.py
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from stockalpha.repositories.price_cache import PriceHistory
+from stockalpha.utils.config import settings
+
+# Used when config.yaml does not set analysis.technical_analysis.default_indicators
+DEFAULT_INDICATORS = ("SMA:20", "SMA:50", "SMA:200", "RSI:14", "MACD:12:26:9")
+
+Outputs = Dict[str, np.ndarray]
+
+
+# Vectorized kernels. Each accepts a (T,) series or a (T, N) panel with one
+# column per company and works down axis 0.
+#
+# NaN bars are skipped: they output NaN and the bars on either side are
+# treated as adjacent, exactly as if the NaN bars were not in the series.
+# Leading NaNs (padding) are therefore harmless, and the streaming states
+# below follow the same rule bar by bar.
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the last `window` non-NaN values, once there are that many"""
+    panel = values if values.ndim == 2 else values[:, None]
+    valid = ~np.isnan(panel)
+    zero = np.zeros((1, panel.shape[1]))
+    sums = np.concatenate([zero, np.cumsum(np.where(valid, panel, 0.0), axis=0)])
+    counts = np.concatenate([zero, np.cumsum(valid, axis=0)])
+
+    # Columns padded only at the start take the dense window sums
+    out = np.full(panel.shape, np.nan)
+    if len(panel) >= window:
+        full = counts[window:] - counts[:-window] == window
+        out[window - 1 :] = np.where(
+            full, (sums[window:] - sums[:-window]) / window, np.nan
+        )
+
+    # Columns with gaps are windowed over their valid bars only, where the
+    # bar `window` values back sits `window` positions earlier
+    gapped = np.flatnonzero((valid[1:] < valid[:-1]).any(axis=0))
+    if len(gapped):
+        column, row = np.nonzero(valid[:, gapped].T)
+        column = gapped[column]
+        running = sums[row + 1, column]
+        count = counts[row + 1, column]
+        lagged = running[np.maximum(np.arange(len(row)) - window, 0)]
+        filled = count >= window
+        out[row, column] = np.where(
+            filled, (running - np.where(count > window, lagged, 0.0)) / window, np.nan
+        )
+    return out.reshape(values.shape)
+
+
+def ewm(values: np.ndarray, alpha: float, seed_window: int) -> np.ndarray:
+    """
+    Exponential smoothing seeded with the SMA of the first seed_window values.
+
+    The recursion runs once per bar over every column at the same time.
+    """
+    seed = rolling_mean(values, seed_window)
+    out = np.full(values.shape, np.nan)
+    state = np.full(values.shape[1:], np.nan)
+    for t in range(len(values)):
+        valid = ~np.isnan(values[t])
+        state = np.where(
+            np.isnan(state),
+            seed[t],
+            np.where(valid, state + alpha * (values[t] - state), state),
+        )
+        out[t] = np.where(valid, state, np.nan)
+    return out
+
+
+def _rsi(avg_gain: Any, avg_loss: Any) -> Any:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # Flat windows have no losses: 100 after gains, 50 when nothing moved
+    return np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), rsi)
+
+
+def _previous_valid(values: np.ndarray) -> np.ndarray:
+    """The last non-NaN value before each bar, NaN where there is none"""
+    rows = np.arange(len(values)).reshape((-1,) + (1,) * (values.ndim - 1))
+    last = np.where(np.isnan(values), -1, rows)
+    np.maximum.accumulate(last, axis=0, out=last)
+    before = np.concatenate([np.full((1,) + values.shape[1:], -1), last])[:-1]
+    previous = np.take_along_axis(values, np.maximum(before, 0), axis=0)
+    return np.where(before >= 0, previous, np.nan)
+
+
+def _gains_losses(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    delta = values - _previous_valid(values)
+    missing = np.isnan(delta)
+    return (
+        np.where(missing, np.nan, np.maximum(delta, 0.0)),
+        np.where(missing, np.nan, np.maximum(-delta, 0.0)),
+    )
+
+
+# Streaming state. Each update consumes one new bar in O(1).
+
+
+class _RollingMeanState:
+    def __init__(self, window: int, history: np.ndarray):
+        tail = history[~np.isnan(history)][-window:]
+        self.window = window
+        self.buffer = deque(tail.tolist(), maxlen=window)
+        self.total = float(tail.sum())
+
+    def update(self, value: float) -> float:
+        if math.isnan(value):
+            return np.nan
+        if len(self.buffer) == self.window:
+            self.total -= self.buffer[0]
+        self.buffer.append(value)
+        self.total += value
+        return self.total / self.window if len(self.buffer) == self.window else np.nan
+
+
+class _EWMState:
+    def __init__(self, alpha: float, seed_window: int, history: np.ndarray):
+        self.alpha = alpha
+        # Skipping NaN bars, the state is the last value over the valid bars
+        valid = history[~np.isnan(history)]
+        self.value = float(ewm(valid, alpha, seed_window)[-1]) if len(valid) else np.nan
+        self.seed: Optional[_RollingMeanState] = None
+        if math.isnan(self.value):
+            self.seed = _RollingMeanState(seed_window, history)
+
+    def update(self, value: float) -> float:
+        if math.isnan(value):
+            return np.nan
+        if self.seed is not None:
+            self.value = self.seed.update(value)
+            if not math.isnan(self.value):
+                self.seed = None
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class IndicatorStream(ABC):
+    """Incremental state for one indicator over one series"""
+
+    @abstractmethod
+    def update(self, value: float) -> Dict[str, float]:
+        """Consume one bar and return the indicator's outputs for it"""
+
+
+class Indicator(ABC):
+    """A parsed indicator spec such as "SMA:20" or "MACD:12:26:9" """
+
+    name = ""
+    arity = 1
+
+    def __init__(self, *periods: int):
+        if len(periods) != self.arity or min(periods) < 1:
+            raise ValueError(
+                f"{self.name} takes {self.arity} positive period(s), got {periods}"
+            )
+        self.periods = periods
+
+    @property
+    def key(self) -> str:
+        return ":".join([self.name, *map(str, self.periods)])
+
+    @property
+    def output_keys(self) -> List[str]:
+        return [self.key]
+
+    @abstractmethod
+    def compute(self, values: np.ndarray) -> Outputs:
+        """Compute the full output series for a (T,) or (T, N) array"""
+
+    @abstractmethod
+    def stream(self, history: np.ndarray) -> IndicatorStream:
+        """Build streaming state positioned after the last bar of history"""
+
+
+class SMA(Indicator):
+    name = "SMA"
+
+    def compute(self, values: np.ndarray) -> Outputs:
+        return {self.key: rolling_mean(values, self.periods[0])}
+
+    def stream(self, history: np.ndarray) -> IndicatorStream:
+        return _SingleStream(self.key, _RollingMeanState(self.periods[0], history))
+
+
+class EMA(Indicator):
+    name = "EMA"
+
+    def compute(self, values: np.ndarray) -> Outputs:
+        span = self.periods[0]
+        return {self.key: ewm(values, 2.0 / (span + 1), span)}
+
+    def stream(self, history: np.ndarray) -> IndicatorStream:
+        span = self.periods[0]
+        return _SingleStream(self.key, _EWMState(2.0 / (span + 1), span, history))
+
+
+class RSI(Indicator):
+    """Wilder's relative strength index"""
+
+    name = "RSI"
+
+    def compute(self, values: np.ndarray) -> Outputs:
+        period = self.periods[0]
+        gains, losses = _gains_losses(values)
+        avg_gain = ewm(gains, 1.0 / period, period)
+        avg_loss = ewm(losses, 1.0 / period, period)
+        return {self.key: _rsi(avg_gain, avg_loss)}
+
+    def stream(self, history: np.ndarray) -> IndicatorStream:
+        return _RSIStream(self.key, self.periods[0], history)
+
+
+class MACD(Indicator):
+    """MACD line, signal line and histogram"""
+
+    name = "MACD"
+    arity = 3
+
+    @property
+    def output_keys(self) -> List[str]:
+        return [self.key, f"{self.key}:signal", f"{self.key}:histogram"]
+
+    def compute(self, values: np.ndarray) -> Outputs:
+        fast, slow, signal = self.periods
+        line = ewm(values, 2.0 / (fast + 1), fast) - ewm(values, 2.0 / (slow + 1), slow)
+        signal_line = ewm(line, 2.0 / (signal + 1), signal)
+        return dict(zip(self.output_keys, (line, signal_line, line - signal_line)))
+
+    def stream(self, history: np.ndarray) -> IndicatorStream:
+        return _MACDStream(self, history)
+
+
+class _SingleStream(IndicatorStream):
+    def __init__(self, key: str, state: Any):
+        self.key = key
+        self.state = state
+
+    def update(self, value: float) -> Dict[str, float]:
+        return {self.key: self.state.update(value)}
+
+
+class _RSIStream(IndicatorStream):
+    def __init__(self, key: str, period: int, history: np.ndarray):
+        gains, losses = _gains_losses(history)
+        valid = history[~np.isnan(history)]
+        self.key = key
+        self.previous = float(valid[-1]) if len(valid) else np.nan
+        self.gain = _EWMState(1.0 / period, period, gains)
+        self.loss = _EWMState(1.0 / period, period, losses)
+
+    def update(self, value: float) -> Dict[str, float]:
+        if math.isnan(value):
+            return {self.key: np.nan}
+        delta = value - self.previous
+        self.previous = value
+        if math.isnan(delta):
+            return {self.key: np.nan}
+
+        avg_gain = np.float64(self.gain.update(max(delta, 0.0)))
+        avg_loss = np.float64(self.loss.update(max(-delta, 0.0)))
+        return {self.key: float(_rsi(avg_gain, avg_loss))}
+
+
+class _MACDStream(IndicatorStream):
+    def __init__(self, indicator: MACD, history: np.ndarray):
+        fast, slow, signal = indicator.periods
+        self.keys = indicator.output_keys
+        self.fast = _EWMState(2.0 / (fast + 1), fast, history)
+        self.slow = _EWMState(2.0 / (slow + 1), slow, history)
+        line = indicator.compute(history)[indicator.key] if len(history) else history
+        self.signal = _EWMState(2.0 / (signal + 1), signal, line)
+
+    def update(self, value: float) -> Dict[str, float]:
+        line = self.fast.update(value) - self.slow.update(value)
+        signal_line = self.signal.update(line)
+        return dict(zip(self.keys, (line, signal_line, line - signal_line)))
+
+
+INDICATORS: Dict[str, Type[Indicator]] = {
+    cls.name: cls for cls in (SMA, EMA, RSI, MACD)
+}
+
+
+def parse_indicator(spec: str) -> Indicator:
+    """Parse a "NAME:period[:period...]" spec, as used in config.yaml"""
+    name, *periods = spec.strip().split(":")
+    cls = INDICATORS.get(name.upper())
+    if cls is None:
+        raise ValueError(f"Unknown indicator: {name}")
+
+    try:
+        return cls(*(int(p) for p in periods))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid indicator spec: {spec}")
+
+
+def parse_indicators(specs: Optional[Sequence[str]] = None) -> List[Indicator]:
+    """Parse specs, falling back to the configured default indicators"""
+    if not specs:
+        specs = (
+            settings.yaml_config.get("analysis", {})
+            .get("technical_analysis", {})
+            .get("default_indicators")
+            or DEFAULT_INDICATORS
+        )
+    return [parse_indicator(spec) for spec in specs]
+
+
+def compute_indicators(values: np.ndarray, indicators: Sequence[Indicator]) -> Outputs:
+    """Compute every indicator over a (T,) series or (T, N) panel"""
+    values = np.asarray(values, dtype=np.float64)
+    outputs: Outputs = {}
+    for indicator in indicators:
+        outputs.update(indicator.compute(values))
+    return outputs
+
+
+class IndicatorSet:
+    """Streaming state for several indicators over one price series"""
+
+    def __init__(self, indicators: Sequence[Indicator], history: np.ndarray):
+        history = np.asarray(history, dtype=np.float64)
+        self.streams = [indicator.stream(history) for indicator in indicators]
+
+    def update(self, value: float) -> Dict[str, float]:
+        """Consume one new bar and return the latest value of every output"""
+        latest: Dict[str, float] = {}
+        for stream in self.streams:
+            latest.update(stream.update(float(value)))
+        return latest
+
+
+@dataclass
+class IndicatorFrame:
+    """Indicator outputs for one company, aligned with its price dates"""
+
+    company_id: int
+    dates: np.ndarray  # datetime64[us]
+    closes: np.ndarray  # the input series
+    values: Outputs
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def window(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: Optional[int] = None,
+    ) -> "IndicatorFrame":
+        """Return the (inclusive) date window, keeping the latest `limit` bars"""
+        lo = 0
+        hi = len(self.dates)
+        if start_date is not None:
+            lo = int(
+                np.searchsorted(self.dates, np.datetime64(start_date), side="left")
+            )
+        if end_date is not None:
+            hi = int(np.searchsorted(self.dates, np.datetime64(end_date), side="right"))
+        if limit is not None:
+            lo = max(lo, hi - limit)
+
+        index = slice(lo, hi)
+        return IndicatorFrame(
+            company_id=self.company_id,
+            dates=self.dates[index],
+            closes=self.closes[index],
+            values={key: series[index] for key, series in self.values.items()},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready columns; NaN warm-up values become null"""
+        values = {}
+        for key, series in self.values.items():
+            column = series.astype(object)
+            column[np.isnan(series)] = None
+            values[key] = column.tolist()
+        return {
+            "company_id": self.company_id,
+            "dates": np.datetime_as_string(self.dates, unit="s").tolist(),
+            "values": values,
+        }
+
+
+@dataclass
+class _CacheEntry:
+    frame: IndicatorFrame
+    stream: IndicatorSet
+    # Output arrays with spare capacity at the end; frame.values are views
+    # of their first len(frame) bars
+    buffers: Outputs
+
+
+class IndicatorCache:
+    """
+    Per-company indicator frames kept current by streaming updates.
+
+    When a company's price history has only gained bars at the end since
+    the frame was computed, the new bars are pushed through the cached
+    IndicatorSet at O(1) per indicator instead of recomputing the series,
+    and written into buffers that grow geometrically, so appending a bar
+    costs amortized O(1) too.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, history: PriceHistory, indicators: Sequence[Indicator]
+    ) -> IndicatorFrame:
+        key = (history.company_id, tuple(i.key for i in indicators))
+        closes = history.close
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                count = len(entry.frame)
+                if (
+                    len(history) >= count
+                    and np.array_equal(history.dates[:count], entry.frame.dates)
+                    and np.array_equal(
+                        closes[:count], entry.frame.closes, equal_nan=True
+                    )
+                ):
+                    if len(history) > count:
+                        self._extend(entry, history)
+                    self._entries.move_to_end(key)
+                    return entry.frame
+
+        frame = IndicatorFrame(
+            company_id=history.company_id,
+            dates=history.dates,
+            closes=closes,
+            values=compute_indicators(closes, indicators),
+        )
+        stream = IndicatorSet(indicators, closes)
+
+        with self._lock:
+            self._entries[key] = _CacheEntry(frame, stream, dict(frame.values))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return frame
+
+    @staticmethod
+    def _extend(entry: _CacheEntry, history: PriceHistory) -> None:
+        """Stream the bars history gained into the entry's buffers"""
+        count = len(entry.frame)
+        length = len(history)
+        for key, buffer in entry.buffers.items():
+            if len(buffer) < length:
+                grown = np.empty(max(length, 2 * len(buffer)))
+                grown[:count] = buffer[:count]
+                entry.buffers[key] = grown
+
+        for t in range(count, length):
+            for key, value in entry.stream.update(history.close[t]).items():
+                entry.buffers[key][t] = value
+
+        # Earlier frames keep their shorter views; bars are only ever
+        # written past their end
+        entry.frame = IndicatorFrame(
+            company_id=entry.frame.company_id,
+            dates=history.dates,
+            closes=history.close,
+            values={key: buffer[:length] for key, buffer in entry.buffers.items()},
+        )
+
+
+def latest_indicators(
+    histories: Sequence[PriceHistory], indicators: Sequence[Indicator]
+) -> List[Dict[str, Any]]:
+    """
+    Compute the latest indicator values for a universe in one pass.
+
+    Close series are right-aligned into a (bars, companies) panel so every
+    kernel runs once over all companies.
+    """
+    histories = [h for h in histories if len(h)]
+    if not histories:
+        return []
+
+    length = max(len(h) for h in histories)
+    panel = np.full((length, len(histories)), np.nan)
+    for column, history in enumerate(histories):
+        panel[length - len(history) :, column] = history.close
+
+    outputs = compute_indicators(panel, indicators)
+    dates = np.datetime_as_string(
+        np.array([h.dates[-1] for h in histories]), unit="s"
+    ).tolist()
+    return [
+        {
+            "company_id": history.company_id,
+            "date": dates[column],
+            "values": {
+                key: None if np.isnan(series[-1, column]) else float(series[-1, column])
+                for key, series in outputs.items()
+            },
+        }
+        for column, history in enumerate(histories)
+    ]
+
+
+# Shared by the API routes in this process
+indicator_cache = IndicatorCache()
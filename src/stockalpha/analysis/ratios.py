@@ -0,0 +1,126 @@
+# src/stockalpha/analysis/ratios.py
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Layout of the FundamentalData rows compute_ratios reads
+FUNDAMENTAL_COLUMNS = (
+    "id",
+    "company_id",
+    "period",
+    "fiscal_year",
+    "fiscal_quarter",
+    "report_date",
+    "revenue",
+    "net_income",
+    "eps",
+    "total_assets",
+    "total_liabilities",
+    "total_equity",
+)
+METRIC_COLUMNS = FUNDAMENTAL_COLUMNS[6:]
+
+RATIO_COLUMNS = (
+    "net_margin",
+    "roe",
+    "roa",
+    "debt_to_equity",
+    "debt_to_assets",
+    "revenue_growth_yoy",
+    "net_income_growth_yoy",
+    "eps_growth_yoy",
+    "revenue_growth_qoq",
+    "net_income_growth_qoq",
+    "eps_growth_qoq",
+)
+
+PeriodKey = Tuple[int, str, int, int]
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Elementwise ratio, NaN where either side is missing or the divisor is 0"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = numerator / denominator
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+def _growth(values: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """Change relative to the previous row, NaN where it is missing"""
+    base = np.where(previous >= 0, values[np.maximum(previous, 0)], np.nan)
+    return _divide(values - base, np.abs(base))
+
+
+def compute_ratios(rows: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Derive FundamentalRatio rows from FundamentalData rows.
+
+    rows follow FUNDAMENTAL_COLUMNS and must include each period's
+    comparison periods (a year earlier, and the previous quarter) for the
+    growth figures to be filled in. Ratios that cannot be computed are None.
+    """
+    if not rows:
+        return []
+
+    count = len(rows)
+    metrics = {
+        name: np.fromiter(
+            (np.nan if row[offset] is None else row[offset] for row in rows),
+            dtype=np.float64,
+            count=count,
+        )
+        for offset, name in enumerate(METRIC_COLUMNS, start=6)
+    }
+
+    # Position of each period's comparison rows, -1 where there is none
+    positions: Dict[PeriodKey, int] = {
+        (row[1], row[2], row[3], row[4] or 0): i for i, row in enumerate(rows)
+    }
+    year_ago = np.full(count, -1, dtype=np.int64)
+    quarter_ago = np.full(count, -1, dtype=np.int64)
+    for i, row in enumerate(rows):
+        company_id, period, year, quarter = row[1], row[2], row[3], row[4] or 0
+        year_ago[i] = positions.get((company_id, period, year - 1, quarter), -1)
+        if quarter:
+            previous = (year, quarter - 1) if quarter > 1 else (year - 1, 4)
+            quarter_ago[i] = positions.get((company_id, period, *previous), -1)
+
+    revenue = metrics["revenue"]
+    net_income = metrics["net_income"]
+    eps = metrics["eps"]
+    ratios = {
+        "net_margin": _divide(net_income, revenue),
+        "roe": _divide(net_income, metrics["total_equity"]),
+        "roa": _divide(net_income, metrics["total_assets"]),
+        "debt_to_equity": _divide(
+            metrics["total_liabilities"], metrics["total_equity"]
+        ),
+        "debt_to_assets": _divide(
+            metrics["total_liabilities"], metrics["total_assets"]
+        ),
+        "revenue_growth_yoy": _growth(revenue, year_ago),
+        "net_income_growth_yoy": _growth(net_income, year_ago),
+        "eps_growth_yoy": _growth(eps, year_ago),
+        "revenue_growth_qoq": _growth(revenue, quarter_ago),
+        "net_income_growth_qoq": _growth(net_income, quarter_ago),
+        "eps_growth_qoq": _growth(eps, quarter_ago),
+    }
+
+    # JSON and SQL have no NaN; missing values go back to None
+    columns = {}
+    for name, values in ratios.items():
+        column = values.astype(object)
+        column[np.isnan(values)] = None
+        columns[name] = column.tolist()
+    return [
+        {
+            "fundamental_id": row[0],
+            "company_id": row[1],
+            "period": row[2],
+            "fiscal_year": row[3],
+            "fiscal_quarter": row[4],
+            "report_date": row[5],
+            **{name: columns[name][i] for name in RATIO_COLUMNS},
+        }
+        for i, row in enumerate(rows)
+    ]
@@ -0,0 +1,254 @@
+# src/stockalpha/analysis/screener.py
+import operator
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from stockalpha.repositories.fundamentals_snapshot import (
+    SNAPSHOT_METRICS,
+    FundamentalsSnapshot,
+)
+
+# Field names mapped to the FundamentalsSnapshot arrays holding them
+TEXT_FIELDS = {"ticker": "tickers", "sector": "sectors", "industry": "industries"}
+NUMERIC_FIELDS = SNAPSHOT_METRICS + ("fiscal_year",)
+
+COMPARISONS: Dict[str, Callable[[Any, Any], Any]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?%?)
+      | (?P<string>'[^']*'|"[^"]*")
+      | (?P<op><=|>=|==|!=|<|>|=)
+      | (?P<paren>[()])
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )
+    """,
+    re.VERBOSE,
+)
+
+# Evaluates to a boolean mask over the snapshot rows
+Predicate = Callable[[FundamentalsSnapshot], np.ndarray]
+
+# Masks of the rows where a sub-expression is true and where it is false.
+# Rows in neither depend on a missing figure, so that "not" and "!=" do not
+# turn a missing figure into a match
+_Truth = Tuple[np.ndarray, np.ndarray]
+_Clause = Callable[[FundamentalsSnapshot], _Truth]
+
+
+class ScreenError(ValueError):
+    """Raised when a screen expression cannot be parsed"""
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = TOKEN_PATTERN.match(expression, position)
+        if match is None or match.lastgroup is None:
+            raise ScreenError(f"Unexpected character at position {position}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "name" and value.lower() in ("and", "or", "not"):
+            kind, value = "keyword", value.lower()
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent parser for screen expressions.
+
+        expression := term ("or" term)*
+        term       := factor ("and" factor)*
+        factor     := "not" factor | "(" expression ")" | comparison
+        comparison := operand op operand
+        operand    := field | number | number% | 'text'
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def parse(self) -> Predicate:
+        if not self.tokens:
+            raise ScreenError("Empty screen expression")
+        clause = self._expression()
+        if self.position < len(self.tokens):
+            raise ScreenError(f"Unexpected {self.tokens[self.position][1]!r}")
+        return lambda s: clause(s)[0]
+
+    def _peek(self) -> Tuple[Optional[str], Optional[str]]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None, None
+
+    def _next(self) -> Tuple[str, str]:
+        if self.position >= len(self.tokens):
+            raise ScreenError("Unexpected end of screen expression")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _expression(self) -> _Clause:
+        clause = self._term()
+        while self._peek() == ("keyword", "or"):
+            self._next()
+            clause = self._combine(clause, self._term(), either=True)
+        return clause
+
+    def _term(self) -> _Clause:
+        clause = self._factor()
+        while self._peek() == ("keyword", "and"):
+            self._next()
+            clause = self._combine(clause, self._factor(), either=False)
+        return clause
+
+    @staticmethod
+    def _combine(left: _Clause, right: _Clause, either: bool) -> _Clause:
+        def clause(s: FundamentalsSnapshot) -> _Truth:
+            (left_true, left_false), (right_true, right_false) = left(s), right(s)
+            if either:
+                return left_true | right_true, left_false & right_false
+            return left_true & right_true, left_false | right_false
+
+        return clause
+
+    def _factor(self) -> _Clause:
+        if self._peek() == ("keyword", "not"):
+            self._next()
+            inner = self._factor()
+            return lambda s: inner(s)[::-1]
+        if self._peek() == ("paren", "("):
+            self._next()
+            clause = self._expression()
+            if self._next() != ("paren", ")"):
+                raise ScreenError("Expected ')'")
+            return clause
+        return self._comparison()
+
+    def _comparison(self) -> _Clause:
+        left = self._operand()
+        kind, op = self._next()
+        if kind != "op":
+            raise ScreenError(f"Expected a comparison after {left[1]!r}, got {op!r}")
+        right = self._operand()
+
+        if "text" in (left[0], right[0]):
+            if op not in ("=", "==", "!="):
+                raise ScreenError(f"{op} cannot compare text")
+            if {left[0], right[0]} - {"text", "string"}:
+                raise ScreenError("Text fields can only be compared with 'text'")
+        elif "string" in (left[0], right[0]):
+            raise ScreenError("Quoted values can only be compared with text fields")
+
+        compare = COMPARISONS[op]
+        get_left, get_right = self._getter(left), self._getter(right)
+
+        def clause(s: FundamentalsSnapshot) -> _Truth:
+            left_values, right_values = get_left(s), get_right(s)
+            result = np.asarray(compare(left_values, right_values), dtype=bool)
+            known = _present(left_values) & _present(right_values)
+            return (
+                np.broadcast_to(result & known, (len(s),)),
+                np.broadcast_to(~result & known, (len(s),)),
+            )
+
+        return clause
+
+    def _operand(self) -> Tuple[str, Any]:
+        kind, value = self._next()
+        if kind == "number":
+            if value.endswith("%"):
+                return "number", float(value[:-1]) / 100
+            return "number", float(value)
+        if kind == "string":
+            return "string", value[1:-1]
+        if kind == "name":
+            name = value.lower()
+            if name in TEXT_FIELDS:
+                return "text", name
+            if name in NUMERIC_FIELDS:
+                return "field", name
+            raise ScreenError(
+                f"Unknown field {value!r} "
+                f"(fields: {', '.join((*TEXT_FIELDS, *NUMERIC_FIELDS))})"
+            )
+        raise ScreenError(f"Expected a field or value, got {value!r}")
+
+    @staticmethod
+    def _getter(operand: Tuple[str, Any]) -> Callable[[FundamentalsSnapshot], Any]:
+        kind, value = operand
+        if kind == "text":
+            return lambda s: getattr(s, TEXT_FIELDS[value])
+        if kind == "field":
+            if value == "fiscal_year":
+                return lambda s: s.fiscal_years
+            return lambda s: s.metrics[value]
+        return lambda s: value
+
+
+def _present(values: Any) -> Any:
+    """Whether each value is there: not NaN, or for text fields, not None"""
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        return ~np.isnan(values)
+    if values.dtype == object:
+        return np.not_equal(values, np.array(None, dtype=object))
+    return np.ones(values.shape, dtype=bool)
+
+
+def parse_screen(expression: str) -> Predicate:
+    """
+    Compile a screen expression such as "pe < 15 and revenue_growth > 10%".
+
+    Fields are compared with numbers (a % suffix divides by 100), other
+    fields, or for ticker, sector and industry, quoted text. Comparisons
+    with a missing figure are neither true nor false, so they never match,
+    not even as "!=" or under "not".
+    """
+    return _Parser(_tokenize(expression)).parse()
+
+
+def screen(
+    snapshot: FundamentalsSnapshot,
+    expression: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    descending: bool = False,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    """
+    Companies in the snapshot matching the expression.
+
+    Sorted by a numeric field with missing values last, otherwise by
+    company id.
+    """
+    index = np.arange(len(snapshot))
+    if expression:
+        index = np.flatnonzero(parse_screen(expression)(snapshot))
+
+    if sort_by is not None:
+        if sort_by not in NUMERIC_FIELDS:
+            raise ScreenError(f"Cannot sort by {sort_by!r}")
+        values = (
+            snapshot.fiscal_years[index]
+            if sort_by == "fiscal_year"
+            else snapshot.metrics[sort_by][index]
+        )
+        keys = -values if descending else values
+        index = index[np.lexsort((keys, np.isnan(keys)))]
+
+    return snapshot.to_records(index[:limit])
@@ -0,0 +1,225 @@
+# src/stockalpha/api/arrow.py
+import io
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from stockalpha.repositories.price_cache import PRICE_COLUMNS, PriceHistory
+from stockalpha.repositories.universe_snapshot import (
+    DATE_FIELDS,
+    PANEL_FIELDS,
+    UniversePanel,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Media type and file extension for each columnar export format
+COLUMNAR_FORMATS = {
+    "arrow": (ARROW_STREAM_MEDIA_TYPE, "arrows"),
+    "parquet": (PARQUET_MEDIA_TYPE, "parquet"),
+}
+
+# Column layouts, in the order the repositories select them
+PRICE_DATA_FIELDS = (
+    ("id", "int64"),
+    ("date", "timestamp"),
+    *((name, "float64") for name in PRICE_COLUMNS),
+    ("company_id", "int64"),
+)
+
+SIGNAL_FIELDS = (
+    ("id", "int64"),
+    ("company_id", "int64"),
+    ("date", "timestamp"),
+    ("signal_type", "string"),
+    ("direction", "int64"),
+    ("strength", "float64"),
+    ("confidence", "float64"),
+    ("reason", "string"),
+    ("source_announcement_id", "int64"),
+    ("source_details", "string"),  # JSON text
+    ("created_at", "timestamp"),
+    ("updated_at", "timestamp"),
+)
+
+# A universe panel in long format, one row per (date, company)
+UNIVERSE_PANEL_FIELDS = (
+    ("date", "timestamp"),
+    ("company_id", "int64"),
+    *(
+        (name, "timestamp" if name in DATE_FIELDS else "float64")
+        for name in PANEL_FIELDS
+    ),
+)
+
+# Panel dates encoded per record batch
+PANEL_BATCH_DATES = 256
+
+Rows = List[Tuple[Any, ...]]
+
+
+def columnar_format(request: Request) -> Optional[str]:
+    """Return "arrow" or "parquet" when the Accept header asks for it"""
+    accept = request.headers.get("accept", "")
+    for format, (media_type, _) in COLUMNAR_FORMATS.items():
+        if media_type in accept:
+            return format
+    return None
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise HTTPException(
+            status_code=406, detail="Arrow and Parquet responses require pyarrow"
+        )
+
+
+def make_schema(fields: Iterable[Tuple[str, str]]) -> "pa.Schema":
+    """Build an Arrow schema from (name, type) pairs"""
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "timestamp": pa.timestamp("us"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in fields])
+
+
+def rows_to_batch(schema: "pa.Schema", rows: Rows) -> "pa.RecordBatch":
+    """Transpose query row tuples into one Arrow record batch"""
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def history_to_batch(history: PriceHistory) -> "pa.RecordBatch":
+    """
+    Wrap a cached PriceHistory as a record batch.
+
+    The id, date and price buffers are shared with the cached arrays; NaN
+    prices become nulls through a validity bitmap.
+    """
+    schema = make_schema(PRICE_DATA_FIELDS)
+    prices = [
+        pa.array(getattr(history, name), from_pandas=True) for name in PRICE_COLUMNS
+    ]
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(history.ids),
+            pa.array(history.dates),
+            *prices,
+            pa.array(np.full(len(history), history.company_id, dtype=np.int64)),
+        ],
+        schema=schema,
+    )
+
+
+def _encode(
+    format: str, schema: "pa.Schema", batches: Iterable["pa.RecordBatch"]
+) -> Iterator[bytes]:
+    buffer = io.BytesIO()
+    if format == "parquet":
+        writer = pq.ParquetWriter(buffer, schema)
+    else:
+        writer = pa.ipc.new_stream(buffer, schema)
+
+    # Hand each encoded batch to the client as soon as it is written
+    for batch in batches:
+        writer.write_batch(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    writer.close()
+    yield buffer.getvalue()
+
+
+def columnar_response(
+    format: str,
+    schema: "pa.Schema",
+    batches: Iterable["pa.RecordBatch"],
+    filename: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """Stream record batches as an Arrow IPC stream or a Parquet file"""
+    media_type, extension = COLUMNAR_FORMATS[format]
+    return StreamingResponse(
+        _encode(format, schema, batches),
+        media_type=media_type,
+        headers={
+            **(headers or {}),
+            "Content-Disposition": f'attachment; filename="{filename}.{extension}"',
+        },
+    )
+
+
+def rows_response(
+    format: str,
+    fields: Iterable[Tuple[str, str]],
+    batches: Iterable[Rows],
+    filename: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """Encode batches of row tuples laid out as fields"""
+    _require_pyarrow()
+    schema = make_schema(fields)
+    return columnar_response(
+        format,
+        schema,
+        (rows_to_batch(schema, rows) for rows in batches),
+        filename,
+        headers,
+    )
+
+
+def history_response(
+    format: str, history: PriceHistory, filename: str
+) -> StreamingResponse:
+    """Encode a cached price history without going through row tuples"""
+    _require_pyarrow()
+    batch = history_to_batch(history)
+    return columnar_response(format, batch.schema, [batch], filename)
+
+
+def panel_to_batches(panel: UniversePanel) -> Iterator["pa.RecordBatch"]:
+    """
+    Flatten a panel into long-format record batches of PANEL_BATCH_DATES days.
+
+    Each (T, N) field is raveled date-major; NaN and NaT become nulls.
+    """
+    schema = make_schema(UNIVERSE_PANEL_FIELDS)
+    width = len(panel.company_ids)
+    for start in range(0, len(panel.dates), PANEL_BATCH_DATES):
+        rows = slice(start, start + PANEL_BATCH_DATES)
+        dates = panel.dates[rows]
+        columns = [
+            pa.array(np.repeat(dates, width).astype("datetime64[us]")),
+            pa.array(np.tile(panel.company_ids, len(dates))),
+        ]
+        for name in PANEL_FIELDS:
+            values = panel.fields[name][rows].ravel()
+            if name in DATE_FIELDS:
+                values = values.astype("datetime64[us]")
+            columns.append(pa.array(values, from_pandas=True))
+        yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def panel_response(
+    format: str, panel: UniversePanel, filename: str
+) -> StreamingResponse:
+    """Encode a universe panel in long format, one row per (date, company)"""
+    _require_pyarrow()
+    return columnar_response(
+        format, make_schema(UNIVERSE_PANEL_FIELDS), panel_to_batches(panel), filename
+    )
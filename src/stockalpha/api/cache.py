@@ -0,0 +1,136 @@
+# src/stockalpha/api/cache.py
+import hashlib
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+
+from stockalpha.models.base import Base
+from stockalpha.utils.cache import response_cache
+from stockalpha.utils.config import settings
+from stockalpha.utils.database import reads_from_primary
+
+EndpointType = TypeVar("EndpointType", bound=Callable[..., Any])
+
+# Tables whose writes invalidate each @cached endpoint's responses
+_cache_tables: Dict[Callable[..., Any], Tuple[str, ...]] = {}
+
+
+def cached(*models: Type[Base]) -> Callable[[EndpointType], EndpointType]:
+    """
+    Serve a GET route from the response cache.
+
+    Cached responses are invalidated by repository writes to the given
+    models' tables. Takes effect on routers using CachedRoute.
+    """
+    tables = tuple(model.__table__.name for model in models)
+
+    def decorator(endpoint: EndpointType) -> EndpointType:
+        _cache_tables[endpoint] = tables
+        return endpoint
+
+    return decorator
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names this ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def cache_path(request: Request) -> str:
+    """The request path with its query parameters in a canonical order"""
+    params = sorted(request.query_params.multi_items(), key=lambda item: item[0])
+    return f"{request.url.path}?{urlencode(params)}"
+
+
+def _encode(etag: str, media_type: str, body: bytes) -> bytes:
+    return f"{etag}\n{media_type}\n".encode() + body
+
+
+def _decode(entry: bytes) -> Tuple[str, str, bytes]:
+    etag, media_type, body = entry.split(b"\n", 2)
+    return etag.decode(), media_type.decode(), body
+
+
+async def _call(method: Callable[..., Any], *args: Any) -> Any:
+    if response_cache.blocking:
+        return await run_in_threadpool(method, *args)
+    return method(*args)
+
+
+async def _may_lag(request: Request, tables: Tuple[str, ...]) -> bool:
+    """
+    Whether a replica served the request soon enough after a write to miss it.
+
+    Such a response could be stale yet keyed under the post-write versions,
+    so it is not cached.
+    """
+    if getattr(request.state, "read_replica", None) is None:
+        return False
+    return await _call(
+        response_cache.invalidated_within, tables, settings.db_replica_max_lag_seconds
+    )
+
+
+class CachedRoute(APIRoute):
+    """
+    Route class for routers with @cached endpoints.
+
+    Responses of cached endpoints carry an ETag, and requests whose
+    If-None-Match matches it get an empty 304. Requests pinned to the primary
+    for read-your-writes bypass the cache, and responses read from a replica
+    within its maximum lag of a write to their tables are not stored.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        tables = _cache_tables.get(self.endpoint)
+        if tables is None:
+            return handler
+
+        async def cached_handler(request: Request) -> Response:
+            key: Optional[str] = None
+            if response_cache.enabled and not reads_from_primary(request):
+                key = await _call(response_cache.key, cache_path(request), tables)
+
+            if key is not None:
+                entry = await _call(response_cache.get, key)
+                if entry is not None:
+                    etag, media_type, body = _decode(entry)
+                    if etag_matches(request, etag):
+                        return Response(status_code=304, headers={"ETag": etag})
+                    return Response(
+                        body,
+                        media_type=media_type,
+                        headers={"ETag": etag, "X-Cache": "HIT"},
+                    )
+
+            response = await handler(request)
+            if response.status_code != 200 or not hasattr(response, "body"):
+                return response
+
+            etag = make_etag(response.body)
+            response.headers["ETag"] = etag
+            if key is not None and not await _may_lag(request, tables):
+                media_type = response.media_type or "application/json"
+                await _call(
+                    response_cache.set, key, _encode(etag, media_type, response.body)
+                )
+                response.headers["X-Cache"] = "MISS"
+
+            if etag_matches(request, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            return response
+
+        return cached_handler
@@ -1,5 +1,6 @@
 # src/stockalpha/api/main.py
 import logging
+import os
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,10 +11,12 @@ from stockalpha.api.routes import (
     backtest,
     company,
     fundamental,
+    indicators,
     market_data,
     signal,
 )
 from stockalpha.utils.config import settings
+from stockalpha.utils.database import pool_metrics, replica_router
 
 # Setup logging
 logging.basicConfig(
@@ -57,6 +60,9 @@ def create_app() -> FastAPI:
         fundamental.router, prefix=settings.api_v1_prefix, tags=["Fundamentals"]
     )
     app.include_router(signal.router, prefix=settings.api_v1_prefix, tags=["Signals"])
+    app.include_router(
+        indicators.router, prefix=settings.api_v1_prefix, tags=["Indicators"]
+    )
     app.include_router(
         backtest.router, prefix=settings.api_v1_prefix, tags=["Backtesting"]
     )
@@ -66,6 +72,11 @@ def create_app() -> FastAPI:
         """Health check endpoint"""
         return {"status": "healthy", "environment": settings.environment}
 
+    @app.get("/metrics", tags=["Health"])
+    async def metrics():
+        """Connection pool metrics for this worker process"""
+        return {"pid": os.getpid(), "pools": pool_metrics()}
+
     @app.on_event("startup")
     async def startup_event():
         logger.info("Application starting up...")
@@ -78,10 +89,23 @@ def create_app() -> FastAPI:
 
             init_db()
 
+        replica_router.start()
+
+        # Consume queued backtests in this process when no worker is deployed
+        if settings.embedded_worker:
+            from stockalpha.workers.tasks import start_background_worker
+
+            app.state.worker_stop_event = start_background_worker()
+
     @app.on_event("shutdown")
     async def shutdown_event():
         logger.info("Application shutting down...")
 
+        replica_router.stop()
+
+        if getattr(app.state, "worker_stop_event", None) is not None:
+            app.state.worker_stop_event.set()
+
     return app
 
 
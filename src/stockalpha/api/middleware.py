@@ -1,5 +1,6 @@
 # src/stockalpha/api/middleware.py
 import logging
+import math
 import time
 import traceback
 from typing import Callable
@@ -10,6 +11,12 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from stockalpha.repositories.pagination import InvalidCursorError
+from stockalpha.utils.database import READ_PRIMARY_COOKIE, replica_router
+
+# Methods that never write, so never need read-your-writes pinning
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +35,20 @@ async def request_handler(request: Request, call_next):
         process_time = time.time() - start_time
         response.headers["X-Process-Time"] = str(process_time)
 
+        # Pin the client's reads to the primary until replicas catch up
+        if (
+            replica_router.replicas
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            max_lag = replica_router.max_lag_seconds
+            response.set_cookie(
+                READ_PRIMARY_COOKIE,
+                str(time.time() + max_lag),
+                max_age=math.ceil(max_lag),
+                httponly=True,
+            )
+
         logger.info(
             f"Request completed: {request.method} {request.url.path} "
             f"(ID: {request_id}) - Status: {response.status_code} - "
@@ -77,6 +98,14 @@ def add_middleware(app: FastAPI):
         )
         return JSONResponse(status_code=422, content={"detail": exc.errors()})
 
+    @app.exception_handler(InvalidCursorError)
+    async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+        logger.warning(
+            f"Invalid cursor: {request.method} {request.url.path} - "
+            f"Detail: {str(exc)}"
+        )
+        return JSONResponse(status_code=400, content={"detail": str(exc)})
+
     @app.exception_handler(SQLAlchemyError)
     async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
         logger.error(
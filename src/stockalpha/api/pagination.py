@@ -0,0 +1,67 @@
+# src/stockalpha/api/pagination.py
+import hashlib
+import hmac
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request, Response
+
+from stockalpha.repositories.base_repository import BaseRepository
+from stockalpha.repositories.pagination import InvalidCursorError, Keyset
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Query parameters that move through a listing rather than select its rows
+PAGING_PARAMS = ("cursor", "limit", "skip")
+
+
+def filter_digest(request: Request) -> str:
+    """Digest of a list request's path and filtering query parameters"""
+    params = sorted(
+        (name, value)
+        for name, value in request.query_params.multi_items()
+        if name not in PAGING_PARAMS
+    )
+    payload = json.dumps([request.url.path, params], separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def page_cursor(request: Request, cursor: Optional[str] = None) -> Optional[str]:
+    """
+    Dependency returning the keyset position of ?cursor=.
+
+    Cursors carry a digest of the filters they were issued under. A cursor
+    replayed with other filters would silently skip rows, so it is rejected.
+    """
+    if not cursor:
+        return None
+    position, _, digest = cursor.rpartition(".")
+    if not position or not hmac.compare_digest(digest, filter_digest(request)):
+        raise InvalidCursorError("Cursor was issued for different filters")
+    return position
+
+
+def set_next_cursor(
+    request: Request,
+    response: Response,
+    repo: BaseRepository,
+    items: List[Any],
+    limit: int,
+    keyset: Optional[Keyset] = None,
+) -> List[Any]:
+    """
+    Advertise the cursor for the next page of a list response.
+
+    Clients pass the X-Next-Cursor value back as ?cursor=, with the same
+    filters, to fetch the next page; the header is absent on the last page.
+    """
+    cursor = repo.next_cursor(items, limit, keyset)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = f"{cursor}.{filter_digest(request)}"
+    return items
+
+
+def cursor_headers(response: Response) -> Dict[str, str]:
+    """Cursor header set by set_next_cursor, for responses built directly"""
+    cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    return {NEXT_CURSOR_HEADER: cursor} if cursor else {}
@@ -2,14 +2,20 @@
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from stockalpha.api.schemas import AnnouncementCreate, AnnouncementRead
+from stockalpha.api.pagination import page_cursor, set_next_cursor
+from stockalpha.api.schemas import (
+    AnnouncementCreate,
+    AnnouncementRead,
+    AnnouncementSearchResult,
+)
 from stockalpha.repositories import get_repository
 from stockalpha.repositories.announcement_repository import AnnouncementRepository
 from stockalpha.repositories.company import CompanyRepository
-from stockalpha.utils.database import get_db
+from stockalpha.utils.database import get_async_read_db, get_db
 
 router = APIRouter()
 
@@ -32,8 +38,7 @@ def create_announcement(
 ):
     """Create a new announcement"""
     # Check if company exists
-    company = company_repo.get(db, id=announcement.company_id)
-    if not company:
+    if not company_repo.exists(db, id=announcement.company_id):
         raise HTTPException(status_code=404, detail="Company not found")
 
     # Create announcement
@@ -41,36 +46,80 @@ def create_announcement(
 
 
 @router.get("/announcements/", response_model=List[AnnouncementRead])
-def list_announcements(
+async def list_announcements(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     company_id: Optional[int] = None,
     category: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Depends(page_cursor),
+    db: AsyncSession = Depends(get_async_read_db),
     repo=Depends(get_announcement_repo),
 ):
-    """List announcements with optional filtering"""
-    return repo.get_filtered(
+    """List announcements with optional filtering and cursor pagination"""
+    announcements = await repo.arun(
         db,
+        repo.get_filtered,
         company_id=company_id,
         category=category,
         start_date=start_date,
         end_date=end_date,
         skip=skip,
         limit=limit,
+        cursor=cursor,
+    )
+    return set_next_cursor(request, response, repo, announcements, limit)
+
+
+@router.get("/announcements/search", response_model=List[AnnouncementSearchResult])
+async def search_announcements(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=500),
+    order: str = Query("rank", pattern="^(rank|date)$"),
+    limit: int = Query(20, ge=1, le=100),
+    company_id: Optional[int] = None,
+    category: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = Depends(page_cursor),
+    db: AsyncSession = Depends(get_async_read_db),
+    repo=Depends(get_announcement_repo),
+):
+    """
+    Full-text search over announcement titles and content.
+
+    Results are ranked by relevance, or newest first with order=date, and
+    paginated with the X-Next-Cursor header.
+    """
+    announcements = await repo.arun(
+        db,
+        repo.search,
+        query=q,
+        company_id=company_id,
+        category=category,
+        start_date=start_date,
+        end_date=end_date,
+        order=order,
+        limit=limit,
+        cursor=cursor,
+    )
+    return set_next_cursor(
+        request, response, repo, announcements, limit, keyset=repo.search_keyset(order)
     )
 
 
 @router.get("/announcements/{announcement_id}", response_model=AnnouncementRead)
-def get_announcement(
+async def get_announcement(
     announcement_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     repo=Depends(get_announcement_repo),
 ):
     """Get an announcement by ID"""
-    announcement = repo.get(db, id=announcement_id)
+    announcement = await repo.aget(db, id=announcement_id)
     if not announcement:
         raise HTTPException(status_code=404, detail="Announcement not found")
 
@@ -80,21 +129,24 @@ def get_announcement(
 @router.get(
     "/companies/{company_id}/announcements/", response_model=List[AnnouncementRead]
 )
-def get_company_announcements(
+async def get_company_announcements(
     company_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     announcement_repo=Depends(get_announcement_repo),
     company_repo=Depends(get_company_repo),
 ):
     """Get all announcements for a specific company"""
     # Check if company exists
-    company = company_repo.get(db, id=company_id)
-    if not company:
+    if not await company_repo.aexists(db, id=company_id):
         raise HTTPException(status_code=404, detail="Company not found")
 
     # Get announcements
-    return announcement_repo.get_by_company(
-        db, company_id=company_id, skip=skip, limit=limit
+    return await announcement_repo.arun(
+        db,
+        announcement_repo.get_by_company,
+        company_id=company_id,
+        skip=skip,
+        limit=limit,
     )
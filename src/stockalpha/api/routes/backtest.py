@@ -1,16 +1,39 @@
 # src/stockalpha/api/routes/backtest.py
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from stockalpha.api.schemas import BacktestCreate, BacktestRead
+from stockalpha.api.arrow import columnar_format, panel_response
+from stockalpha.api.cache import CachedRoute, cached
+from stockalpha.api.pagination import page_cursor, set_next_cursor
+from stockalpha.api.schemas import (
+    BacktestCreate,
+    BacktestJobCreate,
+    BacktestJobRead,
+    BacktestRead,
+)
+from stockalpha.backtesting.engine import STRATEGIES
+from stockalpha.backtesting.sweep import validate_grid
+from stockalpha.backtesting.universe import load_universe_panel
+from stockalpha.models.signals import Backtest
 from stockalpha.repositories import get_repository
+from stockalpha.repositories.backtest_job_repository import BacktestJobRepository
 from stockalpha.repositories.backtest_repository import BacktestRepository
-from stockalpha.utils.database import get_db
+from stockalpha.utils.database import (
+    get_async_read_db,
+    get_db,
+    get_read_db,
+    replica_lag,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+
+# Longest date range a universe panel may span
+MAX_PANEL_DAYS = 3660
 
 
 # Repository dependency
@@ -18,6 +41,10 @@ def get_backtest_repo():
     return get_repository(BacktestRepository)
 
 
+def get_backtest_job_repo():
+    return get_repository(BacktestJobRepository)
+
+
 @router.post("/backtests/", response_model=BacktestRead)
 def create_backtest(
     backtest: BacktestCreate,
@@ -29,33 +56,45 @@ def create_backtest(
 
 
 @router.get("/backtests/", response_model=List[BacktestRead])
-def list_backtests(
+async def list_backtests(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     strategy_type: Optional[str] = None,
     min_return: Optional[float] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Depends(page_cursor),
+    db: AsyncSession = Depends(get_async_read_db),
     repo=Depends(get_backtest_repo),
 ):
-    """List backtests with optional filtering"""
-    return repo.get_filtered(
-        db, strategy_type=strategy_type, min_return=min_return, skip=skip, limit=limit
+    """List backtests with optional filtering and cursor pagination"""
+    backtests = await repo.arun(
+        db,
+        repo.get_filtered,
+        strategy_type=strategy_type,
+        min_return=min_return,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
     )
+    return set_next_cursor(request, response, repo, backtests, limit)
 
 
 @router.get("/backtests/{backtest_id}", response_model=BacktestRead)
-def get_backtest(
-    backtest_id: int, db: Session = Depends(get_db), repo=Depends(get_backtest_repo)
+async def get_backtest(
+    backtest_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    repo=Depends(get_backtest_repo),
 ):
     """Get a backtest by ID"""
-    backtest = repo.get(db, id=backtest_id)
+    backtest = await repo.aget(db, id=backtest_id)
     if not backtest:
         raise HTTPException(status_code=404, detail="Backtest not found")
 
     return backtest
 
 
-@router.post("/backtests/run/", response_model=BacktestRead)
+@router.post("/backtests/run/", response_model=BacktestJobRead, status_code=202)
 def run_backtest(
     strategy_type: str = Body(...),
     parameters: Dict[str, Any] = Body(...),
@@ -63,30 +102,93 @@ def run_backtest(
     end_date: datetime = Body(...),
     name: Optional[str] = Body(None),
     db: Session = Depends(get_db),
-    repo=Depends(get_backtest_repo),
+    job_repo=Depends(get_backtest_job_repo),
 ):
-    """Run a new backtest with specified parameters"""
+    """Queue a new backtest; poll /backtests/jobs/{job_id} for the result"""
     # Create a name if not provided
     if not name:
         name = f"{strategy_type} Backtest - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
 
-    # Create backtest record
-    backtest = BacktestCreate(
+    if start_date >= end_date:
+        raise HTTPException(
+            status_code=400, detail="start_date must be before end_date"
+        )
+
+    if strategy_type not in STRATEGIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown strategy type '{strategy_type}'. "
+            f"Available: {', '.join(sorted(STRATEGIES))}",
+        )
+
+    job = BacktestJobCreate(
         name=name,
         strategy_type=strategy_type,
         parameters=parameters,
         start_date=start_date,
         end_date=end_date,
-        # Placeholder performance metrics - in a real app, these would come from the backtest engine
-        total_return=0.0,
-        annualized_return=0.0,
-        sharpe_ratio=0.0,
-        max_drawdown=0.0,
-        win_rate=0.0,
-        trades_count=0,
     )
 
-    return repo.create(db, obj_in=backtest)
+    return job_repo.enqueue(db, obj_in=job)
+
+
+@router.get("/backtests/jobs/{job_id}", response_model=BacktestJobRead)
+async def get_backtest_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    job_repo=Depends(get_backtest_job_repo),
+):
+    """Get the status and progress of a queued backtest"""
+    job = await job_repo.aget(db, id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+
+    return job
+
+
+@router.post("/backtests/sweep/", response_model=BacktestJobRead, status_code=202)
+def run_backtest_sweep(
+    strategy_type: str = Body(...),
+    parameter_grid: Dict[str, List[Any]] = Body(...),
+    start_date: datetime = Body(...),
+    end_date: datetime = Body(...),
+    parameters: Dict[str, Any] = Body({}),
+    name: Optional[str] = Body(None),
+    db: Session = Depends(get_db),
+    job_repo=Depends(get_backtest_job_repo),
+):
+    """
+    Queue one backtest per point of a parameter grid.
+
+    Poll /backtests/jobs/{job_id}; its backtest_ids lists the stored runs.
+    """
+    if start_date >= end_date:
+        raise HTTPException(
+            status_code=400, detail="start_date must be before end_date"
+        )
+
+    if strategy_type not in STRATEGIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown strategy type '{strategy_type}'. "
+            f"Available: {', '.join(sorted(STRATEGIES))}",
+        )
+
+    try:
+        validate_grid(parameter_grid)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job = BacktestJobCreate(
+        name=name,
+        strategy_type=strategy_type,
+        parameters=parameters,
+        parameter_grid=parameter_grid,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+    return job_repo.enqueue(db, obj_in=job)
 
 
 @router.delete("/backtests/{backtest_id}", response_model=dict)
@@ -103,16 +205,57 @@ def delete_backtest(
 
 
 @router.get("/backtests/compare/", response_model=List[BacktestRead])
-def compare_backtests(
+@cached(Backtest)
+async def compare_backtests(
     backtest_ids: List[int] = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     repo=Depends(get_backtest_repo),
 ):
     """Compare multiple backtests"""
-    backtests = repo.get_multiple_by_ids(db, backtest_ids=backtest_ids)
+    backtests = await repo.arun(db, repo.get_multiple_by_ids, backtest_ids=backtest_ids)
 
     # Check if all backtests were found
     if len(backtests) != len(backtest_ids):
         raise HTTPException(status_code=404, detail="One or more backtests not found")
 
     return backtests
+
+
+@router.get("/universe/panel/")
+def get_universe_panel(
+    request: Request,
+    start_date: date,
+    end_date: date,
+    company_id: Optional[List[int]] = Query(None),
+    period: str = Query("quarterly", pattern="^(annual|quarterly)$"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Point-in-time panel of prices, fundamentals and signals per trading day.
+
+    Each day only sees reports and signals dated on or before it. Served as
+    an Arrow stream or Parquet file, one row per (date, company), when the
+    Accept header asks for it, and as [date][company] arrays otherwise.
+    """
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date is after end_date")
+    if (end_date - start_date).days > MAX_PANEL_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range exceeds {MAX_PANEL_DAYS} days",
+        )
+
+    panel = load_universe_panel(
+        db,
+        start_date,
+        end_date,
+        company_ids=company_id,
+        period=period,
+        replica_lag=replica_lag(request),
+    )
+    format = columnar_format(request)
+    if format:
+        return panel_response(
+            format, panel, filename=f"universe-{start_date}-{end_date}"
+        )
+    return JSONResponse(content=panel.to_json())
@@ -2,14 +2,17 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from stockalpha.api.cache import CachedRoute, cached
 from stockalpha.api.schemas import CompanyCreate, CompanyRead
+from stockalpha.models.entities import Company
 from stockalpha.repositories import get_repository
 from stockalpha.repositories.company import CompanyRepository
-from stockalpha.utils.database import get_db
+from stockalpha.utils.database import get_async_read_db, get_db
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 # Repository dependency
@@ -25,8 +28,7 @@ def create_company(
 ):
     """Create a new company"""
     # Check if company already exists
-    db_company = repo.get_by_ticker(db, ticker=company.ticker)
-    if db_company:
+    if repo.get_id_by_ticker(db, ticker=company.ticker) is not None:
         raise HTTPException(status_code=400, detail="Company already exists")
 
     # Create new company
@@ -34,29 +36,36 @@ def create_company(
 
 
 @router.get("/companies/", response_model=List[CompanyRead])
-def list_companies(
+async def list_companies(
     skip: int = 0,
     limit: int = 100,
     sector: str = Query(None),
     industry: str = Query(None),  # Added industry filter
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     repo=Depends(get_company_repo),
 ):
     """List companies with optional filtering"""
     if sector:
-        return repo.get_by_sector(db, sector=sector, skip=skip, limit=limit)
+        return await repo.arun(
+            db, repo.get_by_sector, sector=sector, skip=skip, limit=limit
+        )
     elif industry:
-        return repo.get_by_industry(db, industry=industry, skip=skip, limit=limit)
+        return await repo.arun(
+            db, repo.get_by_industry, industry=industry, skip=skip, limit=limit
+        )
     else:
-        return repo.get_multi(db, skip=skip, limit=limit)
+        return await repo.aget_multi(db, skip=skip, limit=limit)
 
 
 @router.get("/companies/{company_id}", response_model=CompanyRead)
-def get_company(
-    company_id: int, db: Session = Depends(get_db), repo=Depends(get_company_repo)
+@cached(Company)
+async def get_company(
+    company_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    repo=Depends(get_company_repo),
 ):
     """Get a company by ID"""
-    company = repo.get(db, id=company_id)
+    company = await repo.aget(db, id=company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
 
@@ -64,11 +73,14 @@ def get_company(
 
 
 @router.get("/companies/ticker/{ticker}", response_model=CompanyRead)
-def get_company_by_ticker(
-    ticker: str, db: Session = Depends(get_db), repo=Depends(get_company_repo)
+@cached(Company)
+async def get_company_by_ticker(
+    ticker: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    repo=Depends(get_company_repo),
 ):
     """Get a company by ticker symbol"""
-    company = repo.get_by_ticker(db, ticker=ticker)
+    company = await repo.arun(db, repo.get_by_ticker, ticker=ticker)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
 
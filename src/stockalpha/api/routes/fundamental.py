@@ -1,19 +1,37 @@
 # src/stockalpha/api/routes/fundamental.py
+import re
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from stockalpha.api.schemas import FundamentalDataCreate, FundamentalDataRead
+from stockalpha.analysis.screener import ScreenError, screen
+from stockalpha.api.cache import CachedRoute, cached
+from stockalpha.api.pagination import page_cursor, set_next_cursor
+from stockalpha.api.schemas import (
+    FundamentalDataCreate,
+    FundamentalDataRead,
+    FundamentalRatioRead,
+    ScreenerResult,
+)
+from stockalpha.models.entities import Company, FundamentalData, FundamentalRatio
 from stockalpha.repositories import get_repository
 from stockalpha.repositories.company import CompanyRepository
 from stockalpha.repositories.fundamental_data_repository import (
     FundamentalDataRepository,
 )
-from stockalpha.utils.database import get_db
+from stockalpha.repositories.fundamental_ratio_repository import (
+    FundamentalRatioRepository,
+)
+from stockalpha.utils.database import get_async_read_db, get_db, replica_lag
+
+router = APIRouter(route_class=CachedRoute)
 
-router = APIRouter()
+# A promoted field comparison, e.g. free_cash_flow>=1000000
+FIELD_FILTER = re.compile(r"^\s*(\w+)\s*(<=|>=|<|>|=)\s*(\S+)\s*$")
 
 
 # Repository dependencies
@@ -25,6 +43,10 @@ def get_company_repo():
     return get_repository(CompanyRepository)
 
 
+def get_ratio_repo():
+    return get_repository(FundamentalRatioRepository)
+
+
 @router.post("/fundamentals/", response_model=FundamentalDataRead)
 def create_fundamental_data(
     fundamental: FundamentalDataCreate,
@@ -34,8 +56,7 @@ def create_fundamental_data(
 ):
     """Create a new fundamental data entry"""
     # Check if company exists
-    company = company_repo.get(db, id=fundamental.company_id)
-    if not company:
+    if not company_repo.exists(db, id=fundamental.company_id):
         raise HTTPException(status_code=404, detail="Company not found")
 
     # Check if data already exists for this period
@@ -56,35 +77,128 @@ def create_fundamental_data(
     return fundamental_repo.create(db, obj_in=fundamental)
 
 
+@router.post("/fundamentals/batch/", response_model=List[FundamentalDataRead])
+def create_fundamental_data_batch(
+    fundamental_data_list: List[FundamentalDataCreate],
+    upsert: bool = False,
+    db: Session = Depends(get_db),
+    repo=Depends(get_fundamental_repo),
+):
+    """Create fundamental data in batch, skipping or updating existing periods"""
+    return repo.create_batch(
+        db, fundamental_data_list=fundamental_data_list, upsert=upsert
+    )
+
+
 @router.get("/fundamentals/", response_model=List[FundamentalDataRead])
-def list_fundamentals(
+async def list_fundamentals(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     company_id: Optional[int] = None,
     period: Optional[str] = None,
     fiscal_year: Optional[int] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Depends(page_cursor),
+    field_filter: List[str] = Query([], alias="filter"),
+    db: AsyncSession = Depends(get_async_read_db),
     repo=Depends(get_fundamental_repo),
 ):
-    """List fundamental data with optional filtering"""
-    return repo.get_filtered(
+    """
+    List fundamental data with optional filtering and cursor pagination.
+
+    filter compares a promoted statement field and may be repeated, e.g.
+    filter=free_cash_flow>=1000000&filter=total_debt<5e8.
+    """
+    field_filters = []
+    for expression in field_filter:
+        match = FIELD_FILTER.match(expression)
+        try:
+            if not match:
+                raise ValueError(f"Invalid filter: {expression}")
+            name, op, value = match.groups()
+            field_filters.append((name, op, float(value)))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        fundamentals = await repo.arun(
+            db,
+            repo.get_filtered,
+            company_id=company_id,
+            period=period,
+            fiscal_year=fiscal_year,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            field_filters=field_filters,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return set_next_cursor(request, response, repo, fundamentals, limit)
+
+
+@router.get("/ratios/", response_model=List[FundamentalRatioRead])
+async def list_ratios(
+    request: Request,
+    response: Response,
+    fiscal_year: int,
+    period: str = Query("annual", pattern="^(annual|quarterly)$"),
+    fiscal_quarter: Optional[int] = Query(None, ge=1, le=4),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Depends(page_cursor),
+    db: AsyncSession = Depends(get_async_read_db),
+    repo=Depends(get_ratio_repo),
+):
+    """List every company's precomputed ratios for one fiscal period"""
+    ratios = await repo.arun(
         db,
-        company_id=company_id,
+        repo.get_filtered,
         period=period,
         fiscal_year=fiscal_year,
-        skip=skip,
+        fiscal_quarter=fiscal_quarter,
         limit=limit,
+        cursor=cursor,
+    )
+    return set_next_cursor(request, response, repo, ratios, limit)
+
+
+@router.get("/screener", response_model=List[ScreenerResult])
+async def screen_companies(
+    request: Request,
+    q: Optional[str] = Query(None, max_length=1000),
+    period: str = Query("annual", pattern="^(annual|quarterly)$"),
+    sort: Optional[str] = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db),
+    repo=Depends(get_fundamental_repo),
+):
+    """
+    Screen every company's latest fundamentals with a filter expression.
+
+    For example q=pe < 15 and revenue_growth > 10%&sort=pe. Expressions run
+    against an in-memory snapshot, so a screen costs no per-company queries.
+    """
+    snapshot = await repo.arun(
+        db, repo.get_snapshot, period=period, replica_lag=replica_lag(request)
     )
+    try:
+        return await run_in_threadpool(
+            screen, snapshot, q, sort_by=sort, descending=order == "desc", limit=limit
+        )
+    except ScreenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/fundamentals/{fundamental_id}", response_model=FundamentalDataRead)
-def get_fundamental(
+async def get_fundamental(
     fundamental_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     repo=Depends(get_fundamental_repo),
 ):
     """Get fundamental data by ID"""
-    fundamental = repo.get(db, id=fundamental_id)
+    fundamental = await repo.aget(db, id=fundamental_id)
     if not fundamental:
         raise HTTPException(status_code=404, detail="Fundamental data not found")
 
@@ -94,21 +208,50 @@ def get_fundamental(
 @router.get(
     "/companies/{company_id}/fundamentals/", response_model=List[FundamentalDataRead]
 )
-def get_company_fundamentals(
+@cached(Company, FundamentalData)
+async def get_company_fundamentals(
     company_id: int,
     period: Optional[str] = None,
     limit: int = 8,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     fundamental_repo=Depends(get_fundamental_repo),
     company_repo=Depends(get_company_repo),
 ):
     """Get fundamental data for a specific company"""
     # Check if company exists
-    company = company_repo.get(db, id=company_id)
-    if not company:
+    if not await company_repo.aexists(db, id=company_id):
         raise HTTPException(status_code=404, detail="Company not found")
 
     # Get fundamental data
-    return fundamental_repo.get_by_company(
-        db, company_id=company_id, period=period, limit=limit
+    return await fundamental_repo.arun(
+        db,
+        fundamental_repo.get_by_company,
+        company_id=company_id,
+        period=period,
+        limit=limit,
+    )
+
+
+@router.get(
+    "/companies/{company_id}/ratios/", response_model=List[FundamentalRatioRead]
+)
+@cached(Company, FundamentalRatio)
+async def get_company_ratios(
+    company_id: int,
+    period: Optional[str] = None,
+    limit: int = 8,
+    db: AsyncSession = Depends(get_async_read_db),
+    ratio_repo=Depends(get_ratio_repo),
+    company_repo=Depends(get_company_repo),
+):
+    """Get precomputed ratios for a specific company, latest period first"""
+    if not await company_repo.aexists(db, id=company_id):
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    return await ratio_repo.arun(
+        db,
+        ratio_repo.get_by_company,
+        company_id=company_id,
+        period=period,
+        limit=limit,
     )
@@ -0,0 +1,92 @@
+# src/stockalpha/api/routes/indicators.py
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from stockalpha.analysis.indicators import (
+    Indicator,
+    indicator_cache,
+    latest_indicators,
+    parse_indicators,
+)
+from stockalpha.api.schemas import IndicatorSeriesRead, IndicatorSnapshotRead
+from stockalpha.repositories import get_repository
+from stockalpha.repositories.company import CompanyRepository
+from stockalpha.repositories.price_data_repository import PriceDataRepository
+from stockalpha.utils.database import get_read_db, replica_lag
+
+router = APIRouter()
+
+
+# Repository dependencies
+def get_price_repo():
+    return get_repository(PriceDataRepository)
+
+
+def get_company_repo():
+    return get_repository(CompanyRepository)
+
+
+def get_indicators(
+    indicators: Optional[List[str]] = Query(
+        None, description="Specs such as SMA:20 or MACD:12:26:9"
+    )
+) -> List[Indicator]:
+    """Parse requested indicator specs, defaulting to the configured set"""
+    try:
+        return parse_indicators(indicators)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/companies/{company_id}/indicators/", response_model=IndicatorSeriesRead)
+def get_company_indicators(
+    company_id: int,
+    request: Request,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 1000,
+    indicators: List[Indicator] = Depends(get_indicators),
+    db: Session = Depends(get_read_db),
+    price_repo=Depends(get_price_repo),
+    company_repo=Depends(get_company_repo),
+):
+    """
+    Get technical indicators for a company.
+
+    Indicators are computed over the full price history, so the first bars
+    of the window are already warmed up; the latest `limit` bars of the
+    window are returned.
+    """
+    # Check if company exists
+    if not company_repo.exists(db, id=company_id):
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    history = price_repo.get_history(
+        db, company_id=company_id, replica_lag=replica_lag(request)
+    )
+    frame = indicator_cache.get(history, indicators)
+    return JSONResponse(
+        content=frame.window(start_date, end_date, limit=limit).to_dict()
+    )
+
+
+@router.get("/indicators/latest/", response_model=List[IndicatorSnapshotRead])
+def get_latest_indicators(
+    request: Request,
+    company_ids: Optional[List[int]] = Query(None),
+    indicators: List[Indicator] = Depends(get_indicators),
+    db: Session = Depends(get_read_db),
+    price_repo=Depends(get_price_repo),
+    company_repo=Depends(get_company_repo),
+):
+    """Get the latest indicator values for a set of companies (default: all)"""
+    histories = price_repo.get_histories(
+        db,
+        company_ids=company_ids or company_repo.get_ids(db),
+        replica_lag=replica_lag(request),
+    )
+    return JSONResponse(content=latest_indicators(histories, indicators))
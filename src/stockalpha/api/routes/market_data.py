@@ -1,19 +1,93 @@
 # src/stockalpha/api/routes/market_data.py
+import csv
+import io
+import json
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import Any, Iterator, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from stockalpha.api.schemas import DateRangeParams, PriceDataCreate, PriceDataRead
+from stockalpha.api.arrow import (
+    COLUMNAR_FORMATS,
+    PRICE_DATA_FIELDS,
+    columnar_format,
+    history_response,
+    rows_response,
+)
+from stockalpha.api.pagination import cursor_headers, page_cursor, set_next_cursor
+from stockalpha.api.schemas import (
+    BulkInsertResult,
+    DateRangeParams,
+    PriceDataCreate,
+    PriceDataRead,
+)
 from stockalpha.repositories import get_repository
 from stockalpha.repositories.company import CompanyRepository
-from stockalpha.repositories.price_data_repository import PriceDataRepository
-from stockalpha.utils.database import get_db
+from stockalpha.repositories.price_data_repository import (
+    ROW_COLUMNS,
+    PriceDataRepository,
+)
+from stockalpha.utils.database import (
+    get_async_read_db,
+    get_db,
+    get_read_db,
+    replica_lag,
+)
 
 router = APIRouter()
 
 
+# Field names of the tuples produced by PriceDataRepository.stream_rows
+EXPORT_FIELDS = tuple(name for name, _ in PRICE_DATA_FIELDS)
+EXPORT_FORMAT_PATTERN = "^(ndjson|csv|arrow|parquet)$"
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+
+
+def _encode_ndjson(batches: Iterator[List[Tuple[Any, ...]]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_FIELDS, row)), default=_isoformat) + "\n"
+            for row in batch
+        ).encode()
+
+
+def _encode_csv(batches: Iterator[List[Tuple[Any, ...]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        writer.writerows((*row[:1], row[1].isoformat(), *row[2:]) for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header-only export when there are no rows
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _export_response(
+    batches: Iterator[List[Tuple[Any, ...]]], format: str, filename: str
+) -> StreamingResponse:
+    """Stream row batches as NDJSON, CSV, Arrow or Parquet"""
+    if format in COLUMNAR_FORMATS:
+        return rows_response(format, PRICE_DATA_FIELDS, batches, filename)
+
+    encoder = _encode_csv if format == "csv" else _encode_ndjson
+    return StreamingResponse(
+        encoder(batches),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
+
+
 # Repository dependencies
 def get_price_repo():
     return get_repository(PriceDataRepository)
@@ -32,8 +106,7 @@ def create_price_data(
 ):
     """Create a new price data point"""
     # Check if company exists
-    company = company_repo.get(db, id=price_data.company_id)
-    if not company:
+    if not company_repo.exists(db, id=price_data.company_id):
         raise HTTPException(status_code=404, detail="Company not found")
 
     # Check if data already exists for this date
@@ -60,44 +133,66 @@ def create_price_data_batch(
     return repo.create_batch(db, price_data_list=price_data_list)
 
 
+@router.post("/market-data/bulk/", response_model=BulkInsertResult)
+def ingest_price_data_bulk(
+    price_data_list: List[PriceDataCreate],
+    db: Session = Depends(get_db),
+    repo=Depends(get_price_repo),
+):
+    """Bulk-ingest price data, skipping rows that already exist"""
+    ids = repo.bulk_ingest(db, rows=(p.model_dump() for p in price_data_list))
+    return BulkInsertResult(received=len(price_data_list), inserted=len(ids), ids=ids)
+
+
 @router.get("/market-data/", response_model=List[PriceDataRead])
-def list_price_data(
+async def list_price_data(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     company_id: Optional[int] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Depends(page_cursor),
+    db: AsyncSession = Depends(get_async_read_db),
     repo=Depends(get_price_repo),
 ):
-    """List price data with optional filtering"""
-    if company_id:
-        return repo.get_by_company(
-            db,
-            company_id=company_id,
-            start_date=start_date,
-            end_date=end_date,
-            skip=skip,
-            limit=limit,
-        )
-    else:
-        # For general queries without company_id, use the model directly
-        query = db.query(repo.model)
-
-        if start_date:
-            query = query.filter(repo.model.date >= start_date)
-
-        if end_date:
-            query = query.filter(repo.model.date <= end_date)
+    """
+    List price data with optional filtering and cursor pagination.
 
-        return query.order_by(repo.model.date.desc()).offset(skip).limit(limit).all()
+    Arrow stream and Parquet responses are available through the Accept
+    header; they are built from column rows without per-row models.
+    """
+    format = columnar_format(request)
+    price_data = await repo.arun(
+        db,
+        repo.get_filtered,
+        company_id=company_id,
+        start_date=start_date,
+        end_date=end_date,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        columns=ROW_COLUMNS if format else None,
+    )
+    set_next_cursor(request, response, repo, price_data, limit)
+    if format:
+        return rows_response(
+            format,
+            PRICE_DATA_FIELDS,
+            [price_data],
+            filename="market-data",
+            headers=cursor_headers(response),
+        )
+    return price_data
 
 
 @router.get("/companies/{company_id}/market-data/", response_model=List[PriceDataRead])
-def get_company_price_data(
+async def get_company_price_data(
     company_id: int,
+    request: Request,
     date_range: DateRangeParams = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     price_repo=Depends(get_price_repo),
     company_repo=Depends(get_company_repo),
 ):
@@ -107,15 +202,62 @@ def get_company_price_data(
     start_date = date_range.start_date or (end_date - timedelta(days=30))
 
     # Check if company exists
-    company = company_repo.get(db, id=company_id)
-    if not company:
+    company = await company_repo.aget_entry(db, id=company_id)
+    if company is None:
         raise HTTPException(status_code=404, detail="Company not found")
 
-    # Get price data
-    return price_repo.get_by_company(
+    # Serve from the columnar price cache; records are built straight from
+    # the arrays, so no ORM or Pydantic objects are created per row
+    history = await price_repo.arun(
         db,
+        price_repo.get_history,
         company_id=company_id,
         start_date=start_date,
         end_date=end_date,
         limit=1000,  # Higher limit for time series data
+        replica_lag=replica_lag(request),
+    )
+    format = columnar_format(request)
+    if format:
+        return history_response(
+            format, history, filename=f"{company.ticker}-market-data"
+        )
+    return JSONResponse(content=history.to_records())
+
+
+@router.get("/market-data/export/")
+def export_price_data(
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN),
+    company_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    repo=Depends(get_price_repo),
+):
+    """Stream price data in an export format without a row limit"""
+    batches = repo.stream_rows(
+        db, company_id=company_id, start_date=start_date, end_date=end_date
+    )
+    return _export_response(batches, format, filename="market-data")
+
+
+@router.get("/companies/{company_id}/market-data/export/")
+def export_company_price_data(
+    company_id: int,
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    price_repo=Depends(get_price_repo),
+    company_repo=Depends(get_company_repo),
+):
+    """Stream a company's full price history in an export format"""
+    # Check if company exists
+    company = company_repo.get_entry(db, id=company_id)
+    if company is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    batches = price_repo.stream_rows(
+        db, company_id=company_id, start_date=start_date, end_date=end_date
     )
+    return _export_response(batches, format, filename=f"{company.ticker}-market-data")
@@ -2,16 +2,21 @@
 from datetime import date, datetime, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from stockalpha.api.arrow import SIGNAL_FIELDS, columnar_format, rows_response
+from stockalpha.api.cache import CachedRoute, cached
+from stockalpha.api.pagination import cursor_headers, page_cursor, set_next_cursor
 from stockalpha.api.schemas import SignalCreate, SignalRead
+from stockalpha.models.signals import Signal
 from stockalpha.repositories import get_repository
 from stockalpha.repositories.company import CompanyRepository
-from stockalpha.repositories.signal_repository import SignalRepository
-from stockalpha.utils.database import get_db
+from stockalpha.repositories.signal_repository import ROW_COLUMNS, SignalRepository
+from stockalpha.utils.database import get_async_read_db, get_db
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 # Repository dependencies
@@ -32,8 +37,7 @@ def create_signal(
 ):
     """Create a new trading signal"""
     # Check if company exists
-    company = company_repo.get(db, id=signal.company_id)
-    if not company:
+    if not company_repo.exists(db, id=signal.company_id):
         raise HTTPException(status_code=404, detail="Company not found")
 
     # Create signal
@@ -41,7 +45,9 @@ def create_signal(
 
 
 @router.get("/signals/", response_model=List[SignalRead])
-def list_signals(
+async def list_signals(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     company_id: Optional[int] = None,
@@ -50,12 +56,20 @@ def list_signals(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     min_confidence: float = 0.0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Depends(page_cursor),
+    db: AsyncSession = Depends(get_async_read_db),
     repo=Depends(get_signal_repo),
 ):
-    """List trading signals with optional filtering"""
-    return repo.get_filtered(
+    """
+    List trading signals with optional filtering and cursor pagination.
+
+    Arrow stream and Parquet responses are available through the Accept
+    header.
+    """
+    format = columnar_format(request)
+    signals = await repo.arun(
         db,
+        repo.get_filtered,
         company_id=company_id,
         signal_type=signal_type,
         direction=direction,
@@ -64,15 +78,29 @@ def list_signals(
         min_confidence=min_confidence,
         skip=skip,
         limit=limit,
+        cursor=cursor,
+        columns=ROW_COLUMNS if format else None,
     )
+    set_next_cursor(request, response, repo, signals, limit)
+    if format:
+        return rows_response(
+            format,
+            SIGNAL_FIELDS,
+            [signals],
+            filename="signals",
+            headers=cursor_headers(response),
+        )
+    return signals
 
 
 @router.get("/signals/{signal_id}", response_model=SignalRead)
-def get_signal(
-    signal_id: int, db: Session = Depends(get_db), repo=Depends(get_signal_repo)
+async def get_signal(
+    signal_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    repo=Depends(get_signal_repo),
 ):
     """Get a trading signal by ID"""
-    signal = repo.get(db, id=signal_id)
+    signal = await repo.aget(db, id=signal_id)
     if not signal:
         raise HTTPException(status_code=404, detail="Signal not found")
 
@@ -80,33 +108,48 @@ def get_signal(
 
 
 @router.get("/signals/latest/", response_model=List[SignalRead])
-def get_latest_signals(
+@cached(Signal)
+async def get_latest_signals(
     days: int = 1,
     min_confidence: float = 0.7,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     repo=Depends(get_signal_repo),
 ):
     """Get latest high-confidence trading signals"""
-    return repo.get_latest(db, days=days, min_confidence=min_confidence, limit=limit)
+    return await repo.arun(
+        db, repo.get_latest, days=days, min_confidence=min_confidence, limit=limit
+    )
 
 
 @router.get("/companies/{company_id}/signals/", response_model=List[SignalRead])
-def get_company_signals(
+async def get_company_signals(
     company_id: int,
+    request: Request,
     days: int = 30,
     signal_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     signal_repo=Depends(get_signal_repo),
     company_repo=Depends(get_company_repo),
 ):
     """Get signals for a specific company"""
     # Check if company exists
-    company = company_repo.get(db, id=company_id)
-    if not company:
+    company = await company_repo.aget_entry(db, id=company_id)
+    if company is None:
         raise HTTPException(status_code=404, detail="Company not found")
 
-    # Get signals
-    return signal_repo.get_by_company(
-        db, company_id=company_id, days=days, signal_type=signal_type
+    # Get signals, as Arrow or Parquet when the Accept header asks for it
+    format = columnar_format(request)
+    signals = await signal_repo.arun(
+        db,
+        signal_repo.get_by_company,
+        company_id=company_id,
+        days=days,
+        signal_type=signal_type,
+        columns=ROW_COLUMNS if format else None,
     )
+    if format:
+        return rows_response(
+            format, SIGNAL_FIELDS, [signals], filename=f"{company.ticker}-signals"
+        )
+    return signals
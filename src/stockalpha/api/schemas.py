@@ -73,6 +73,22 @@ class AnnouncementRead(AnnouncementBase):
         from_attributes = True  # Changed from orm_mode = True
 
 
+class AnnouncementSearchResult(AnnouncementRead):
+    rank: float
+
+
+class ScreenerResult(BaseModel):
+    company_id: int
+    ticker: str
+    sector: Optional[str] = None
+    industry: Optional[str] = None
+    period: str
+    fiscal_year: int
+    fiscal_quarter: Optional[int] = None
+    report_date: datetime
+    metrics: Dict[str, Optional[float]]
+
+
 class PriceDataRead(PriceDataBase):
     id: int
     company_id: int
@@ -81,6 +97,12 @@ class PriceDataRead(PriceDataBase):
         from_attributes = True  # Changed from orm_mode = True
 
 
+class BulkInsertResult(BaseModel):
+    received: int
+    inserted: int
+    ids: List[int]
+
+
 # Query schemas
 class DateRangeParams(BaseModel):
     start_date: date
@@ -112,6 +134,19 @@ class BacktestCreate(BacktestBase):
     pass
 
 
+class BacktestResultCreate(BacktestCreate):
+    """Backtest definition together with the engine's results"""
+
+    total_return: Optional[float] = None
+    annualized_return: Optional[float] = None
+    sharpe_ratio: Optional[float] = None
+    max_drawdown: Optional[float] = None
+    win_rate: Optional[float] = None
+    trades_count: Optional[int] = None
+    trades: Optional[List[Dict[str, Any]]] = None
+    equity_curve: Optional[List[Dict[str, Any]]] = None
+
+
 class BacktestRead(BacktestBase):
     id: int
     total_return: Optional[float] = None
@@ -126,6 +161,34 @@ class BacktestRead(BacktestBase):
         from_attributes = True  # This replaces orm_mode=True in Pydantic v2
 
 
+# Backtest job schemas
+class BacktestJobCreate(BaseModel):
+    name: Optional[str] = None
+    strategy_type: str
+    parameters: Dict[str, Any]
+    parameter_grid: Optional[Dict[str, List[Any]]] = None  # Set for sweeps
+    start_date: datetime
+    end_date: datetime
+    created_by: Optional[str] = None
+
+
+class BacktestJobRead(BacktestJobCreate):
+    id: int
+    status: str  # 'queued', 'running', 'completed' or 'failed'
+    progress: float
+    message: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int
+    backtest_id: Optional[int] = None
+    backtest_ids: Optional[List[int]] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 # Signal schemas
 class SignalBase(BaseModel):
     company_id: int
@@ -203,6 +266,44 @@ class FundamentalDataRead(FundamentalDataBase):
         from_attributes = True
 
 
+class FundamentalRatioRead(BaseModel):
+    id: int
+    fundamental_id: int
+    company_id: int
+    period: str
+    fiscal_year: int
+    fiscal_quarter: Optional[int] = None
+    report_date: datetime
+    net_margin: Optional[float] = None
+    roe: Optional[float] = None
+    roa: Optional[float] = None
+    debt_to_equity: Optional[float] = None
+    debt_to_assets: Optional[float] = None
+    revenue_growth_yoy: Optional[float] = None
+    net_income_growth_yoy: Optional[float] = None
+    eps_growth_yoy: Optional[float] = None
+    revenue_growth_qoq: Optional[float] = None
+    net_income_growth_qoq: Optional[float] = None
+    eps_growth_qoq: Optional[float] = None
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# Technical indicator schemas
+class IndicatorSeriesRead(BaseModel):
+    company_id: int
+    dates: List[datetime]
+    values: Dict[str, List[Optional[float]]]  # None during warm-up
+
+
+class IndicatorSnapshotRead(BaseModel):
+    company_id: int
+    date: datetime
+    values: Dict[str, Optional[float]]
+
+
 # PriceData update schema
 class PriceDataUpdate(BaseModel):
     open: Optional[float] = None
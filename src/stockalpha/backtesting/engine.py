@@ -0,0 +1,399 @@
+# src/stockalpha/backtesting/engine.py
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from stockalpha.repositories import get_repository
+from stockalpha.repositories.price_data_repository import PriceDataRepository
+from stockalpha.repositories.signal_repository import SignalRepository
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Proleptic Gregorian ordinal of 1970-01-01, the datetime64 epoch
+_EPOCH_ORDINAL = 719163
+
+
+@dataclass
+class Panel:
+    """Dense date x company arrays for a backtest window"""
+
+    dates: np.ndarray  # datetime64[D], shape (T,)
+    company_ids: np.ndarray  # int64, shape (N,)
+    prices: np.ndarray  # float64, shape (T, N), forward-filled, NaN before listing
+    signal_direction: np.ndarray  # float64, shape (T, N), NaN where no signal
+    signal_confidence: np.ndarray  # float64, shape (T, N), NaN where no signal
+
+
+@dataclass
+class BacktestResult:
+    """Performance metrics and detail produced by a backtest run"""
+
+    total_return: float
+    annualized_return: float
+    sharpe_ratio: float
+    max_drawdown: float
+    win_rate: float
+    trades_count: int
+    trades: List[Dict[str, Any]]
+    equity_curve: List[Dict[str, Any]]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return the result as a dictionary of Backtest column values"""
+        return {
+            "total_return": self.total_return,
+            "annualized_return": self.annualized_return,
+            "sharpe_ratio": self.sharpe_ratio,
+            "max_drawdown": self.max_drawdown,
+            "win_rate": self.win_rate,
+            "trades_count": self.trades_count,
+            "trades": self.trades,
+            "equity_curve": self.equity_curve,
+        }
+
+
+def _int_column(rows: Sequence[Tuple[Any, ...]], index: int) -> np.ndarray:
+    return np.fromiter((row[index] for row in rows), dtype=np.int64, count=len(rows))
+
+
+def _float_column(rows: Sequence[Tuple[Any, ...]], index: int) -> np.ndarray:
+    return np.fromiter(
+        (np.nan if row[index] is None else row[index] for row in rows),
+        dtype=np.float64,
+        count=len(rows),
+    )
+
+
+def _date_column(rows: Sequence[Tuple[Any, ...]], index: int) -> np.ndarray:
+    # Going through ordinals is far cheaper than letting NumPy parse datetimes
+    ordinals = np.fromiter(
+        (row[index].toordinal() for row in rows), dtype=np.int64, count=len(rows)
+    )
+    return (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down each column without a Python loop"""
+    rows = np.arange(values.shape[0])[:, None]
+    last_valid = np.where(~np.isnan(values), rows, 0)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    return values[last_valid, np.arange(values.shape[1])]
+
+
+def build_panel(
+    price_rows: Sequence[Tuple[int, datetime, Optional[float], Optional[float]]],
+    signal_rows: Sequence[Tuple[int, datetime, int, float]] = (),
+) -> Panel:
+    """
+    Pivot long-format query rows into a dense panel.
+
+    price_rows are (company_id, date, close, adjusted_close) tuples and
+    signal_rows are (company_id, date, direction, confidence) tuples. When a
+    company has several signals on the same date, the last row wins.
+    """
+    if not price_rows:
+        empty = np.empty((0, 0))
+        return Panel(
+            dates=np.empty(0, dtype="datetime64[D]"),
+            company_ids=np.empty(0, dtype=np.int64),
+            prices=empty,
+            signal_direction=empty,
+            signal_confidence=empty,
+        )
+
+    row_companies = _int_column(price_rows, 0)
+    row_dates = _date_column(price_rows, 1)
+    close = _float_column(price_rows, 2)
+    adjusted = _float_column(price_rows, 3)
+    row_prices = np.where(np.isnan(adjusted), close, adjusted)
+
+    dates, date_idx = np.unique(row_dates, return_inverse=True)
+    company_ids, company_idx = np.unique(row_companies, return_inverse=True)
+
+    prices = np.full((len(dates), len(company_ids)), np.nan)
+    prices[date_idx, company_idx] = row_prices
+
+    direction = np.full_like(prices, np.nan)
+    confidence = np.full_like(prices, np.nan)
+    if signal_rows:
+        sig_companies = _int_column(signal_rows, 0)
+        sig_dates = _date_column(signal_rows, 1)
+
+        # Signals are mapped onto the first trading date on or after the signal
+        sig_date_idx = np.searchsorted(dates, sig_dates)
+        sig_company_idx = np.searchsorted(company_ids, sig_companies)
+        sig_company_idx = np.minimum(sig_company_idx, len(company_ids) - 1)
+        keep = (sig_date_idx < len(dates)) & (
+            company_ids[sig_company_idx] == sig_companies
+        )
+
+        direction[sig_date_idx[keep], sig_company_idx[keep]] = _float_column(
+            signal_rows, 2
+        )[keep]
+        confidence[sig_date_idx[keep], sig_company_idx[keep]] = _float_column(
+            signal_rows, 3
+        )[keep]
+
+    return Panel(
+        dates=dates,
+        company_ids=company_ids,
+        prices=_forward_fill(prices),
+        signal_direction=direction,
+        signal_confidence=confidence,
+    )
+
+
+def load_panel(
+    db: Session,
+    start_date: datetime,
+    end_date: datetime,
+    company_ids: Optional[List[int]] = None,
+) -> Panel:
+    """Load prices and signals for a window into a dense panel"""
+    price_repo = get_repository(PriceDataRepository)
+    signal_repo = get_repository(SignalRepository)
+
+    price_rows = price_repo.get_close_rows(
+        db, start_date=start_date, end_date=end_date, company_ids=company_ids
+    )
+    signal_rows = signal_repo.get_direction_rows(
+        db, start_date=start_date, end_date=end_date, company_ids=company_ids
+    )
+    logger.debug(
+        f"Loaded {len(price_rows)} price rows and {len(signal_rows)} signal rows"
+    )
+
+    return build_panel(price_rows, signal_rows)
+
+
+# Strategies map a panel and parameters to target positions (-1, 0 or 1)
+# decided at each bar's close.
+StrategyFunc = Callable[[Panel, Dict[str, Any]], np.ndarray]
+
+
+def signal_strategy(panel: Panel, parameters: Dict[str, Any]) -> np.ndarray:
+    """
+    Follow stored trading signals.
+
+    A signal with confidence >= min_confidence sets the position to its
+    direction, and the position is held for holding_days bars unless another
+    signal replaces it. A hold (direction 0) signal flattens the position.
+    """
+    min_confidence = float(parameters.get("min_confidence", 0.0))
+    holding_days = int(parameters.get("holding_days", 20))
+    long_only = bool(parameters.get("long_only", False))
+
+    events = ~np.isnan(panel.signal_direction) & (
+        panel.signal_confidence >= min_confidence
+    )
+    rows = np.arange(panel.prices.shape[0])[:, None]
+    last_event = np.where(events, rows, -1)
+    np.maximum.accumulate(last_event, axis=0, out=last_event)
+
+    columns = np.arange(panel.prices.shape[1])
+    held = panel.signal_direction[np.maximum(last_event, 0), columns]
+    active = (last_event >= 0) & (rows - last_event < holding_days)
+    positions = np.where(active, np.sign(np.nan_to_num(held)), 0.0)
+
+    if long_only:
+        positions = np.maximum(positions, 0.0)
+    return positions
+
+
+def momentum_strategy(panel: Panel, parameters: Dict[str, Any]) -> np.ndarray:
+    """
+    Cross-sectional momentum.
+
+    Goes long the top_n companies by trailing lookback-bar return (and short
+    the bottom_n when bottom_n > 0), rebalancing every bar.
+    """
+    lookback = int(parameters.get("lookback", 60))
+    top_n = int(parameters.get("top_n", 10))
+    bottom_n = int(parameters.get("bottom_n", 0))
+    if lookback < 1:
+        raise ValueError(f"Momentum lookback must be at least 1 bar, got {lookback}")
+
+    prices = panel.prices
+    momentum = np.full_like(prices, np.nan)
+    if lookback < prices.shape[0]:
+        momentum[lookback:] = prices[lookback:] / prices[:-lookback] - 1.0
+
+    # Rank within each row; NaNs sort last so they never make the long book
+    valid = ~np.isnan(momentum)
+    order = np.argsort(np.where(valid, -momentum, np.inf), axis=1)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(prices.shape[1])[None, :], axis=1)
+    valid_count = valid.sum(axis=1, keepdims=True)
+
+    positions = np.where(valid & (ranks < top_n), 1.0, 0.0)
+    if bottom_n > 0:
+        shorts = valid & (ranks >= valid_count - bottom_n) & (ranks >= top_n)
+        positions = np.where(shorts, -1.0, positions)
+    return positions
+
+
+STRATEGIES: Dict[str, StrategyFunc] = {
+    "signal": signal_strategy,
+    "momentum": momentum_strategy,
+}
+
+
+def _extract_trades(
+    panel: Panel, positions: np.ndarray
+) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """Turn runs of constant non-zero position into trade records"""
+    n_bars = positions.shape[0]
+    padded = np.zeros((n_bars + 2, positions.shape[1]))
+    padded[1:-1] = positions
+
+    # Transposed so that np.nonzero walks each company's bars in time order
+    changed = (padded[1:] != padded[:-1]).T
+    held = (padded != 0).T
+    start_col, start_bar = np.nonzero(changed[:, :-1] & held[:, 1:-1])
+    end_col, end_bar = np.nonzero(changed[:, 1:] & held[:, 1:-1])
+
+    # Positions decided at a bar's close earn the next bar's return, so the
+    # trade exits at the close after its last decision bar.
+    exit_bar = np.minimum(end_bar + 1, n_bars - 1)
+    direction = positions[start_bar, start_col]
+    entry_price = panel.prices[start_bar, start_col]
+    exit_price = panel.prices[exit_bar, end_col]
+    trade_returns = direction * (exit_price / entry_price - 1.0)
+
+    dates = panel.dates.astype(str)
+    trades = [
+        {
+            "company_id": int(company_id),
+            "direction": int(side),
+            "entry_date": entry_date,
+            "exit_date": exit_date,
+            "entry_price": float(entry),
+            "exit_price": float(exit_),
+            "return": float(ret),
+        }
+        for company_id, side, entry_date, exit_date, entry, exit_, ret in zip(
+            panel.company_ids[start_col].tolist(),
+            direction.tolist(),
+            dates[start_bar].tolist(),
+            dates[exit_bar].tolist(),
+            entry_price.tolist(),
+            exit_price.tolist(),
+            np.nan_to_num(trade_returns).tolist(),
+        )
+    ]
+    return trades, trade_returns
+
+
+def run_panel_backtest(
+    panel: Panel,
+    strategy_type: str,
+    parameters: Dict[str, Any],
+) -> BacktestResult:
+    """
+    Run a strategy over a loaded panel using array operations only.
+
+    Positions are equal-weighted across active names, decided at each bar's
+    close and applied to the following bar's return, with
+    transaction_cost_bps charged on turnover. max_drawdown is reported as a
+    positive fraction of peak equity.
+    """
+    strategy = STRATEGIES.get(strategy_type)
+    if strategy is None:
+        raise ValueError(
+            f"Unknown strategy type '{strategy_type}'. "
+            f"Available: {', '.join(sorted(STRATEGIES))}"
+        )
+
+    initial_capital = float(parameters.get("initial_capital", 1.0))
+    cost_rate = float(parameters.get("transaction_cost_bps", 0.0)) / 10_000
+
+    n_bars = panel.prices.shape[0]
+    if n_bars == 0:
+        return BacktestResult(
+            total_return=0.0,
+            annualized_return=0.0,
+            sharpe_ratio=0.0,
+            max_drawdown=0.0,
+            win_rate=0.0,
+            trades_count=0,
+            trades=[],
+            equity_curve=[],
+        )
+
+    # Names can only be held once they have a price
+    positions = strategy(panel, parameters) * ~np.isnan(panel.prices)
+
+    gross = np.abs(positions).sum(axis=1, keepdims=True)
+    weights = np.divide(positions, gross, out=np.zeros_like(positions), where=gross > 0)
+
+    asset_returns = np.zeros_like(panel.prices)
+    asset_returns[1:] = panel.prices[1:] / panel.prices[:-1] - 1.0
+    np.nan_to_num(asset_returns, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+    applied = np.zeros_like(weights)
+    applied[1:] = weights[:-1]
+    turnover = np.abs(np.diff(weights, axis=0, prepend=0.0)).sum(axis=1)
+
+    portfolio_returns = (applied * asset_returns).sum(axis=1) - cost_rate * turnover
+    equity = initial_capital * np.cumprod(1.0 + portfolio_returns)
+
+    total_return = float(equity[-1] / initial_capital - 1.0)
+    years = max(n_bars - 1, 1) / TRADING_DAYS_PER_YEAR
+    annualized_return = (
+        float((1.0 + total_return) ** (1.0 / years) - 1.0)
+        if total_return > -1.0
+        else -1.0
+    )
+
+    daily = portfolio_returns[1:]
+    volatility = float(daily.std(ddof=1)) if len(daily) > 1 else 0.0
+    sharpe_ratio = (
+        float(daily.mean() / volatility * math.sqrt(TRADING_DAYS_PER_YEAR))
+        if volatility > 0
+        else 0.0
+    )
+
+    peaks = np.maximum.accumulate(equity)
+    max_drawdown = float(np.max(1.0 - equity / peaks))
+
+    trades, trade_returns = _extract_trades(panel, positions)
+    win_rate = float(np.mean(trade_returns > 0)) if len(trades) else 0.0
+
+    equity_curve = [
+        {"date": day, "equity": value}
+        for day, value in zip(panel.dates.astype(str).tolist(), equity.tolist())
+    ]
+
+    return BacktestResult(
+        total_return=total_return,
+        annualized_return=annualized_return,
+        sharpe_ratio=sharpe_ratio,
+        max_drawdown=max_drawdown,
+        win_rate=win_rate,
+        trades_count=len(trades),
+        trades=trades,
+        equity_curve=equity_curve,
+    )
+
+
+def run_backtest(
+    db: Session,
+    strategy_type: str,
+    parameters: Dict[str, Any],
+    start_date: datetime,
+    end_date: datetime,
+) -> BacktestResult:
+    """Load the panel for a window and run a strategy over it"""
+    panel = load_panel(
+        db,
+        start_date=start_date,
+        end_date=end_date,
+        company_ids=parameters.get("company_ids"),
+    )
+    return run_panel_backtest(panel, strategy_type, parameters)
@@ -0,0 +1,214 @@
+# src/stockalpha/backtesting/sweep.py
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from stockalpha.api.schemas import BacktestResultCreate
+from stockalpha.backtesting.engine import (
+    STRATEGIES,
+    BacktestResult,
+    Panel,
+    load_panel,
+    run_panel_backtest,
+)
+from stockalpha.models.signals import Backtest
+from stockalpha.repositories import get_repository
+from stockalpha.repositories.backtest_repository import BacktestRepository
+
+logger = logging.getLogger(__name__)
+
+PANEL_FIELDS = (
+    "dates",
+    "company_ids",
+    "prices",
+    "signal_direction",
+    "signal_confidence",
+)
+
+# (shared memory name, shape, dtype) for each panel field
+PanelDescriptor = Dict[str, Tuple[str, Tuple[int, ...], str]]
+
+# Per-process state populated by the pool initializer
+_worker_panel: Optional[Panel] = None
+_worker_segments: List[shared_memory.SharedMemory] = []
+
+
+# Parameters fixed for a whole sweep: the panel is loaded once for all runs
+SWEEP_FIXED_PARAMETERS = ("company_ids",)
+
+
+def validate_grid(parameter_grid: Dict[str, List[Any]]) -> None:
+    """Reject grid keys a sweep cannot vary, and empty value lists"""
+    for name, values in parameter_grid.items():
+        if name in SWEEP_FIXED_PARAMETERS:
+            raise ValueError(f"'{name}' cannot be swept; set it in the base parameters")
+        if not values:
+            raise ValueError(f"Parameter grid entry '{name}' has no values")
+
+
+def expand_grid(
+    parameter_grid: Dict[str, List[Any]],
+    base_parameters: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Expand {name: [values]} into the cartesian product of parameter sets"""
+    base_parameters = base_parameters or {}
+    if not parameter_grid:
+        return [dict(base_parameters)]
+
+    names = list(parameter_grid)
+    return [
+        {**base_parameters, **dict(zip(names, values))}
+        for values in itertools.product(*(parameter_grid[name] for name in names))
+    ]
+
+
+class SharedPanel:
+    """
+    Copy of a Panel's arrays placed in shared memory.
+
+    Pool workers attach to the segments by name instead of receiving a
+    pickled copy of the panel, so the panel is materialised once no matter
+    how many runs or processes there are. Use as a context manager so the
+    segments are unlinked when the sweep finishes.
+    """
+
+    def __init__(self, panel: Panel):
+        self.descriptor: PanelDescriptor = {}
+        self._segments: List[shared_memory.SharedMemory] = []
+
+        for field in PANEL_FIELDS:
+            array = np.ascontiguousarray(getattr(panel, field))
+            # Zero-sized segments are not allowed
+            segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+            self._segments.append(segment)
+            self.descriptor[field] = (segment.name, array.shape, array.dtype.str)
+
+    def close(self) -> None:
+        """Release and unlink the shared memory segments"""
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+    def __enter__(self) -> "SharedPanel":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _attach_panel(descriptor: PanelDescriptor) -> None:
+    """Pool initializer: map the shared panel into this worker process"""
+    global _worker_panel
+
+    arrays = {}
+    for field, (name, shape, dtype) in descriptor.items():
+        segment = shared_memory.SharedMemory(name=name)
+        # Keep a reference so the mapping outlives this function
+        _worker_segments.append(segment)
+        arrays[field] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+
+    _worker_panel = Panel(**arrays)
+
+
+def _run_shared(task: Tuple[str, Dict[str, Any]]) -> BacktestResult:
+    strategy_type, parameters = task
+    if _worker_panel is None:
+        raise RuntimeError("Shared panel was not attached in this worker")
+    return run_panel_backtest(_worker_panel, strategy_type, parameters)
+
+
+def run_sweep(
+    panel: Panel,
+    strategy_type: str,
+    parameter_sets: List[Dict[str, Any]],
+    max_workers: Optional[int] = None,
+) -> List[BacktestResult]:
+    """
+    Run one backtest per parameter set over a shared panel.
+
+    Results are returned in the order of parameter_sets. With a single
+    worker (or a single run) everything runs in-process.
+    """
+    if strategy_type not in STRATEGIES:
+        raise ValueError(
+            f"Unknown strategy type '{strategy_type}'. "
+            f"Available: {', '.join(sorted(STRATEGIES))}"
+        )
+
+    if not parameter_sets:
+        return []
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(parameter_sets))
+    tasks = [(strategy_type, parameters) for parameters in parameter_sets]
+
+    if max_workers <= 1:
+        return [run_panel_backtest(panel, *task) for task in tasks]
+
+    logger.info(f"Running {len(tasks)} backtests across {max_workers} processes")
+    with SharedPanel(panel) as shared:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_attach_panel,
+            initargs=(shared.descriptor,),
+        ) as executor:
+            # Small chunks keep the workers evenly loaded without paying
+            # one IPC round trip per run
+            chunksize = max(1, len(tasks) // (max_workers * 4))
+            return list(executor.map(_run_shared, tasks, chunksize=chunksize))
+
+
+def run_parameter_sweep(
+    db: Session,
+    strategy_type: str,
+    parameter_grid: Dict[str, List[Any]],
+    start_date: datetime,
+    end_date: datetime,
+    base_parameters: Optional[Dict[str, Any]] = None,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    created_by: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> List[Backtest]:
+    """
+    Load the panel once, run every grid point and store all results.
+
+    The Backtest rows are written with a single bulk insert.
+    """
+    validate_grid(parameter_grid)
+    parameter_sets = expand_grid(parameter_grid, base_parameters)
+    company_ids = (base_parameters or {}).get("company_ids")
+
+    panel = load_panel(
+        db, start_date=start_date, end_date=end_date, company_ids=company_ids
+    )
+    results = run_sweep(panel, strategy_type, parameter_sets, max_workers=max_workers)
+
+    if not name:
+        name = f"{strategy_type} Sweep - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+    backtests = [
+        BacktestResultCreate(
+            name=f"{name} #{index}",
+            description=description,
+            strategy_type=strategy_type,
+            parameters=parameters,
+            start_date=start_date,
+            end_date=end_date,
+            **result.metrics(),
+        )
+        for index, (parameters, result) in enumerate(
+            zip(parameter_sets, results), start=1
+        )
+    ]
+
+    repo = get_repository(BacktestRepository)
+    return repo.create_batch(db, backtest_list=backtests, created_by=created_by)
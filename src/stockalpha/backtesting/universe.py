@@ -0,0 +1,69 @@
+# src/stockalpha/backtesting/universe.py
+import logging
+from datetime import date
+from typing import Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from stockalpha.repositories import get_repository
+from stockalpha.repositories.fundamental_data_repository import (
+    FundamentalDataRepository,
+)
+from stockalpha.repositories.price_data_repository import PriceDataRepository
+from stockalpha.repositories.signal_repository import SignalRepository
+from stockalpha.repositories.universe_snapshot import (
+    UniversePanel,
+    universe_panel_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def load_universe_panel(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    company_ids: Optional[Sequence[int]] = None,
+    period: str = "quarterly",
+    replica_lag: float = 0,
+) -> UniversePanel:
+    """
+    Load a point-in-time panel of prices, fundamentals and signals.
+
+    Three queries feed one vectorized as-of join; the result is cached by
+    universe and date range until prices, fundamentals or signals change.
+    When db reads from a replica, pass its maximum lag as replica_lag so
+    that a panel which may miss a recent write is not cached.
+    """
+    key = universe_panel_cache.key(company_ids, start_date, end_date, period)
+    panel = universe_panel_cache.get(key)
+    if panel is not None:
+        return panel
+
+    generation = universe_panel_cache.generation
+    universe = key[0]
+    bar_rows = get_repository(PriceDataRepository).get_bar_rows(
+        db, start_date, end_date, company_ids=universe
+    )
+    fundamental_rows = get_repository(FundamentalDataRepository).get_as_of_rows(
+        db, start_date, end_date, period=period, company_ids=universe
+    )
+    signal_rows = get_repository(SignalRepository).get_as_of_rows(
+        db, start_date, end_date, company_ids=universe
+    )
+    logger.debug(
+        f"Loaded {len(bar_rows)} bars, {len(fundamental_rows)} reports and "
+        f"{len(signal_rows)} signals"
+    )
+
+    panel = UniversePanel.build(
+        start_date,
+        end_date,
+        period,
+        bar_rows,
+        fundamental_rows,
+        signal_rows,
+        company_ids=universe,
+    )
+    universe_panel_cache.put(key, panel, generation, replica_lag=replica_lag)
+    return panel
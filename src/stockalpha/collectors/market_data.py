@@ -0,0 +1,140 @@
+# src/stockalpha/collectors/market_data.py
+import csv
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Type
+
+from stockalpha.utils.config import settings
+
+# Bar fields providers return, besides date
+BAR_FIELDS = ("open", "high", "low", "close", "adjusted_close", "volume")
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` acquisitions per second, shared by threads"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class MarketDataProvider(ABC):
+    """
+    Source of daily price bars for a ticker.
+
+    Subclasses implement fetch; callers go through fetch_bars, which applies
+    the provider's rate limit across every thread using it.
+    """
+
+    name: str = ""
+
+    def __init__(self, requests_per_second: Optional[float] = None):
+        self.rate_limiter = (
+            RateLimiter(requests_per_second) if requests_per_second else None
+        )
+
+    def fetch_bars(self, ticker: str, start: date, end: date) -> List[Dict[str, Any]]:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return self.fetch(ticker, start, end)
+
+    @abstractmethod
+    def fetch(self, ticker: str, start: date, end: date) -> List[Dict[str, Any]]:
+        """
+        Bars from start to end inclusive, oldest first.
+
+        Each bar is a dict with a datetime `date` and any of BAR_FIELDS.
+        """
+
+
+class CsvMarketDataProvider(MarketDataProvider):
+    """
+    Read bars from <directory>/<TICKER>.csv files.
+
+    Files have a header row with date and any of BAR_FIELDS; empty cells
+    are treated as missing values.
+    """
+
+    name = "csv"
+
+    def __init__(self, directory: str, requests_per_second: Optional[float] = None):
+        super().__init__(requests_per_second)
+        self.directory = directory
+
+    def fetch(self, ticker: str, start: date, end: date) -> List[Dict[str, Any]]:
+        path = os.path.join(self.directory, f"{ticker}.csv")
+        if not os.path.exists(path):
+            return []
+
+        bars: List[Dict[str, Any]] = []
+        with open(path, newline="") as f:
+            for record in csv.DictReader(f):
+                bar_date = datetime.fromisoformat(record["date"])
+                if not start <= bar_date.date() <= end:
+                    continue
+                bars.append(
+                    {
+                        "date": bar_date,
+                        **{
+                            field: float(record[field]) if record.get(field) else None
+                            for field in BAR_FIELDS
+                        },
+                    }
+                )
+        bars.sort(key=lambda bar: bar["date"])
+        return bars
+
+
+PROVIDERS: Dict[str, Type[MarketDataProvider]] = {
+    CsvMarketDataProvider.name: CsvMarketDataProvider,
+}
+
+
+def register_provider(provider_class: Type[MarketDataProvider]) -> None:
+    """Make a provider available by its name to get_provider"""
+    PROVIDERS[provider_class.name] = provider_class
+
+
+def get_provider(name: Optional[str] = None) -> MarketDataProvider:
+    """
+    Build a provider from collection.market_data in the YAML config.
+
+    Without a name, the first provider in collection.market_data.providers
+    that is registered is used. Options for a provider are read from the
+    section named after it, e.g. collection.market_data.csv.directory.
+    """
+    config = settings.yaml_config.get("collection", {}).get("market_data", {})
+    if name is None:
+        name = next((p for p in config.get("providers", []) if p in PROVIDERS), None)
+        if name is None:
+            raise ValueError(
+                "None of the configured market data providers is available "
+                f"(available: {', '.join(sorted(PROVIDERS))})"
+            )
+    if name not in PROVIDERS:
+        raise ValueError(
+            f"Unknown market data provider {name!r} "
+            f"(available: {', '.join(sorted(PROVIDERS))})"
+        )
+    return PROVIDERS[name](**config.get(name, {}))
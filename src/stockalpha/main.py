@@ -1,7 +1,9 @@
 # src/stockalpha/main.py
 import argparse
+import json
 import logging
 import sys
+from datetime import datetime
 from pathlib import Path
 
 from stockalpha.utils.config import settings
@@ -38,20 +40,154 @@ def start_api():
     )
 
 
-def start_worker():
+def start_worker(args: argparse.Namespace):
     """Start the background worker for processing tasks"""
+    from stockalpha.workers.tasks import process_tasks
+
+    logger.info("Starting background worker...")
     try:
-        # We're adding an import placeholder for now - you'll implement this later
-        # from stockalpha.workers.tasks import process_tasks
+        process_tasks(
+            concurrency=args.concurrency,
+            poll_interval=args.poll_interval,
+            once=args.once,
+        )
+    except KeyboardInterrupt:
+        logger.info("Worker stopped")
+
+
+def generate_signals(args: argparse.Namespace):
+    """Generate signals from unprocessed announcements"""
+    from stockalpha.workers.signals import run_signal_pipeline
+
+    stats = run_signal_pipeline(
+        partitions=args.partitions,
+        partition=args.partition,
+        chunk_size=args.chunk_size,
+        company_ids=args.company_id,
+    )
+    logger.info(
+        f"Processed {stats.announcements} announcements into {stats.signals} "
+        f"signals ({stats.classified} classified, {stats.skipped} awaiting "
+        "classification)"
+    )
+
+
+def ingest_market_data(args: argparse.Namespace):
+    """Fetch the price bars companies are missing from a market data provider"""
+    from stockalpha.collectors.market_data import get_provider
+    from stockalpha.workers.market_data import ingest_market_data as ingest
+
+    stats = ingest(
+        get_provider(args.provider),
+        company_ids=args.company_id,
+        end=datetime.fromisoformat(args.end).date() if args.end else None,
+        max_workers=args.workers,
+    )
+    logger.info(
+        f"Inserted {stats.inserted} of {stats.bars} bars for {stats.companies} "
+        f"companies ({stats.up_to_date} up to date, {stats.failed} failed)"
+    )
+    if stats.failed:
+        sys.exit(1)
+
+
+def refresh_ratios(args: argparse.Namespace):
+    """Recompute stored fundamental ratios, e.g. to backfill them"""
+    from stockalpha.repositories.fundamental_ratio_repository import (
+        fundamental_ratio_repository,
+    )
+    from stockalpha.utils.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        written = fundamental_ratio_repository.refresh(db, company_ids=args.company_id)
+    finally:
+        db.close()
+
+    logger.info(f"Stored {written} fundamental ratio rows")
+
+
+def promote_fields(args: argparse.Namespace):
+    """Add configured promoted statement columns and backfill them"""
+    from stockalpha.models.promoted import install_promoted_fields
+    from stockalpha.repositories.fundamental_data_repository import (
+        FundamentalDataRepository,
+    )
+    from stockalpha.utils.database import SessionLocal, engine
+
+    with engine.begin() as connection:
+        install_promoted_fields(connection)
+
+    db = SessionLocal()
+    try:
+        updated = FundamentalDataRepository().backfill_promoted(db)
+    finally:
+        db.close()
+
+    logger.info(f"Backfilled promoted fields of {updated} fundamental data rows")
+
+
+def maintain_partitions(args: argparse.Namespace):
+    """Create upcoming partitions and drop those past retention"""
+    from datetime import timedelta
+
+    from stockalpha.models.partitioning import (
+        enforce_retention,
+        ensure_partitions,
+        partition_specs,
+    )
+    from stockalpha.utils.cache import response_cache
+    from stockalpha.utils.database import engine
+
+    with engine.begin() as connection:
+        created = ensure_partitions(connection)
+    logger.info(f"Created {len(created)} partitions")
+
+    specs = partition_specs()
+    for table in args.table or list(specs):
+        days = args.older_than_days or (
+            specs[table].retention_days if table in specs else None
+        )
+        if not days:
+            continue
 
-        logger.info("Starting background worker...")
-        # process_tasks()  # This will be uncommented when the module is created
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        with engine.begin() as connection:
+            result = enforce_retention(connection, table, cutoff)
+        response_cache.invalidate(table)
+        logger.info(
+            f"Removed {table} rows before {cutoff:%Y-%m-%d}: dropped "
+            f"{len(result.dropped)} partitions, deleted {result.deleted} rows"
+        )
 
-        # For now, use a placeholder message
-        logger.info("Worker started. (Task processing will be implemented later)")
-    except ImportError as e:
-        logger.error(f"Failed to start worker: {e}")
-        logger.info("Worker module will be implemented in a future phase")
+
+def run_sweep(args: argparse.Namespace):
+    """Run a parameter-sweep backtest from the command line"""
+    from stockalpha.backtesting.sweep import run_parameter_sweep
+    from stockalpha.utils.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        backtests = run_parameter_sweep(
+            db,
+            strategy_type=args.strategy,
+            parameter_grid=json.loads(args.grid),
+            start_date=datetime.fromisoformat(args.start),
+            end_date=datetime.fromisoformat(args.end),
+            base_parameters=json.loads(args.params),
+            name=args.name,
+            created_by=args.created_by,
+            max_workers=args.workers,
+        )
+    finally:
+        db.close()
+
+    logger.info(f"Stored {len(backtests)} backtests")
+    for backtest in sorted(backtests, key=lambda b: b.total_return, reverse=True):
+        print(
+            f"{backtest.id}\t{backtest.total_return:.4f}\t"
+            f"{backtest.sharpe_ratio:.2f}\t{json.dumps(backtest.parameters)}"
+        )
 
 
 def main():
@@ -67,6 +203,115 @@ def main():
 
     # Worker command
     worker_parser = subparsers.add_parser("worker", help="Start the background worker")
+    worker_parser.add_argument(
+        "--concurrency", type=int, help="Maximum number of jobs run at once"
+    )
+    worker_parser.add_argument(
+        "--poll-interval", type=float, help="Seconds between polls of an empty queue"
+    )
+    worker_parser.add_argument(
+        "--once", action="store_true", help="Exit once the queue is drained"
+    )
+
+    # Signal generation command
+    signals_parser = subparsers.add_parser(
+        "signals", help="Generate signals from unprocessed announcements"
+    )
+    signals_parser.add_argument(
+        "--partitions",
+        type=int,
+        default=1,
+        help="Number of company_id partitions, each run on its own thread",
+    )
+    signals_parser.add_argument(
+        "--partition",
+        type=int,
+        help="Only run this partition (0-based), e.g. one per process or host",
+    )
+    signals_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="Announcements per transaction",
+    )
+    signals_parser.add_argument(
+        "--company-id",
+        type=int,
+        action="append",
+        help="Only process this company's announcements; may be repeated",
+    )
+
+    # Market data ingestion command
+    ingest_parser = subparsers.add_parser(
+        "ingest-market-data", help="Fetch new price bars since each company's latest"
+    )
+    ingest_parser.add_argument(
+        "--provider",
+        help="Provider name (default: first available in collection.market_data)",
+    )
+    ingest_parser.add_argument(
+        "--company-id",
+        type=int,
+        action="append",
+        help="Only ingest this company; may be repeated",
+    )
+    ingest_parser.add_argument("--end", help="Last date to fetch (ISO, default today)")
+    ingest_parser.add_argument("--workers", type=int, help="Companies fetched at once")
+
+    # Ratio refresh command
+    ratios_parser = subparsers.add_parser(
+        "refresh-ratios", help="Recompute derived fundamental ratios"
+    )
+    ratios_parser.add_argument(
+        "--company-id",
+        type=int,
+        action="append",
+        help="Only refresh this company; may be repeated (default: all)",
+    )
+
+    # Promoted fields command
+    subparsers.add_parser(
+        "promote-fields",
+        help="Add and backfill the configured promoted statement fields",
+    )
+
+    # Partition maintenance command
+    partitions_parser = subparsers.add_parser(
+        "maintain-partitions",
+        help="Create upcoming table partitions and apply retention",
+    )
+    partitions_parser.add_argument(
+        "--table",
+        action="append",
+        choices=["pricedata", "signal"],
+        help="Only apply retention to this table; may be repeated",
+    )
+    partitions_parser.add_argument(
+        "--older-than-days",
+        type=int,
+        help="Remove rows older than this (default: the table's retention_days)",
+    )
+
+    # Sweep command
+    sweep_parser = subparsers.add_parser(
+        "sweep", help="Run backtests over a parameter grid"
+    )
+    sweep_parser.add_argument("--strategy", required=True, help="Strategy type")
+    sweep_parser.add_argument(
+        "--grid",
+        required=True,
+        help="Parameter grid as JSON, e.g. '{\"holding_days\": [5, 10, 20]}'",
+    )
+    sweep_parser.add_argument(
+        "--params", default="{}", help="Fixed parameters shared by every run (JSON)"
+    )
+    sweep_parser.add_argument("--start", required=True, help="Start date (ISO)")
+    sweep_parser.add_argument("--end", required=True, help="End date (ISO)")
+    sweep_parser.add_argument("--name", help="Name prefix for the stored backtests")
+    sweep_parser.add_argument("--created-by", help="Author recorded on each backtest")
+    sweep_parser.add_argument(
+        "--workers", type=int, help="Number of worker processes (default: CPUs)"
+    )
 
     # Parse arguments
     args = parser.parse_args()
@@ -81,7 +326,26 @@ def main():
     elif args.command == "api":
         start_api()
     elif args.command == "worker":
-        start_worker()
+        start_worker(args)
+    elif args.command == "signals":
+        if args.partitions < 1:
+            parser.error("--partitions must be at least 1")
+        if args.partition is not None and not 0 <= args.partition < args.partitions:
+            parser.error(
+                f"--partition must be between 0 and {args.partitions - 1} "
+                f"for --partitions {args.partitions}"
+            )
+        generate_signals(args)
+    elif args.command == "ingest-market-data":
+        ingest_market_data(args)
+    elif args.command == "refresh-ratios":
+        refresh_ratios(args)
+    elif args.command == "promote-fields":
+        promote_fields(args)
+    elif args.command == "maintain-partitions":
+        maintain_partitions(args)
+    elif args.command == "sweep":
+        run_sweep(args)
     else:
         parser.print_help()
         sys.exit(1)
@@ -9,11 +9,14 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    func,
+    literal_column,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import DateTime
 
 from stockalpha.models.base import Base
+from stockalpha.models.promoted import PROMOTED_FIELDS
 
 
 class Company(Base):
@@ -99,16 +102,88 @@ class FundamentalData(Base):
 
     __table_args__ = (
         Index("idx_company_fiscal", "company_id", "fiscal_year", "fiscal_quarter"),
-        # This unique constraint ensures we don't have duplicate entries
+    )
+
+    # Relationships
+    company = relationship("Company", back_populates="fundamental_data")
+
+
+# Annual rows have no fiscal_quarter, so period keys and sorts compare it as
+# 0. The 0 is rendered inline rather than bound, so that queries match the
+# expression index below on every driver
+FISCAL_QUARTER_KEY = func.coalesce(FundamentalData.fiscal_quarter, literal_column("0"))
+
+# One row per period. Keyed on the 0 rather than the column, since NULLs are
+# distinct in a unique index and would let annual rows repeat
+Index(
+    "idx_unique_fundamental_period",
+    FundamentalData.company_id,
+    FundamentalData.period,
+    FundamentalData.fiscal_year,
+    FISCAL_QUARTER_KEY,
+    unique=True,
+)
+
+# Order of FundamentalDataRepository.keyset, so pages are read in index order
+Index(
+    "idx_fundamental_keyset",
+    FundamentalData.fiscal_year,
+    FISCAL_QUARTER_KEY,
+    FundamentalData.id,
+)
+
+# Frequently queried statement values, copied out of the JSON columns on write
+# so they can be filtered on and indexed like the core metrics
+for _field in PROMOTED_FIELDS.values():
+    setattr(FundamentalData, _field.name, Column(_field.name, Float))
+    Index(_field.index_name, getattr(FundamentalData, _field.name))
+
+
+class FundamentalRatio(Base):
+    """Ratios derived from one FundamentalData period"""
+
+    fundamental_id = Column(
+        Integer,
+        ForeignKey("fundamentaldata.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    company_id = Column(Integer, ForeignKey("company.id"), nullable=False)
+    period = Column(String(10), nullable=False)  # 'annual' or 'quarterly'
+    fiscal_year = Column(Integer, nullable=False)
+    fiscal_quarter = Column(Integer)
+    report_date = Column(DateTime, nullable=False)
+
+    # Profitability, for the period (quarterly figures are not annualized)
+    net_margin = Column(Float)
+    roe = Column(Float)
+    roa = Column(Float)
+
+    # Leverage
+    debt_to_equity = Column(Float)
+    debt_to_assets = Column(Float)
+
+    # Growth against the same period a year earlier
+    revenue_growth_yoy = Column(Float)
+    net_income_growth_yoy = Column(Float)
+    eps_growth_yoy = Column(Float)
+
+    # Growth against the previous quarter (quarterly periods only)
+    revenue_growth_qoq = Column(Float)
+    net_income_growth_qoq = Column(Float)
+    eps_growth_qoq = Column(Float)
+
+    __table_args__ = (
         Index(
-            "idx_unique_fundamental",
+            "idx_ratio_company_period",
             "company_id",
             "period",
             "fiscal_year",
             "fiscal_quarter",
-            unique=True,
         ),
+        Index("idx_ratio_period_year", "period", "fiscal_year"),
     )
 
     # Relationships
-    company = relationship("Company", back_populates="fundamental_data")
+    company = relationship("Company")
+    fundamental = relationship("FundamentalData")
@@ -0,0 +1,351 @@
+# src/stockalpha/models/partitioning.py
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import MetaData, PrimaryKeyConstraint, inspect, text
+from sqlalchemy.engine import Connection
+
+from stockalpha.models.base import Base
+from stockalpha.models.entities import PriceData
+from stockalpha.models.signals import Signal
+from stockalpha.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tables that can be partitioned, all by their date column
+PARTITIONABLE_TABLES = {
+    model.__table__.name: model.__table__ for model in (PriceData, Signal)
+}
+
+# Used when partitioning.tables is not configured
+DEFAULT_PARTITIONED_TABLES = {
+    "pricedata": {"interval": "year"},
+    "signal": {"interval": "month"},
+}
+
+# Future partitions created ahead of time when partitioning.premake is not set
+DEFAULT_PREMAKE = 3
+
+INTERVALS = ("month", "year")
+
+# Partition DDL locks the parent table; waiting behind a long transaction
+# would stall every query queued after it, so give up instead
+LOCK_TIMEOUT = "10s"
+
+# Transaction-level advisory lock serializing schema changes, so processes
+# starting together do not race to create the same tables and partitions
+SCHEMA_LOCK_KEY = 0x5354414C  # "STAL"
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """How one table is range-partitioned on PostgreSQL"""
+
+    table: str
+    interval: str  # One of INTERVALS
+    column: str = "date"
+    retention_days: Optional[int] = None  # Applied by maintain-partitions
+
+    @property
+    def default_partition(self) -> str:
+        return f"{self.table}_default"
+
+    def floor(self, value: datetime) -> datetime:
+        """Start of the partition containing value"""
+        if self.interval == "year":
+            return datetime(value.year, 1, 1)
+        return datetime(value.year, value.month, 1)
+
+    def next(self, start: datetime) -> datetime:
+        """Start of the partition following the one starting at start"""
+        if self.interval == "year":
+            return datetime(start.year + 1, 1, 1)
+        if start.month == 12:
+            return datetime(start.year + 1, 1, 1)
+        return datetime(start.year, start.month + 1, 1)
+
+    def partition_name(self, start: datetime) -> str:
+        suffix = f"{start:%Y}" if self.interval == "year" else f"{start:%Y%m}"
+        return f"{self.table}_p{suffix}"
+
+
+def load_partition_specs(config: Optional[Dict]) -> Dict[str, PartitionSpec]:
+    """Validate partitioning settings, by table name"""
+    specs = {}
+    for table, options in (config or DEFAULT_PARTITIONED_TABLES).items():
+        if table not in PARTITIONABLE_TABLES:
+            raise ValueError(f"Table {table!r} does not support partitioning")
+        interval = options.get("interval", "month")
+        if interval not in INTERVALS:
+            raise ValueError(f"Partition interval for {table!r} must be in {INTERVALS}")
+        retention_days = options.get("retention_days")
+        if retention_days is not None:
+            retention_days = int(retention_days)
+            if retention_days <= 0:
+                raise ValueError(
+                    f"Retention for {table!r} must be a positive number of days"
+                )
+        specs[table] = PartitionSpec(table, interval, retention_days=retention_days)
+    return specs
+
+
+PARTITIONING = settings.yaml_config.get("partitioning", {})
+
+
+@lru_cache()
+def partition_specs() -> Dict[str, PartitionSpec]:
+    """
+    The configured partitioning, by table name.
+
+    Validated on first use rather than at import, so a bad partitioning
+    section only fails the commands that partition.
+    """
+    return load_partition_specs(PARTITIONING.get("tables"))
+
+
+@dataclass
+class RetentionResult:
+    dropped: List[str]  # Whole partitions dropped
+    deleted: int  # Rows deleted one by one, outside dropped partitions
+
+
+def _quote(connection: Connection, name: str) -> str:
+    return connection.dialect.identifier_preparer.quote(name)
+
+
+def _literal(value: datetime) -> str:
+    return f"'{value.isoformat(sep=' ')}'"
+
+
+def create_tables(connection: Connection) -> None:
+    """
+    Create missing tables, range-partitioning the configured ones on PostgreSQL.
+
+    Partitioned tables get a primary key of (id, date), as PostgreSQL
+    requires the partition key in every unique index; ids stay unique as
+    they come from one sequence. Existing unpartitioned tables are kept as
+    they are. On PostgreSQL this holds the schema lock until the
+    transaction ends.
+    """
+    if connection.dialect.name != "postgresql":
+        Base.metadata.create_all(connection)
+        return
+
+    _lock_schema(connection)
+    specs = partition_specs()
+
+    # Nothing references the partitioned tables, so they can come last
+    Base.metadata.create_all(
+        connection,
+        tables=[
+            table for table in Base.metadata.sorted_tables if table.name not in specs
+        ],
+    )
+
+    existing = set(inspect(connection).get_table_names())
+    for spec in specs.values():
+        if spec.table in existing:
+            if not _is_partitioned(connection, spec.table):
+                logger.warning(
+                    f"Table {spec.table} exists unpartitioned; recreate it to "
+                    "partition it"
+                )
+            continue
+
+        # Referenced tables only need to be known for the foreign keys to
+        # compile; they are not created here
+        metadata = MetaData()
+        source = PARTITIONABLE_TABLES[spec.table]
+        for fk in source.foreign_keys:
+            fk.column.table.to_metadata(metadata)
+        table = source.to_metadata(metadata)
+        table.c[spec.column].primary_key = True
+        table.append_constraint(PrimaryKeyConstraint(table.c.id, table.c[spec.column]))
+        table.dialect_options["postgresql"][
+            "partition_by"
+        ] = f"RANGE ({_quote(connection, spec.column)})"
+        table.create(connection)
+
+        # Rows outside every range partition land here until one covers them
+        connection.execute(
+            text(
+                f"CREATE TABLE {_quote(connection, spec.default_partition)} "
+                f"PARTITION OF {_quote(connection, spec.table)} DEFAULT"
+            )
+        )
+
+
+def ensure_partitions(
+    connection: Connection, until: Optional[datetime] = None
+) -> List[str]:
+    """
+    Create partitions through partitioning.premake intervals after until.
+
+    Ranges holding rows of the default partition get a partition too, and
+    those rows are moved into it. Safe to run repeatedly. Returns the names
+    of the partitions created.
+    """
+    if connection.dialect.name != "postgresql":
+        return []
+
+    _lock_schema(connection)
+    _set_lock_timeout(connection)
+    until = until or datetime.utcnow()
+    premake = PARTITIONING.get("premake", DEFAULT_PREMAKE)
+    created = []
+    for spec in partition_specs().values():
+        if not _is_partitioned(connection, spec.table):
+            continue
+
+        existing = {name for name, _, _ in _partitions(connection, spec)}
+        column = _quote(connection, spec.column)
+        default = _quote(connection, spec.default_partition)
+        earliest = connection.execute(
+            text(f"SELECT min({column}) FROM {default}")
+        ).scalar()
+
+        start = spec.floor(min(until, earliest or until))
+        end = spec.floor(until)
+        for _ in range(premake + 1):
+            end = spec.next(end)
+
+        while start < end:
+            upper = spec.next(start)
+            name = spec.partition_name(start)
+            if name not in existing:
+                _create_partition(connection, spec, name, start, upper)
+                created.append(name)
+            start = upper
+
+    return created
+
+
+def _create_partition(
+    connection: Connection,
+    spec: PartitionSpec,
+    name: str,
+    lower: datetime,
+    upper: datetime,
+) -> None:
+    parent = _quote(connection, spec.table)
+    partition = _quote(connection, name)
+    default = _quote(connection, spec.default_partition)
+    column = _quote(connection, spec.column)
+    bounds = f"FOR VALUES FROM ({_literal(lower)}) TO ({_literal(upper)})"
+    in_range = f"{column} >= {_literal(lower)} AND {column} < {_literal(upper)}"
+
+    if not connection.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})")
+    ).scalar():
+        connection.execute(
+            text(f"CREATE TABLE {partition} PARTITION OF {parent} {bounds}")
+        )
+        return
+
+    # Attaching a range the default partition has rows in fails, so the rows
+    # move to a standalone table first, which is then attached
+    connection.execute(
+        text(
+            f"CREATE TABLE {partition} "
+            f"(LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) "
+            f"INSERT INTO {partition} SELECT * FROM moved"
+        )
+    )
+    connection.execute(
+        text(f"ALTER TABLE {parent} ATTACH PARTITION {partition} {bounds}")
+    )
+
+
+def enforce_retention(
+    connection: Connection, table: str, cutoff: datetime
+) -> RetentionResult:
+    """
+    Remove a table's rows dated before cutoff.
+
+    On PostgreSQL, partitions wholly before cutoff are dropped, which costs
+    the same however many rows they hold; only rows of the partition
+    straddling cutoff and of the default partition are deleted. Other
+    databases, or unpartitioned tables, fall back to a DELETE.
+    """
+    spec = partition_specs().get(table) or PartitionSpec(table, "month")
+    dropped = []
+    if connection.dialect.name == "postgresql" and _is_partitioned(connection, table):
+        _lock_schema(connection)
+        _set_lock_timeout(connection)
+        for name, _, upper in _partitions(connection, spec):
+            if upper is not None and upper <= cutoff:
+                connection.execute(text(f"DROP TABLE {_quote(connection, name)}"))
+                dropped.append(name)
+
+    # Partition pruning limits this to the partitions that can still hold
+    # such rows
+    deleted = connection.execute(
+        text(
+            f"DELETE FROM {_quote(connection, table)} "
+            f"WHERE {_quote(connection, spec.column)} < :cutoff"
+        ),
+        {"cutoff": cutoff},
+    ).rowcount
+    return RetentionResult(dropped=dropped, deleted=deleted)
+
+
+def _lock_schema(connection: Connection) -> None:
+    # Taken before lock_timeout is set: a concurrent init_db or maintenance
+    # run is waited for rather than failed
+    connection.execute(text(f"SELECT pg_advisory_xact_lock({SCHEMA_LOCK_KEY})"))
+
+
+def _set_lock_timeout(connection: Connection) -> None:
+    connection.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+
+
+def _is_partitioned(connection: Connection, table: str) -> bool:
+    return bool(
+        connection.execute(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table "
+                "AND pg_table_is_visible(c.oid))"
+            ),
+            {"table": table},
+        ).scalar()
+    )
+
+
+def _partitions(
+    connection: Connection, spec: PartitionSpec
+) -> List[Tuple[str, Optional[datetime], Optional[datetime]]]:
+    """(name, lower, upper) of a table's range partitions"""
+    rows = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table AND pg_table_is_visible(p.oid)"
+        ),
+        {"table": spec.table},
+    ).scalars()
+
+    partitions: List[Tuple[str, Optional[datetime], Optional[datetime]]] = []
+    for name in rows:
+        if name == spec.default_partition:
+            continue
+        suffix = name[len(spec.table) + 2 :]
+        try:
+            lower = datetime.strptime(
+                suffix, "%Y" if spec.interval == "year" else "%Y%m"
+            )
+        except ValueError:
+            # Not created by ensure_partitions; bounds unknown, left alone
+            partitions.append((name, None, None))
+            continue
+        partitions.append((name, lower, spec.next(lower)))
+    return partitions
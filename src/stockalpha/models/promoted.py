@@ -0,0 +1,127 @@
+# src/stockalpha/models/promoted.py
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from stockalpha.models.base import Base
+from stockalpha.utils.config import settings
+
+# FundamentalData JSON columns fields can be promoted from
+STATEMENT_COLUMNS = ("income_statement_data", "balance_sheet_data", "cash_flow_data")
+
+# Used when collection.fundamental_data.promoted_fields is not configured
+DEFAULT_PROMOTED_FIELDS = {
+    "gross_profit": {"source": "income_statement_data", "key": "grossProfit"},
+    "operating_income": {"source": "income_statement_data", "key": "operatingIncome"},
+    "cash_and_equivalents": {
+        "source": "balance_sheet_data",
+        "key": "cashAndCashEquivalents",
+    },
+    "total_debt": {"source": "balance_sheet_data", "key": "totalDebt"},
+    "operating_cash_flow": {"source": "cash_flow_data", "key": "operatingCashFlow"},
+    "capital_expenditure": {"source": "cash_flow_data", "key": "capitalExpenditure"},
+    "free_cash_flow": {"source": "cash_flow_data", "key": "freeCashFlow"},
+}
+
+COLUMN_NAME = re.compile(r"^[a-z][a-z0-9_]*$")
+
+
+@dataclass(frozen=True)
+class PromotedField:
+    """A statement value copied into its own Float column on fundamentaldata"""
+
+    name: str  # Column name
+    source: str  # One of STATEMENT_COLUMNS
+    key: str  # Key within the statement; dots descend into nested objects
+
+    @property
+    def index_name(self) -> str:
+        return f"idx_fundamental_{self.name}"
+
+    def extract(self, statement: Any) -> Optional[float]:
+        """The field's value in a statement, None when missing or not numeric"""
+        value = statement
+        for part in self.key.split("."):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return float(value.replace(",", ""))
+            except ValueError:
+                return None
+        return None
+
+
+def load_promoted_fields(
+    config: Optional[Mapping[str, Mapping[str, str]]],
+) -> Dict[str, PromotedField]:
+    """Validate promoted field settings, by column name"""
+    fields = {}
+    for name, options in (config or DEFAULT_PROMOTED_FIELDS).items():
+        if not COLUMN_NAME.match(name):
+            raise ValueError(f"Invalid promoted field name: {name!r}")
+        if options.get("source") not in STATEMENT_COLUMNS:
+            raise ValueError(
+                f"Promoted field {name!r} needs a source among {STATEMENT_COLUMNS}"
+            )
+        if not options.get("key"):
+            raise ValueError(f"Promoted field {name!r} needs a key")
+        fields[name] = PromotedField(name, options["source"], options["key"])
+    return fields
+
+
+# Which fields are promoted is configuration; entities.py adds their columns
+PROMOTED_FIELDS = load_promoted_fields(
+    settings.yaml_config.get("collection", {})
+    .get("fundamental_data", {})
+    .get("promoted_fields")
+)
+
+
+def extract_promoted(values: Mapping[str, Any]) -> Dict[str, Optional[float]]:
+    """
+    Promoted column values for FundamentalData column values.
+
+    Only fields whose statement is among values are returned, so a partial
+    update leaves the columns of other statements alone.
+    """
+    return {
+        field.name: field.extract(values[field.source])
+        for field in PROMOTED_FIELDS.values()
+        if field.source in values
+    }
+
+
+def install_promoted_fields(connection: Connection) -> None:
+    """
+    Add promoted columns and indexes missing from an existing table.
+
+    Safe to run repeatedly. New columns start out NULL until backfilled with
+    FundamentalDataRepository.backfill_promoted.
+    """
+    table = Base.metadata.tables["fundamentaldata"]
+    existing = {c["name"] for c in inspect(connection).get_columns(table.name)}
+    preparer = connection.dialect.identifier_preparer
+
+    for field in PROMOTED_FIELDS.values():
+        if field.name not in existing:
+            column = table.c[field.name]
+            connection.execute(
+                text(
+                    f"ALTER TABLE {preparer.quote(table.name)} "
+                    f"ADD COLUMN {preparer.quote(column.name)} "
+                    f"{column.type.compile(dialect=connection.dialect)}"
+                )
+            )
+        next(i for i in table.indexes if i.name == field.index_name).create(
+            connection, checkfirst=True
+        )
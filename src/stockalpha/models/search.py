@@ -0,0 +1,137 @@
+# src/stockalpha/models/search.py
+from typing import Any, List, Tuple
+
+from sqlalchemy import Float, cast, column, event, func, literal_column, table, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import ColumnElement
+
+from stockalpha.models.entities import Announcement
+
+# Text search configuration for stemming and stop words on PostgreSQL
+SEARCH_CONFIG = "english"
+
+# Titles count for more than body text when ranking: bm25 column weights on
+# SQLite, setweight A and B on PostgreSQL
+TITLE_WEIGHT = 2.0
+CONTENT_WEIGHT = 1.0
+
+# PostgreSQL: a stored tsvector column kept up to date by the database, so
+# ranking reads it instead of parsing the text again, and a GIN index on it
+SEARCH_VECTOR_COLUMN = "search_vector"
+POSTGRESQL_DDL = [
+    f"""
+    ALTER TABLE announcement ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    f"""
+    CREATE INDEX IF NOT EXISTS idx_announcement_search
+    ON announcement USING gin ({SEARCH_VECTOR_COLUMN})
+    """,
+]
+
+# SQLite: an external-content FTS5 table over announcement, kept in sync by
+# triggers
+FTS_TABLE = "announcement_fts"
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+    USING fts5(title, content, content='announcement', content_rowid='id')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON announcement
+    BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON announcement
+    BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF title, content ON announcement
+    BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE} (rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+
+def install_search_index(connection: Connection) -> None:
+    """
+    Create the announcement search index if it does not exist yet.
+
+    Safe to run repeatedly. On an existing PostgreSQL table, adding the
+    stored column rewrites the table, so run it in a maintenance window.
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRESQL_DDL:
+            connection.exec_driver_sql(statement)
+    elif dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+        for statement in SQLITE_DDL:
+            connection.exec_driver_sql(statement)
+        if not exists:
+            # Index the rows written before the FTS table existed
+            connection.exec_driver_sql(
+                f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')"
+            )
+
+
+@event.listens_for(Announcement.__table__, "after_create")
+def _create_search_index(target: Any, connection: Connection, **kw: Any) -> None:
+    install_search_index(connection)
+
+
+@event.listens_for(Announcement.__table__, "before_drop")
+def _drop_search_index(target: Any, connection: Connection, **kw: Any) -> None:
+    # The PostgreSQL column and index go with the table
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def fts5_query(query: str) -> str:
+    """Quote each term so user input cannot use FTS5 query syntax"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def search_clauses(dialect: str, query: str) -> Tuple[List[Any], Any, ColumnElement]:
+    """
+    Build (joins, match condition, rank) for a full-text announcement query.
+
+    PostgreSQL accepts web search syntax (quoted phrases, OR, -term); SQLite
+    matches announcements containing every term. Higher ranks are better.
+    """
+    if dialect == "postgresql":
+        vector = literal_column(f"announcement.{SEARCH_VECTOR_COLUMN}", TSVECTOR)
+        config: ColumnElement[Any] = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+        tsquery = func.websearch_to_tsquery(config, query)
+        rank: ColumnElement[float] = func.ts_rank_cd(vector, tsquery)
+        return [], vector.op("@@")(tsquery), cast(rank, Float)
+
+    if dialect == "sqlite":
+        fts = table(FTS_TABLE, column("rowid"))
+        join = (fts, fts.c.rowid == Announcement.id)
+        match = text(f"{FTS_TABLE} MATCH :fts_query").bindparams(
+            fts_query=fts5_query(query)
+        )
+        # bm25 is lower for better matches
+        rank = -func.bm25(text(FTS_TABLE), TITLE_WEIGHT, CONTENT_WEIGHT, type_=Float)
+        return [join], match, rank
+
+    raise NotImplementedError(f"Full-text search is not supported on {dialect}")
@@ -82,3 +82,40 @@ class Backtest(Base):
 
     # Metadata
     created_by = Column(String(100))
+
+
+class BacktestJob(Base):
+    """Queued backtest run, consumed by the background worker"""
+
+    name = Column(String(100))
+    strategy_type = Column(String(50), nullable=False)
+    parameters = Column(JSON, nullable=False)
+    parameter_grid = Column(JSON)  # Set for sweeps: {name: [values]}
+    start_date = Column(DateTime, nullable=False)
+    end_date = Column(DateTime, nullable=False)
+    created_by = Column(String(100))
+
+    # Execution state
+    status = Column(
+        String(20), nullable=False, default="queued"
+    )  # 'queued', 'running', 'completed', 'failed'
+    progress = Column(Float, nullable=False, default=0.0)  # 0.0 to 1.0
+    message = Column(String(255))
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String(100))
+    heartbeat_at = Column(DateTime)  # Refreshed by the worker while running
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    # Result
+    backtest_id = Column(Integer, ForeignKey("backtest.id"), nullable=True)
+    backtest_ids = Column(JSON)  # Every backtest stored by a sweep
+
+    __table_args__ = (
+        # Workers claim the oldest queued job first
+        Index("idx_job_status_created", "status", "created_at"),
+    )
+
+    # Relationships
+    backtest = relationship("Backtest")
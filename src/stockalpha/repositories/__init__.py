@@ -3,12 +3,16 @@ import logging
 from typing import Type, TypeVar
 
 from stockalpha.repositories.announcement_repository import AnnouncementRepository
+from stockalpha.repositories.backtest_job_repository import BacktestJobRepository
 from stockalpha.repositories.backtest_repository import BacktestRepository
 from stockalpha.repositories.base_repository import BaseRepository
 from stockalpha.repositories.company import CompanyRepository
 from stockalpha.repositories.fundamental_data_repository import (
     FundamentalDataRepository,
 )
+from stockalpha.repositories.fundamental_ratio_repository import (
+    FundamentalRatioRepository,
+)
 from stockalpha.repositories.price_data_repository import PriceDataRepository
 from stockalpha.repositories.signal_repository import SignalRepository
 
@@ -54,6 +58,10 @@ def get_fundamental_data_repository() -> FundamentalDataRepository:
     return get_repository(FundamentalDataRepository)
 
 
+def get_fundamental_ratio_repository() -> FundamentalRatioRepository:
+    return get_repository(FundamentalRatioRepository)
+
+
 def get_signal_repository() -> SignalRepository:
     return get_repository(SignalRepository)
 
@@ -62,5 +70,9 @@ def get_backtest_repository() -> BacktestRepository:
     return get_repository(BacktestRepository)
 
 
+def get_backtest_job_repository() -> BacktestJobRepository:
+    return get_repository(BacktestJobRepository)
+
+
 # Log initialization message
 logger.info("Repository factory initialized")
@@ -1,20 +1,98 @@
 # src/stockalpha/repositories/announcement_repository.py
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+from sqlalchemy import Float, literal_column, select, update
 from sqlalchemy.orm import Session
 
 from stockalpha.api.schemas import AnnouncementCreate, AnnouncementRead
 from stockalpha.models.entities import Announcement
+from stockalpha.models.search import search_clauses
 from stockalpha.repositories.base_repository import BaseRepository
+from stockalpha.repositories.pagination import Keyset
+
+# Stands in for the per-query rank expression when encoding cursors
+SEARCH_RANK = literal_column("rank", Float)
 
 
 class AnnouncementRepository(
     BaseRepository[Announcement, AnnouncementCreate, AnnouncementCreate]
 ):
+    keyset = Keyset(
+        columns=(Announcement.date, Announcement.id),
+        values=lambda a: (a.date, a.id),
+    )
+
     def __init__(self):
         super().__init__(Announcement)
 
+    def get_unprocessed(
+        self,
+        db: Session,
+        after_id: int = 0,
+        limit: int = 1000,
+        partition: int = 0,
+        partitions: int = 1,
+        company_ids: Optional[Sequence[int]] = None,
+    ) -> Sequence[Any]:
+        """
+        Get the next chunk of unprocessed announcements, in id order.
+
+        Returns rows with the columns signal scoring reads. With partitions
+        greater than 1, only companies where company_id % partitions equals
+        partition are included, and with company_ids, only those companies.
+        On PostgreSQL the rows stay locked until the
+        transaction ends, and rows locked by other workers are skipped.
+        """
+        query = (
+            select(
+                Announcement.id,
+                Announcement.company_id,
+                Announcement.date,
+                Announcement.primary_category,
+                Announcement.sentiment_score,
+            )
+            .where(Announcement.processed.isnot(True), Announcement.id > after_id)
+            .order_by(Announcement.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if partitions > 1:
+            query = query.where(Announcement.company_id % partitions == partition)
+        if company_ids is not None:
+            query = query.where(Announcement.company_id.in_(company_ids))
+
+        return db.execute(query).all()
+
+    def get_texts(self, db: Session, ids: Sequence[int]) -> Sequence[Any]:
+        """Get (id, title, content) rows for classification"""
+        return db.execute(
+            select(Announcement.id, Announcement.title, Announcement.content).where(
+                Announcement.id.in_(ids)
+            )
+        ).all()
+
+    def update_classifications(
+        self, db: Session, classifications: Sequence[Dict[str, Any]]
+    ) -> None:
+        """
+        Write back classifier output, within the caller's transaction.
+
+        classifications are dicts with id, primary_category, sub_categories
+        and sentiment_score, applied as one bulk UPDATE by primary key.
+        """
+        if classifications:
+            db.execute(update(Announcement), list(classifications))
+
+    def mark_processed(self, db: Session, ids: Sequence[int]) -> None:
+        """Flag announcements as processed, within the caller's transaction"""
+        if ids:
+            db.execute(
+                update(Announcement)
+                .where(Announcement.id.in_(ids))
+                .values(processed=True)
+            )
+
     def get_by_company(
         self, db: Session, company_id: int, skip: int = 0, limit: int = 100
     ) -> List[Announcement]:
@@ -57,6 +135,53 @@ class AnnouncementRepository(
 
         return query.order_by(Announcement.date.desc()).offset(skip).limit(limit).all()
 
+    def search_keyset(self, order: str = "rank", rank: Any = SEARCH_RANK) -> Keyset:
+        """Keyset for search results sorted by rank or by date"""
+        if order == "date":
+            return self.keyset
+        return Keyset(columns=(rank, Announcement.id), values=lambda a: (a.rank, a.id))
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        company_id: Optional[int] = None,
+        category: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        order: str = "rank",
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> List[Announcement]:
+        """
+        Full-text search over announcement titles and content.
+
+        Matches come best first, or newest first with order="date", and
+        carry their relevance as `rank`. A cursor from next_cursor with
+        search_keyset(order) continues after the previous page.
+        """
+        if not query.split():
+            return []
+
+        joins, match, rank = search_clauses(db.get_bind().dialect.name, query)
+        keyset = self.search_keyset(order, rank)
+
+        statement = select(Announcement, rank)
+        for target, onclause in joins:
+            statement = statement.join(target, onclause)
+        statement = statement.where(
+            match, *self._filters(company_id, category, start_date, end_date)
+        )
+        if cursor:
+            statement = statement.where(keyset.after(cursor))
+        statement = statement.order_by(*keyset.order_by()).limit(limit)
+
+        announcements = []
+        for announcement, score in db.execute(statement):
+            announcement.rank = score
+            announcements.append(announcement)
+        return announcements
+
     def get_filtered(
         self,
         db: Session,
@@ -66,20 +191,43 @@ class AnnouncementRepository(
         end_date: Optional[datetime] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Announcement]:
-        """Get announcements with various filters applied"""
-        query = db.query(Announcement)
+        """
+        Get announcements with various filters applied.
+
+        When a cursor from next_cursor is given, the page starts after it
+        and skip is ignored.
+        """
+        query = db.query(Announcement).filter(
+            *self._filters(company_id, category, start_date, end_date)
+        )
+
+        query = query.order_by(*self.keyset.order_by())
+        if cursor:
+            return query.filter(self.keyset.after(cursor)).limit(limit).all()
+
+        return query.offset(skip).limit(limit).all()
+
+    @staticmethod
+    def _filters(
+        company_id: Optional[int],
+        category: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> List[Any]:
+        conditions: List[Any] = []
 
         if company_id:
-            query = query.filter(Announcement.company_id == company_id)
+            conditions.append(Announcement.company_id == company_id)
 
         if category:
-            query = query.filter(Announcement.primary_category == category)
+            conditions.append(Announcement.primary_category == category)
 
         if start_date:
-            query = query.filter(Announcement.date >= start_date)
+            conditions.append(Announcement.date >= start_date)
 
         if end_date:
-            query = query.filter(Announcement.date <= end_date)
+            conditions.append(Announcement.date <= end_date)
 
-        return query.order_by(Announcement.date.desc()).offset(skip).limit(limit).all()
+        return conditions
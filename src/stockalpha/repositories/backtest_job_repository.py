@@ -0,0 +1,178 @@
+# src/stockalpha/repositories/backtest_job_repository.py
+from datetime import datetime, timedelta
+from typing import List, Optional, cast
+
+from sqlalchemy import CursorResult, func, update
+from sqlalchemy.orm import Session
+
+from stockalpha.api.schemas import BacktestJobCreate
+from stockalpha.models.signals import BacktestJob
+from stockalpha.repositories.base_repository import BaseRepository
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class BacktestJobRepository(
+    BaseRepository[BacktestJob, BacktestJobCreate, BacktestJobCreate]
+):
+    def __init__(self):
+        super().__init__(BacktestJob)
+
+    def enqueue(self, db: Session, *, obj_in: BacktestJobCreate) -> BacktestJob:
+        """Add a backtest job to the queue"""
+        return self.create(db, obj_in=obj_in)
+
+    def claim_next(self, db: Session, worker_id: str) -> Optional[BacktestJob]:
+        """
+        Atomically claim the oldest queued job for a worker.
+
+        On PostgreSQL the candidate row is locked with SKIP LOCKED so that
+        concurrent workers never wait on each other. The conditional UPDATE
+        guards databases without row locks (SQLite): if another worker won
+        the race, the next candidate is tried.
+        """
+        while True:
+            job_id = db.scalar(
+                db.query(BacktestJob.id)
+                .filter(BacktestJob.status == QUEUED)
+                .order_by(BacktestJob.created_at, BacktestJob.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .statement
+            )
+            if job_id is None:
+                db.rollback()
+                return None
+
+            claimed = db.execute(
+                update(BacktestJob)
+                .where(BacktestJob.id == job_id, BacktestJob.status == QUEUED)
+                .values(
+                    status=RUNNING,
+                    worker_id=worker_id,
+                    started_at=datetime.utcnow(),
+                    heartbeat_at=datetime.utcnow(),
+                    attempts=BacktestJob.attempts + 1,
+                    progress=0.0,
+                    message="Claimed by worker",
+                )
+            )
+            db.commit()
+
+            if cast(CursorResult, claimed).rowcount == 1:
+                return self.get(db, id=job_id)
+
+    def update_progress(
+        self, db: Session, job_id: int, progress: float, message: str
+    ) -> None:
+        """Record progress for a running job"""
+        db.execute(
+            update(BacktestJob)
+            .where(BacktestJob.id == job_id)
+            .values(progress=progress, message=message)
+        )
+        db.commit()
+
+    def complete(
+        self,
+        db: Session,
+        job_id: int,
+        worker_id: str,
+        backtest_id: Optional[int] = None,
+        backtest_ids: Optional[List[int]] = None,
+    ) -> bool:
+        """
+        Mark a job as completed with the ids of its stored backtests.
+
+        Only the worker holding the job can finish it; returns False if it
+        was requeued and claimed by another worker in the meantime.
+        """
+        result = db.execute(
+            update(BacktestJob)
+            .where(BacktestJob.id == job_id, BacktestJob.worker_id == worker_id)
+            .values(
+                status=COMPLETED,
+                progress=1.0,
+                message="Backtest completed",
+                backtest_id=backtest_id,
+                backtest_ids=backtest_ids,
+                finished_at=datetime.utcnow(),
+            )
+        )
+        db.commit()
+        return cast(CursorResult, result).rowcount == 1
+
+    def fail(self, db: Session, job_id: int, worker_id: str, error: str) -> bool:
+        """Mark a job held by the worker as failed, as for complete"""
+        result = db.execute(
+            update(BacktestJob)
+            .where(BacktestJob.id == job_id, BacktestJob.worker_id == worker_id)
+            .values(
+                status=FAILED,
+                message="Backtest failed",
+                error=error,
+                finished_at=datetime.utcnow(),
+            )
+        )
+        db.commit()
+        return cast(CursorResult, result).rowcount == 1
+
+    def heartbeat(self, db: Session, worker_id: str) -> int:
+        """Refresh the heartbeat of every job a worker is running"""
+        result = db.execute(
+            update(BacktestJob)
+            .where(BacktestJob.status == RUNNING, BacktestJob.worker_id == worker_id)
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        db.commit()
+        return cast(CursorResult, result).rowcount
+
+    def requeue_stale(
+        self, db: Session, older_than: timedelta, max_attempts: int
+    ) -> int:
+        """
+        Put running jobs whose worker stopped sending heartbeats back on the
+        queue, and return how many were requeued.
+
+        Jobs already claimed max_attempts times are marked failed instead, so
+        a job that keeps killing its worker is not retried forever.
+        """
+        now = datetime.utcnow()
+        stale = (
+            BacktestJob.status == RUNNING,
+            func.coalesce(BacktestJob.heartbeat_at, BacktestJob.updated_at)
+            < now - older_than,
+        )
+        db.execute(
+            update(BacktestJob)
+            .where(*stale, BacktestJob.attempts >= max_attempts)
+            .values(
+                status=FAILED,
+                message="Backtest failed",
+                error=f"Worker stopped responding in {max_attempts} attempts",
+                finished_at=now,
+            )
+        )
+        result = db.execute(
+            update(BacktestJob)
+            .where(*stale)
+            .values(status=QUEUED, worker_id=None, message="Requeued after timeout")
+        )
+        db.commit()
+        return cast(CursorResult, result).rowcount
+
+    def get_by_status(
+        self, db: Session, status: str, skip: int = 0, limit: int = 100
+    ) -> List[BacktestJob]:
+        """Get jobs in a given state, most recent first"""
+        return (
+            db.query(BacktestJob)
+            .filter(BacktestJob.status == status)
+            .order_by(BacktestJob.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
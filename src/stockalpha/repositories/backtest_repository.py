@@ -3,12 +3,19 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
-from stockalpha.api.schemas import BacktestCreate, BacktestRead
+from stockalpha.api.schemas import BacktestCreate, BacktestRead, BacktestResultCreate
 from stockalpha.models.signals import Backtest
 from stockalpha.repositories.base_repository import BaseRepository
+from stockalpha.repositories.pagination import Keyset
 
 
 class BacktestRepository(BaseRepository[Backtest, BacktestCreate, BacktestCreate]):
+    keyset = Keyset(
+        columns=(Backtest.created_at, Backtest.id),
+        values=lambda b: (b.created_at, b.id),
+    )
+    max_page_size = 500
+
     def __init__(self):
         super().__init__(Backtest)
 
@@ -35,10 +42,16 @@ class BacktestRepository(BaseRepository[Backtest, BacktestCreate, BacktestCreate
         min_return: Optional[float] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Backtest]:
-        """Get backtests with various filters applied"""
+        """
+        Get backtests with various filters applied.
+
+        When a cursor from next_cursor is given, the page starts after it
+        and skip is ignored.
+        """
         # Prevent excessive queries
-        limit = min(limit, 500)
+        limit = min(limit, self.max_page_size)
 
         query = db.query(Backtest)
 
@@ -48,9 +61,11 @@ class BacktestRepository(BaseRepository[Backtest, BacktestCreate, BacktestCreate
         if min_return is not None:
             query = query.filter(Backtest.total_return >= min_return)
 
-        return (
-            query.order_by(Backtest.created_at.desc()).offset(skip).limit(limit).all()
-        )
+        query = query.order_by(*self.keyset.order_by())
+        if cursor:
+            return query.filter(self.keyset.after(cursor)).limit(limit).all()
+
+        return query.offset(skip).limit(limit).all()
 
     def get_multiple_by_ids(
         self, db: Session, backtest_ids: List[int]
@@ -62,3 +77,18 @@ class BacktestRepository(BaseRepository[Backtest, BacktestCreate, BacktestCreate
             .order_by(Backtest.created_at.desc())
             .all()
         )
+
+    def create_batch(
+        self,
+        db: Session,
+        backtest_list: List[BacktestResultCreate],
+        created_by: Optional[str] = None,
+    ) -> List[Backtest]:
+        """Create multiple backtests with a single INSERT ... RETURNING"""
+        return self.bulk_insert(
+            db,
+            [
+                {**backtest.model_dump(), "created_by": created_by}
+                for backtest in backtest_list
+            ],
+        )
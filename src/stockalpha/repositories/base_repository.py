@@ -1,23 +1,82 @@
 # src/stockalpha/repositories/base_repository.py
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 
+from fastapi.concurrency import run_in_threadpool
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from stockalpha.models.base import Base
+from stockalpha.repositories.pagination import Keyset
+from stockalpha.utils.cache import response_cache
+from stockalpha.utils.database import sync_engine_for
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+ResultType = TypeVar("ResultType")
+
+# Rows per INSERT ... RETURNING statement issued by bulk_insert
+INSERT_CHUNK_SIZE = 5000
+
+
+def dialect_insert(db: Session, target: Any) -> Any:
+    """
+    Build an INSERT for the session's database that supports ON CONFLICT.
+
+    Both PostgreSQL and SQLite implement on_conflict_do_nothing and
+    on_conflict_do_update, keyed on a unique index.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(target)
+    if dialect == "sqlite":
+        return sqlite.insert(target)
+    raise NotImplementedError(f"ON CONFLICT inserts are not supported on {dialect}")
 
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base repository with common CRUD operations"""
 
+    # Sort key used by get_filtered for cursor pagination
+    keyset: Optional[Keyset] = None
+
+    # Upper bound applied to the limit of get_filtered, if any
+    max_page_size: Optional[int] = None
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
+    def next_cursor(
+        self, items: List[ModelType], limit: int, keyset: Optional[Keyset] = None
+    ) -> Optional[str]:
+        """
+        Cursor for the page after `items`, or None if it was the last page.
+
+        keyset overrides the repository's own for queries sorted another way.
+        """
+        if self.max_page_size is not None:
+            limit = min(limit, self.max_page_size)
+
+        keyset = keyset or self.keyset
+        if keyset is None or not items or len(items) < limit:
+            return None
+        return keyset.cursor_for(items[-1])
+
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         """Get by ID"""
         return db.query(self.model).filter(self.model.id == id).first()
@@ -30,17 +89,11 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """Create new entry"""
-        try:
-            # Use model_dump for Pydantic v2
-            obj_in_data = obj_in.model_dump()
-        except AttributeError:
-            # Fall back to jsonable_encoder for compatibility or complex objects
-            obj_in_data = jsonable_encoder(obj_in)
-
-        db_obj = self.model(**obj_in_data)
+        db_obj = self._build(obj_in)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self._invalidate()
         return db_obj
 
     def update(
@@ -51,23 +104,64 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: Union[UpdateSchemaType, Dict[str, Any]],
     ) -> ModelType:
         """Update entry"""
-        obj_data = jsonable_encoder(db_obj)
-
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            # Updated for Pydantic v2 compatibility
-            update_data = obj_in.model_dump(exclude_unset=True)
-
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-
+        self._apply(db_obj, obj_in)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self._invalidate()
         return db_obj
 
+    def bulk_insert(
+        self,
+        db: Session,
+        values: Sequence[Dict[str, Any]],
+        *,
+        skip_conflicts_on: Optional[Sequence[str]] = None,
+        commit: bool = True,
+    ) -> List[ModelType]:
+        """
+        Insert rows and return them fully populated, then commit.
+
+        Each chunk of INSERT_CHUNK_SIZE rows is one INSERT ... RETURNING,
+        sent as multi-row VALUES ("insertmanyvalues") on both PostgreSQL and
+        SQLite, so no per-row refresh is needed. With skip_conflicts_on, rows
+        clashing on that unique index are skipped (ON CONFLICT DO NOTHING)
+        and left out of the result. Rows are returned in id order, which is
+        insertion order. None values are inserted as NULL, so column defaults
+        only apply to keys missing from a row. Without commit, the rows join
+        the caller's transaction, which is then responsible for committing
+        and invalidating cached responses.
+        """
+        if not values:
+            return []
+
+        stmt = (
+            dialect_insert(db, self.model).on_conflict_do_nothing(
+                index_elements=list(skip_conflicts_on)
+            )
+            if skip_conflicts_on
+            else insert(self.model)
+        ).returning(self.model)
+
+        result: List[ModelType] = []
+        for offset in range(0, len(values), INSERT_CHUNK_SIZE):
+            chunk = values[offset : offset + INSERT_CHUNK_SIZE]
+            # RETURNING order is unspecified; asking SQLAlchemy to sort by
+            # parameter order would make SQLite insert row by row
+            # render_nulls keeps rows with different None fields in one batch
+            rows = db.scalars(stmt, chunk, execution_options={"render_nulls": True})
+            result.extend(sorted(rows.all(), key=lambda r: r.id))
+
+        # Detach the populated rows so the commit does not expire them and
+        # trigger one SELECT per row on access
+        for entry in result:
+            db.expunge(entry)
+
+        if commit:
+            db.commit()
+            self._invalidate()
+        return result
+
     def remove(self, db: Session, *, id: int) -> ModelType:
         """Remove entry - updated to handle SQLAlchemy deprecations"""
         # Use filter().first() instead of get()
@@ -76,4 +170,107 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             raise ValueError(f"Object with id {id} not found")
         db.delete(obj)
         db.commit()
+        self._invalidate()
         return obj
+
+    # Async counterparts, for routes running on an AsyncSession
+
+    async def aget(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        """Get by ID"""
+        return await db.get(self.model, id)
+
+    async def aget_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        """Get multiple entries"""
+        result = await db.scalars(select(self.model).offset(skip).limit(limit))
+        return list(result)
+
+    async def acreate(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        """Create new entry"""
+        db_obj = self._build(obj_in)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        self._invalidate()
+        return db_obj
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+    ) -> ModelType:
+        """Update entry"""
+        self._apply(db_obj, obj_in)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        self._invalidate()
+        return db_obj
+
+    async def aremove(self, db: AsyncSession, *, id: int) -> ModelType:
+        """Remove entry"""
+        obj = await db.get(self.model, id)
+        if obj is None:
+            raise ValueError(f"Object with id {id} not found")
+        await db.delete(obj)
+        await db.commit()
+        self._invalidate()
+        return obj
+
+    async def arun(
+        self,
+        db: AsyncSession,
+        method: Callable[..., ResultType],
+        *args: Any,
+        **kwargs: Any,
+    ) -> ResultType:
+        """
+        Run a sync repository method, such as get_filtered, for an async route.
+
+        The method runs on a worker thread with a Session on the database db
+        is bound to, so query-building code is shared between both paths
+        and neither the queries nor the row processing and numpy work after
+        them block the event loop. The method does not see db's uncommitted
+        changes.
+        """
+        engine = sync_engine_for(db)
+
+        def run() -> ResultType:
+            with Session(engine, autoflush=False, expire_on_commit=False) as session:
+                return method(session, *args, **kwargs)
+
+        return await run_in_threadpool(run)
+
+    def _invalidate(self) -> None:
+        """Expire cached API responses built from this repository's table"""
+        response_cache.invalidate(self.model.__table__.name)
+
+    def _build(self, obj_in: CreateSchemaType) -> ModelType:
+        return self.model(**self._dump(obj_in))
+
+    @staticmethod
+    def _dump(obj_in: CreateSchemaType) -> Dict[str, Any]:
+        try:
+            # Use model_dump for Pydantic v2
+            return obj_in.model_dump()
+        except AttributeError:
+            # Fall back to jsonable_encoder for compatibility or complex objects
+            return jsonable_encoder(obj_in)
+
+    def _apply(
+        self, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> None:
+        obj_data = jsonable_encoder(db_obj)
+
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            # Updated for Pydantic v2 compatibility
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
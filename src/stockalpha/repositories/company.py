@@ -1,22 +1,112 @@
 # src/stockalpha/repositories/company.py
-from typing import List, Optional
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
 
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from stockalpha.api.schemas import CompanyCreate, CompanyRead, CompanyUpdate
 from stockalpha.models.entities import Company
 from stockalpha.repositories.base_repository import BaseRepository
+from stockalpha.utils.config import settings
+
+INDEX_COLUMNS = (Company.id, Company.ticker, Company.sector, Company.industry)
+
+
+class CompanyIndexEntry(NamedTuple):
+    id: int
+    ticker: str
+    sector: Optional[str]
+    industry: Optional[str]
+
+
+class CompanyIndex:
+    """Immutable snapshot of every company's id, ticker, sector and industry"""
+
+    def __init__(self, entries: Iterable[CompanyIndexEntry]):
+        self.by_id: Dict[int, CompanyIndexEntry] = {
+            entry.id: entry for entry in entries
+        }
+        self.by_ticker: Dict[str, CompanyIndexEntry] = {
+            entry.ticker: entry for entry in self.by_id.values()
+        }
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.by_id)
 
 
 class CompanyRepository(BaseRepository[Company, CompanyCreate, CompanyUpdate]):
-    """Repository for Company model"""
+    """
+    Repository for Company model.
+
+    Existence checks and ticker lookups are answered from a CompanyIndex,
+    loaded on first use and dropped whenever this process writes a company.
+    It is reloaded after company_index_ttl_seconds so companies added by
+    other processes appear; until then ids and tickers missing from the
+    index fall back to a query.
+    """
 
     def __init__(self):
         super().__init__(Company)
+        self._index: Optional[CompanyIndex] = None
+        self._index_lock = threading.Lock()
+
+    def get_index(self, db: Session) -> CompanyIndex:
+        """The current company index, loading it if missing or expired"""
+        index = self._fresh_index()
+        if index is not None:
+            return index
+
+        with self._index_lock:
+            index = self._fresh_index()
+            if index is None:
+                # Writes reset the index under the same lock, so a load
+                # racing a commit is dropped right after it is stored
+                index = self._index = CompanyIndex(
+                    CompanyIndexEntry(*row)
+                    for row in db.execute(select(*INDEX_COLUMNS)).all()
+                )
+        return index
+
+    def get_entry(self, db: Session, id: int) -> Optional[CompanyIndexEntry]:
+        """Get a company's id, ticker, sector and industry"""
+        entry = self.get_index(db).by_id.get(id)
+        if entry is None:
+            entry = self._lookup(db, Company.id == id)
+        return entry
+
+    async def aget_entry(
+        self, db: AsyncSession, id: int
+    ) -> Optional[CompanyIndexEntry]:
+        """Get a company's id, ticker, sector and industry"""
+        index = self._fresh_index()
+        entry = index.by_id.get(id) if index is not None else None
+        if entry is None:
+            entry = await self.arun(db, self.get_entry, id=id)
+        return entry
+
+    def exists(self, db: Session, id: int) -> bool:
+        """Check that a company exists"""
+        return self.get_entry(db, id=id) is not None
+
+    async def aexists(self, db: AsyncSession, id: int) -> bool:
+        """Check that a company exists"""
+        return await self.aget_entry(db, id=id) is not None
+
+    def get_id_by_ticker(self, db: Session, ticker: str) -> Optional[int]:
+        """Resolve a ticker symbol to a company id"""
+        entry = self.get_index(db).by_ticker.get(ticker)
+        if entry is None:
+            entry = self._lookup(db, Company.ticker == ticker)
+        return entry.id if entry is not None else None
 
     def get_by_ticker(self, db: Session, ticker: str) -> Optional[Company]:
         """Get company by ticker symbol"""
-        return db.query(Company).filter(Company.ticker == ticker).first()
+        company_id = self.get_id_by_ticker(db, ticker=ticker)
+        return db.get(Company, company_id) if company_id is not None else None
 
     def get_by_sector(
         self, db: Session, sector: str, skip: int = 0, limit: int = 100
@@ -42,6 +132,37 @@ class CompanyRepository(BaseRepository[Company, CompanyCreate, CompanyUpdate]):
             .all()
         )
 
+    def get_ids(self, db: Session) -> List[int]:
+        """Get the ids of all companies"""
+        return list(db.scalars(select(Company.id).order_by(Company.id)))
+
+    def _invalidate(self) -> None:
+        super()._invalidate()
+        self._reset_index()
+
+    def _fresh_index(self) -> Optional[CompanyIndex]:
+        index = self._index
+        if index is None or (
+            time.monotonic() - index.loaded_at > settings.company_index_ttl_seconds
+        ):
+            return None
+        return index
+
+    def _lookup(
+        self, db: Session, condition: ColumnElement[bool]
+    ) -> Optional[CompanyIndexEntry]:
+        row = db.execute(select(*INDEX_COLUMNS).where(condition)).first()
+        if row is None:
+            return None
+
+        # Added by another process since the index was loaded
+        self._reset_index()
+        return CompanyIndexEntry(*row)
+
+    def _reset_index(self) -> None:
+        with self._index_lock:
+            self._index = None
+
 
 # Create an instance to be used by dependents
 company_repository = CompanyRepository()
@@ -1,17 +1,77 @@
 # src/stockalpha/repositories/fundamental_data_repository.py
-from typing import List, Optional
+import logging
+import operator
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from stockalpha.api.schemas import FundamentalDataCreate, FundamentalDataRead
-from stockalpha.models.entities import FundamentalData
+from stockalpha.models.entities import FISCAL_QUARTER_KEY, Company, FundamentalData
+from stockalpha.models.promoted import (
+    PROMOTED_FIELDS,
+    STATEMENT_COLUMNS,
+    extract_promoted,
+)
 from stockalpha.repositories.base_repository import BaseRepository
+from stockalpha.repositories.fundamental_ratio_repository import (
+    fundamental_ratio_repository,
+)
+from stockalpha.repositories.fundamentals_snapshot import (
+    REPORTED_METRICS,
+    FundamentalsSnapshot,
+    fundamentals_snapshot_cache,
+)
+from stockalpha.repositories.pagination import Keyset
+from stockalpha.repositories.price_data_repository import PriceDataRepository
+from stockalpha.repositories.universe_snapshot import universe_panel_cache
+
+logger = logging.getLogger(__name__)
+
+# Key of idx_unique_fundamental_period, with fiscal_quarter compared as 0 for
+# annual rows
+PERIOD_KEY = (
+    FundamentalData.company_id,
+    FundamentalData.period,
+    FundamentalData.fiscal_year,
+    FISCAL_QUARTER_KEY,
+)
+
+# Period keys per existence query issued by create_batch
+KEY_CHUNK_SIZE = 1000
+
+# Rows read and updated together by backfill_promoted
+BACKFILL_CHUNK_SIZE = 1000
+
+# Comparisons get_filtered accepts on promoted fields
+FIELD_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "=": operator.eq,
+}
+
+# (promoted field name, one of FIELD_OPERATORS, value)
+FieldFilter = Tuple[str, str, float]
 
 
 class FundamentalDataRepository(
     BaseRepository[FundamentalData, FundamentalDataCreate, FundamentalDataCreate]
 ):
+    # Annual rows have no fiscal_quarter; treat it as 0 so the key is never NULL
+    keyset = Keyset(
+        columns=(
+            FundamentalData.fiscal_year,
+            FISCAL_QUARTER_KEY,
+            FundamentalData.id,
+        ),
+        values=lambda f: (f.fiscal_year, f.fiscal_quarter or 0, f.id),
+    )
+    max_page_size = 1000
+
     def __init__(self):
         super().__init__(FundamentalData)
 
@@ -32,7 +92,7 @@ class FundamentalDataRepository(
         return (
             query.order_by(
                 FundamentalData.fiscal_year.desc(),
-                FundamentalData.fiscal_quarter.desc(),
+                FundamentalData.fiscal_quarter.desc().nulls_last(),
             )
             .limit(limit)
             .all()
@@ -68,10 +128,19 @@ class FundamentalDataRepository(
         fiscal_year: Optional[int] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        field_filters: Sequence[FieldFilter] = (),
     ) -> List[FundamentalData]:
-        """Get fundamental data with various filters applied"""
+        """
+        Get fundamental data with various filters applied.
+
+        field_filters compare promoted statement fields, which are indexed
+        columns; rows missing a compared field are left out. When a cursor
+        from next_cursor is given, the page starts after it and skip is
+        ignored.
+        """
         # Prevent excessive queries
-        limit = min(limit, 1000)
+        limit = min(limit, self.max_page_size)
 
         query = db.query(FundamentalData)
 
@@ -84,56 +153,325 @@ class FundamentalDataRepository(
         if fiscal_year:
             query = query.filter(FundamentalData.fiscal_year == fiscal_year)
 
-        return (
-            query.order_by(
-                FundamentalData.fiscal_year.desc(),
-                FundamentalData.fiscal_quarter.desc(),
+        for name, op, value in field_filters:
+            if name not in PROMOTED_FIELDS:
+                raise ValueError(f"Unknown promoted field: {name}")
+            if op not in FIELD_OPERATORS:
+                raise ValueError(f"Unknown operator: {op}")
+            query = query.filter(
+                FIELD_OPERATORS[op](getattr(FundamentalData, name), value)
             )
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+
+        query = query.order_by(*self.keyset.order_by())
+        if cursor:
+            return query.filter(self.keyset.after(cursor)).limit(limit).all()
+
+        return query.offset(skip).limit(limit).all()
 
     def create_batch(
-        self, db: Session, fundamental_data_list: List[FundamentalDataCreate]
+        self,
+        db: Session,
+        fundamental_data_list: List[FundamentalDataCreate],
+        upsert: bool = False,
     ) -> List[FundamentalData]:
-        """Create multiple fundamental data entries in batch"""
+        """
+        Create multiple fundamental data entries in batch.
+
+        Existing periods are found with one row-value IN query per
+        KEY_CHUNK_SIZE keys and skipped, or with upsert, have the fields set
+        in the batch updated in place where they changed. The ratios of the
+        companies written to are then recomputed. Returns the inserted rows,
+        followed by the updated ones when upserting.
+        """
         if not fundamental_data_list:
             return []
 
-        # Check for duplicates and prepare new entries
-        new_entries = []
+        # The first row wins when the batch repeats a period, the last one
+        # when upserting
+        entries: Dict[Tuple[Any, ...], FundamentalDataCreate] = {}
         for data in fundamental_data_list:
-            # Check if data already exists for this period
-            existing = (
-                db.query(FundamentalData)
-                .filter(
-                    FundamentalData.company_id == data.company_id,
-                    FundamentalData.period == data.period,
-                    FundamentalData.fiscal_year == data.fiscal_year,
-                    FundamentalData.fiscal_quarter == data.fiscal_quarter,
-                )
-                .first()
+            key = (
+                data.company_id,
+                data.period,
+                data.fiscal_year,
+                data.fiscal_quarter or 0,
+            )
+            if upsert or key not in entries:
+                entries[key] = data
+
+        # Rows are only loaded to compare fields when upserting
+        existing = self._get_existing(
+            db, list(entries), FundamentalData if upsert else FundamentalData.id
+        )
+
+        # Compared before bulk_insert commits and expires the loaded rows
+        changes: List[Dict[str, Any]] = []
+        for key, row in existing.items() if upsert else ():
+            fields = entries[key].model_dump(exclude_unset=True)
+            fields.update(extract_promoted(fields))
+            changed = {
+                name: value
+                for name, value in fields.items()
+                if getattr(row, name) != value
+            }
+            if changed:
+                changes.append({"id": row.id, **changed})
+
+        created = self.bulk_insert(
+            db,
+            [self._dump(data) for key, data in entries.items() if key not in existing],
+        )
+        if not changes:
+            if created:
+                self._refresh_ratios(db, {row.company_id for row in created})
+            return created
+
+        # Bulk UPDATE by primary key, one executemany per set of changed fields
+        db.execute(update(FundamentalData), changes)
+        db.commit()
+        self._invalidate()
+
+        updated = db.scalars(
+            select(FundamentalData).where(
+                FundamentalData.id.in_([change["id"] for change in changes])
+            )
+        ).all()
+        self._refresh_ratios(db, {row.company_id for row in [*created, *updated]})
+        return created + list(updated)
+
+    def create(self, db: Session, *, obj_in: FundamentalDataCreate) -> FundamentalData:
+        """Create new entry and recompute the company's ratios"""
+        db_obj = super().create(db, obj_in=obj_in)
+        self._refresh_ratios(db, [db_obj.company_id])
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: FundamentalData,
+        obj_in: Union[FundamentalDataCreate, Dict[str, Any]],
+    ) -> FundamentalData:
+        """Update entry and recompute the company's ratios"""
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        self._refresh_ratios(db, [db_obj.company_id])
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> FundamentalData:
+        """Remove entry and recompute the company's ratios"""
+        obj = super().remove(db, id=id)
+        self._refresh_ratios(db, [obj.company_id])
+        return obj
+
+    async def acreate(
+        self, db: AsyncSession, *, obj_in: FundamentalDataCreate
+    ) -> FundamentalData:
+        """Create new entry and recompute the company's ratios"""
+        db_obj = await super().acreate(db, obj_in=obj_in)
+        await self._arefresh_ratios(db, db_obj.company_id)
+        return db_obj
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: FundamentalData,
+        obj_in: Union[FundamentalDataCreate, Dict[str, Any]],
+    ) -> FundamentalData:
+        """Update entry and recompute the company's ratios"""
+        db_obj = await super().aupdate(db, db_obj=db_obj, obj_in=obj_in)
+        await self._arefresh_ratios(db, db_obj.company_id)
+        return db_obj
+
+    async def aremove(self, db: AsyncSession, *, id: int) -> FundamentalData:
+        """Remove entry and recompute the company's ratios"""
+        obj = await super().aremove(db, id=id)
+        await self._arefresh_ratios(db, obj.company_id)
+        return obj
+
+    def backfill_promoted(self, db: Session) -> int:
+        """
+        Recompute the promoted columns of every row from its statements.
+
+        For fields newly added to promoted_fields, or whose key changed.
+        Rows are read in id order, BACKFILL_CHUNK_SIZE at a time, and only
+        those with a changed value are updated. Returns the rows updated.
+        """
+        columns = [FundamentalData.id] + [
+            getattr(FundamentalData, name)
+            for name in (*STATEMENT_COLUMNS, *PROMOTED_FIELDS)
+        ]
+        updated = 0
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(*columns)
+                .where(FundamentalData.id > last_id)
+                .order_by(FundamentalData.id)
+                .limit(BACKFILL_CHUNK_SIZE)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            changes = []
+            for row in rows:
+                values = row._asdict()
+                promoted = extract_promoted(values)
+                if any(values[name] != value for name, value in promoted.items()):
+                    changes.append({"id": row.id, **promoted})
+            if changes:
+                db.execute(update(FundamentalData), changes)
+                db.commit()
+                updated += len(changes)
+
+        if updated:
+            self._invalidate()
+        return updated
+
+    def _refresh_ratios(self, db: Session, company_ids: Iterable[int]) -> None:
+        """
+        Recompute the ratios of companies whose fundamentals were committed.
+
+        A failure leaves the written fundamentals in place and the ratios
+        stale until the companies' next write or `refresh-ratios` run.
+        """
+        try:
+            fundamental_ratio_repository.refresh(db, company_ids)
+        except Exception:
+            db.rollback()
+            logger.exception(
+                f"Failed to refresh ratios of companies {sorted(company_ids)}"
             )
 
-            if not existing:
-                # Try to use model_dump for Pydantic v2 compatibility
-                try:
-                    obj_data = data.model_dump()
-                except AttributeError:
-                    obj_data = jsonable_encoder(data)
+    async def _arefresh_ratios(self, db: AsyncSession, company_id: int) -> None:
+        await self.arun(db, self._refresh_ratios, [company_id])
 
-                new_entries.append(FundamentalData(**obj_data))
+    def get_snapshot(
+        self, db: Session, period: str = "annual", replica_lag: float = 0
+    ) -> FundamentalsSnapshot:
+        """
+        Every company's latest fundamentals for the period type, as columns.
 
-        # Bulk insert new entries
-        if new_entries:
-            db.bulk_save_objects(new_entries)
-            db.commit()
+        Built from one scan of the period's rows and cached until
+        fundamentals are written or screener_snapshot_ttl_seconds pass.
+        When db reads from a replica, pass its maximum lag as replica_lag so
+        that a snapshot which may miss a recent write is not cached.
+        """
+        # Imported here: the package imports this module
+        from stockalpha.repositories import get_repository
 
-        # Return all created objects
-        result = []
-        for entry in new_entries:
-            db.refresh(entry)
-            result.append(entry)
+        snapshot = fundamentals_snapshot_cache.get(period)
+        if snapshot is not None:
+            return snapshot
+
+        generation = fundamentals_snapshot_cache.generation
+        rows = db.execute(
+            select(
+                FundamentalData.company_id,
+                FundamentalData.fiscal_year,
+                FISCAL_QUARTER_KEY,
+                FundamentalData.report_date,
+                *(getattr(FundamentalData, name) for name in REPORTED_METRICS),
+            ).where(FundamentalData.period == period)
+        ).all()
+        snapshot = FundamentalsSnapshot.build(
+            period,
+            rows,
+            closes=get_repository(PriceDataRepository).get_latest_closes(db),
+            companies={
+                row.id: row
+                for row in db.execute(
+                    select(Company.id, Company.ticker, Company.sector, Company.industry)
+                )
+            },
+        )
+        fundamentals_snapshot_cache.put(snapshot, generation, replica_lag=replica_lag)
+        return snapshot
+
+    def get_as_of_rows(
+        self,
+        db: Session,
+        start_date: date,
+        end_date: date,
+        period: str = "quarterly",
+        company_ids: Optional[Sequence[int]] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Get (company_id, report_date, fiscal_year, fiscal_quarter,
+        *REPORTED_METRICS) tuples for as-of joins on report_date.
+
+        Covers the period's reports dated within the window plus each
+        company's latest report before it, ordered by company, report date
+        and id.
+        """
+        start = datetime.combine(start_date, datetime.min.time())
+        end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        before = select(
+            FundamentalData.company_id, func.max(FundamentalData.report_date)
+        ).where(FundamentalData.period == period, FundamentalData.report_date < start)
+        window = (FundamentalData.report_date >= start) & (
+            FundamentalData.report_date < end
+        )
+        if company_ids is not None:
+            before = before.where(FundamentalData.company_id.in_(company_ids))
+            window = window & FundamentalData.company_id.in_(company_ids)
+
+        query = (
+            select(
+                FundamentalData.company_id,
+                FundamentalData.report_date,
+                FundamentalData.fiscal_year,
+                FundamentalData.fiscal_quarter,
+                *(getattr(FundamentalData, name) for name in REPORTED_METRICS),
+            )
+            .where(
+                FundamentalData.period == period,
+                or_(
+                    window,
+                    tuple_(FundamentalData.company_id, FundamentalData.report_date).in_(
+                        before.group_by(FundamentalData.company_id)
+                    ),
+                ),
+            )
+            .order_by(
+                FundamentalData.company_id,
+                FundamentalData.report_date,
+                FundamentalData.id,
+            )
+        )
+        return [tuple(row) for row in db.execute(query)]
+
+    def _invalidate(self) -> None:
+        super()._invalidate()
+        fundamentals_snapshot_cache.invalidate()
+        universe_panel_cache.invalidate()
+
+    @staticmethod
+    def _dump(obj_in: FundamentalDataCreate) -> Dict[str, Any]:
+        values = BaseRepository._dump(obj_in)
+        return {**values, **extract_promoted(values)}
+
+    def _apply(
+        self,
+        db_obj: FundamentalData,
+        obj_in: Union[FundamentalDataCreate, Dict[str, Any]],
+    ) -> None:
+        if not isinstance(obj_in, dict):
+            obj_in = obj_in.model_dump(exclude_unset=True)
+        super()._apply(db_obj, {**obj_in, **extract_promoted(obj_in)})
 
-        return result
+    def _get_existing(
+        self, db: Session, keys: List[Tuple[Any, ...]], target: Any
+    ) -> Dict[Tuple[Any, ...], Any]:
+        """Look up target (rows or a column) for the period keys that exist"""
+        existing: Dict[Tuple[Any, ...], Any] = {}
+        for offset in range(0, len(keys), KEY_CHUNK_SIZE):
+            chunk = keys[offset : offset + KEY_CHUNK_SIZE]
+            # Rendered as IN (VALUES ...) on SQLite
+            rows = db.execute(
+                select(*PERIOD_KEY, target).where(tuple_(*PERIOD_KEY).in_(chunk))
+            ).all()
+            for *key, value in rows:
+                existing[tuple(key)] = value
+        return existing
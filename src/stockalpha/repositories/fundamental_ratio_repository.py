@@ -0,0 +1,171 @@
+# src/stockalpha/repositories/fundamental_ratio_repository.py
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from stockalpha.analysis.ratios import (
+    FUNDAMENTAL_COLUMNS,
+    RATIO_COLUMNS,
+    compute_ratios,
+)
+from stockalpha.api.schemas import FundamentalRatioRead
+from stockalpha.models.entities import Company, FundamentalData, FundamentalRatio
+from stockalpha.repositories.base_repository import BaseRepository, dialect_insert
+from stockalpha.repositories.pagination import Keyset
+from stockalpha.utils.config import settings
+
+# Companies whose ratios are read, computed and written together
+REFRESH_CHUNK_SIZE = 500
+
+# Columns rewritten when a period's ratios are recomputed
+UPSERT_COLUMNS = (
+    "company_id",
+    "period",
+    "fiscal_year",
+    "fiscal_quarter",
+    "report_date",
+    *RATIO_COLUMNS,
+    "updated_at",
+)
+
+
+def quarters_history() -> int:
+    """Quarterly periods kept per company, from collection.fundamental_data"""
+    return (
+        settings.yaml_config.get("collection", {})
+        .get("fundamental_data", {})
+        .get("quarters_history", 20)
+    )
+
+
+class FundamentalRatioRepository(
+    BaseRepository[FundamentalRatio, FundamentalRatioRead, FundamentalRatioRead]
+):
+    keyset = Keyset(
+        columns=(FundamentalRatio.company_id, FundamentalRatio.id),
+        values=lambda r: (r.company_id, r.id),
+        descending=False,
+    )
+    max_page_size = 1000
+
+    def __init__(self):
+        super().__init__(FundamentalRatio)
+
+    def get_by_company(
+        self, db: Session, company_id: int, period: Optional[str] = None, limit: int = 8
+    ) -> List[FundamentalRatio]:
+        """Get a company's ratios, latest period first"""
+        query = select(FundamentalRatio).where(
+            FundamentalRatio.company_id == company_id
+        )
+        if period:
+            query = query.where(FundamentalRatio.period == period)
+
+        return list(
+            db.scalars(
+                query.order_by(
+                    FundamentalRatio.fiscal_year.desc(),
+                    FundamentalRatio.fiscal_quarter.desc().nulls_last(),
+                ).limit(min(limit, 1000))
+            )
+        )
+
+    def get_filtered(
+        self,
+        db: Session,
+        period: str,
+        fiscal_year: int,
+        fiscal_quarter: Optional[int] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> List[FundamentalRatio]:
+        """
+        Get every company's ratios for one fiscal period, by company.
+
+        When a cursor from next_cursor is given, the page starts after it.
+        """
+        query = select(FundamentalRatio).where(
+            FundamentalRatio.period == period,
+            FundamentalRatio.fiscal_year == fiscal_year,
+        )
+        if fiscal_quarter is not None:
+            query = query.where(FundamentalRatio.fiscal_quarter == fiscal_quarter)
+        if cursor:
+            query = query.where(self.keyset.after(cursor))
+
+        query = query.order_by(*self.keyset.order_by())
+        return list(db.scalars(query.limit(min(limit, self.max_page_size))))
+
+    def refresh(self, db: Session, company_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recompute and store the ratios of some companies, or of all of them.
+
+        Each company keeps ratios for its latest quarters_history quarterly
+        periods and for the annual periods covering them; ratios of older or
+        removed periods are deleted. Every REFRESH_CHUNK_SIZE companies take
+        one read, one upsert and one delete. Returns the rows written.
+        """
+        if company_ids is None:
+            company_ids = db.scalars(select(Company.id)).all()
+        company_ids = sorted(set(company_ids))
+
+        written = 0
+        for offset in range(0, len(company_ids), REFRESH_CHUNK_SIZE):
+            chunk = company_ids[offset : offset + REFRESH_CHUNK_SIZE]
+            rows = db.execute(
+                select(
+                    *(getattr(FundamentalData, name) for name in FUNDAMENTAL_COLUMNS)
+                ).where(FundamentalData.company_id.in_(chunk))
+            ).all()
+            ratios = self._within_history(compute_ratios(rows))
+
+            if ratios:
+                now = datetime.utcnow()
+                stmt = dialect_insert(db, FundamentalRatio.__table__)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["fundamental_id"],
+                    set_={name: stmt.excluded[name] for name in UPSERT_COLUMNS},
+                )
+                db.execute(
+                    stmt, [{**r, "created_at": now, "updated_at": now} for r in ratios]
+                )
+            db.execute(
+                delete(FundamentalRatio).where(
+                    FundamentalRatio.company_id.in_(chunk),
+                    FundamentalRatio.fundamental_id.notin_(
+                        [r["fundamental_id"] for r in ratios]
+                    ),
+                )
+            )
+            written += len(ratios)
+
+        db.commit()
+        self._invalidate()
+        return written
+
+    @staticmethod
+    def _within_history(ratios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep each company's latest periods, per quarters_history"""
+        quarters = quarters_history()
+        years = math.ceil(quarters / 4)
+
+        groups: Dict[Tuple[int, str], List[Dict[str, Any]]] = defaultdict(list)
+        for ratio in ratios:
+            groups[(ratio["company_id"], ratio["period"])].append(ratio)
+
+        kept = []
+        for (_, period), group in groups.items():
+            group.sort(
+                key=lambda r: (r["fiscal_year"], r["fiscal_quarter"] or 0),
+                reverse=True,
+            )
+            kept.extend(group[: quarters if period == "quarterly" else years])
+        return kept
+
+
+# Create an instance to be used by dependents
+fundamental_ratio_repository = FundamentalRatioRepository()
@@ -0,0 +1,250 @@
+# src/stockalpha/repositories/fundamentals_snapshot.py
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from stockalpha.utils.config import settings
+
+# FundamentalData columns loaded for each period, after the period key
+REPORTED_METRICS = (
+    "revenue",
+    "net_income",
+    "eps",
+    "total_assets",
+    "total_liabilities",
+    "total_equity",
+)
+
+# Computed from the reported figures and the latest close
+DERIVED_METRICS = (
+    "price",
+    "pe",  # Price over annual EPS, trailing four quarters for quarterly data
+    "revenue_growth",  # Against the same period a year earlier
+    "earnings_growth",
+    "net_margin",
+    "roe",
+    "debt_to_equity",
+)
+
+SNAPSHOT_METRICS = REPORTED_METRICS + DERIVED_METRICS
+
+# (company_id, fiscal_year, fiscal_quarter or 0, report_date, *REPORTED_METRICS)
+SnapshotRow = Tuple[Any, ...]
+EPS_OFFSET = 4 + REPORTED_METRICS.index("eps")
+
+
+def _ratio(numerator: Optional[float], denominator: Optional[float]) -> float:
+    if numerator is None or not denominator:
+        return np.nan
+    return numerator / denominator
+
+
+def _growth(current: Optional[float], previous: Optional[float]) -> float:
+    if current is None or not previous:
+        return np.nan
+    return (current - previous) / abs(previous)
+
+
+def _previous_quarter(year: int, quarter: int) -> Tuple[int, int]:
+    return (year, quarter - 1) if quarter > 1 else (year - 1, 4)
+
+
+@dataclass
+class FundamentalsSnapshot:
+    """
+    Each company's latest fundamentals for one period type, as columns.
+
+    Row i of every array belongs to the same company; metrics are float64
+    with NaN where a figure is missing or undefined.
+    """
+
+    period: str
+    company_ids: np.ndarray  # int64
+    tickers: np.ndarray  # object
+    sectors: np.ndarray
+    industries: np.ndarray
+    fiscal_years: np.ndarray  # int64
+    fiscal_quarters: np.ndarray  # int64, 0 for annual rows
+    report_dates: List[datetime]
+    metrics: Dict[str, np.ndarray]
+
+    @classmethod
+    def build(
+        cls,
+        period: str,
+        rows: Sequence[SnapshotRow],
+        closes: Mapping[int, Optional[float]],
+        companies: Mapping[int, Any],
+    ) -> "FundamentalsSnapshot":
+        """
+        Build from every stored row of the period.
+
+        closes maps company ids to their latest close and companies maps
+        them to entries with ticker, sector and industry.
+        """
+        by_company: Dict[int, Dict[Tuple[int, int], SnapshotRow]] = {}
+        for row in rows:
+            by_company.setdefault(row[0], {})[(row[1], row[2])] = row
+
+        records = []
+        for company_id, periods in by_company.items():
+            entry = companies.get(company_id)
+            if entry is None:
+                continue
+            year, quarter = key = max(periods)
+            latest = dict(zip(REPORTED_METRICS, periods[key][4:]))
+            year_ago = dict(
+                zip(REPORTED_METRICS, periods.get((year - 1, quarter), ())[4:])
+            )
+
+            if quarter:
+                # Trailing twelve months from the latest four quarters
+                keys = [key]
+                for _ in range(3):
+                    keys.append(_previous_quarter(*keys[-1]))
+                eps_values = [periods[k][EPS_OFFSET] for k in keys if k in periods]
+                annual_eps = (
+                    sum(eps_values)
+                    if len(eps_values) == len(keys) and None not in eps_values
+                    else None
+                )
+            else:
+                annual_eps = latest["eps"]
+
+            price = closes.get(company_id)
+            derived = {
+                "price": np.nan if price is None else price,
+                # Undefined for losses, as on most screeners
+                "pe": (
+                    _ratio(price, annual_eps)
+                    if annual_eps is not None and annual_eps > 0
+                    else np.nan
+                ),
+                "revenue_growth": _growth(latest["revenue"], year_ago.get("revenue")),
+                "earnings_growth": _growth(
+                    latest["net_income"], year_ago.get("net_income")
+                ),
+                "net_margin": _ratio(latest["net_income"], latest["revenue"]),
+                "roe": _ratio(latest["net_income"], latest["total_equity"]),
+                "debt_to_equity": _ratio(
+                    latest["total_liabilities"], latest["total_equity"]
+                ),
+            }
+            records.append((company_id, entry, periods[key], {**latest, **derived}))
+
+        records.sort(key=lambda record: record[0])
+        count = len(records)
+        return cls(
+            period=period,
+            company_ids=np.fromiter((r[0] for r in records), np.int64, count),
+            tickers=np.array([r[1].ticker for r in records], dtype=object),
+            sectors=np.array([r[1].sector for r in records], dtype=object),
+            industries=np.array([r[1].industry for r in records], dtype=object),
+            fiscal_years=np.fromiter((r[2][1] for r in records), np.int64, count),
+            fiscal_quarters=np.fromiter((r[2][2] for r in records), np.int64, count),
+            report_dates=[r[2][3] for r in records],
+            metrics={
+                name: np.fromiter(
+                    (np.nan if r[3][name] is None else r[3][name] for r in records),
+                    np.float64,
+                    count,
+                )
+                for name in SNAPSHOT_METRICS
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.company_ids)
+
+    def to_records(self, index: np.ndarray) -> List[Dict[str, Any]]:
+        """ScreenerResult-shaped dictionaries for the given rows"""
+        index = np.asarray(index, dtype=np.int64)
+        metrics = {}
+        for name, values in self.metrics.items():
+            selected = values[index]
+            # JSON has no NaN; missing values go back to null
+            column = selected.astype(object)
+            column[np.isnan(selected)] = None
+            metrics[name] = column.tolist()
+
+        return [
+            {
+                "company_id": int(self.company_ids[i]),
+                "ticker": self.tickers[i],
+                "sector": self.sectors[i],
+                "industry": self.industries[i],
+                "period": self.period,
+                "fiscal_year": int(self.fiscal_years[i]),
+                "fiscal_quarter": int(self.fiscal_quarters[i]) or None,
+                "report_date": self.report_dates[i],
+                "metrics": {name: values[row] for name, values in metrics.items()},
+            }
+            for row, i in enumerate(index.tolist())
+        ]
+
+
+class FundamentalsSnapshotCache:
+    """
+    Process-wide cache of FundamentalsSnapshot by period.
+
+    Fundamental writes in this process invalidate it. Snapshots are also
+    rebuilt after ttl_seconds, which bounds how stale prices, company
+    details and writes from other processes can be.
+    """
+
+    def __init__(self, ttl_seconds: float = 0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[FundamentalsSnapshot, float]] = {}
+        self._generation = 0
+        self._invalidated_at = -math.inf
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Pass to put so a snapshot loaded across an invalidation is dropped"""
+        return self._generation
+
+    def get(self, period: str) -> Optional[FundamentalsSnapshot]:
+        with self._lock:
+            entry = self._entries.get(period)
+            if entry is None:
+                return None
+            snapshot, loaded_at = entry
+            if self.ttl_seconds and time.monotonic() - loaded_at > self.ttl_seconds:
+                del self._entries[period]
+                return None
+            return snapshot
+
+    def put(
+        self, snapshot: FundamentalsSnapshot, generation: int, replica_lag: float = 0
+    ) -> None:
+        """
+        Cache a snapshot loaded at generation.
+
+        With replica_lag, the snapshot was read from a replica up to that
+        many seconds behind, and is dropped if it was loaded that soon after
+        an invalidation, as it may predate the write.
+        """
+        with self._lock:
+            if generation != self._generation:
+                return
+            if time.monotonic() - self._invalidated_at < replica_lag:
+                return
+            self._entries[snapshot.period] = (snapshot, time.monotonic())
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = time.monotonic()
+            self._entries.clear()
+
+
+# Shared by every FundamentalDataRepository in this process
+fundamentals_snapshot_cache = FundamentalsSnapshotCache(
+    ttl_seconds=settings.screener_snapshot_ttl_seconds
+)
@@ -0,0 +1,93 @@
+# src/stockalpha/repositories/pagination.py
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Callable, List, Sequence
+
+from sqlalchemy import and_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+class Keyset:
+    """
+    Sort key for keyset (cursor) pagination.
+
+    Instead of OFFSET, each page starts strictly after the sort key of the
+    previous page's last row, so the database can seek straight into the
+    index and page N costs the same as page 1. The key must end in a
+    unique column (normally id) so that ties are broken deterministically.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[Any],
+        values: Callable[[Any], Sequence[Any]],
+        descending: bool = True,
+    ):
+        self.columns = list(columns)
+        self.values = values
+        self.descending = descending
+
+    def order_by(self) -> List[Any]:
+        """ORDER BY clauses matching the key"""
+        if self.descending:
+            return [column.desc() for column in self.columns]
+        return [column.asc() for column in self.columns]
+
+    def after(self, cursor: str) -> ColumnElement:
+        """
+        Filter for the rows that follow the cursor position.
+
+        The row-value comparison is repeated as a bound on the leading
+        column alone, which the planner can use for partition pruning.
+        """
+        values = self.decode(cursor)
+        key = tuple_(*self.columns)
+        position = tuple_(*values)
+        if self.descending:
+            return and_(self.columns[0] <= values[0], key < position)
+        return and_(self.columns[0] >= values[0], key > position)
+
+    def cursor_for(self, row: Any) -> str:
+        """Encode the position of a row as an opaque cursor"""
+        values = [
+            value.isoformat() if isinstance(value, (date, datetime)) else value
+            for value in self.values(row)
+        ]
+        payload = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> List[Any]:
+        """Decode a cursor back into typed key values"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise InvalidCursorError("Invalid pagination cursor") from e
+
+        if not isinstance(values, list) or len(values) != len(self.columns):
+            raise InvalidCursorError("Invalid pagination cursor")
+
+        try:
+            return [
+                self._coerce(column, value)
+                for column, value in zip(self.columns, values)
+            ]
+        except (TypeError, ValueError) as e:
+            raise InvalidCursorError("Invalid pagination cursor") from e
+
+    @staticmethod
+    def _coerce(column: Any, value: Any) -> Any:
+        python_type = column.type.python_type
+        if value is None:
+            raise ValueError("Cursor values cannot be null")
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        return python_type(value)
@@ -0,0 +1,258 @@
+# src/stockalpha/repositories/price_cache.py
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from stockalpha.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "adjusted_close", "volume")
+
+
+@dataclass
+class PriceHistory:
+    """One company's OHLCV history as contiguous arrays sorted by date"""
+
+    company_id: int
+    ids: np.ndarray  # int64
+    dates: np.ndarray  # datetime64[us]
+    open: np.ndarray  # float64, NaN where missing
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    adjusted_close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_rows(
+        cls, company_id: int, rows: Sequence[Tuple[Any, ...]]
+    ) -> "PriceHistory":
+        """
+        Build from (id, date, open, high, low, close, adjusted_close, volume)
+        tuples.
+        """
+        count = len(rows)
+        columns: Dict[str, np.ndarray] = {
+            "ids": np.fromiter((r[0] for r in rows), dtype=np.int64, count=count),
+            "dates": np.array([r[1] for r in rows], dtype="datetime64[us]"),
+        }
+        for offset, name in enumerate(PRICE_COLUMNS, start=2):
+            columns[name] = np.fromiter(
+                (np.nan if r[offset] is None else r[offset] for r in rows),
+                dtype=np.float64,
+                count=count,
+            )
+
+        order = np.argsort(columns["dates"], kind="stable")
+        return cls(
+            company_id=company_id,
+            **{name: np.ascontiguousarray(a[order]) for name, a in columns.items()},
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            getattr(self, f.name).nbytes for f in fields(self) if f.name != "company_id"
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def window(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: Optional[int] = None,
+    ) -> "PriceHistory":
+        """Return the (inclusive) date window as array views, without copying"""
+        lo = 0
+        hi = len(self.dates)
+        if start_date is not None:
+            lo = int(
+                np.searchsorted(self.dates, np.datetime64(start_date), side="left")
+            )
+        if end_date is not None:
+            hi = int(np.searchsorted(self.dates, np.datetime64(end_date), side="right"))
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return self._take(slice(lo, hi))
+
+    def merge(self, other: "PriceHistory") -> "PriceHistory":
+        """Combine with newer rows; rows in `other` win on duplicate dates"""
+        if len(self) and len(other) and other.dates[0] > self.dates[-1]:
+            # Appending bars after the last one needs no re-sort
+            return PriceHistory(
+                company_id=self.company_id,
+                **{
+                    name: np.concatenate([getattr(self, name), getattr(other, name)])
+                    for name in self._array_fields()
+                },
+            )
+
+        combined = {
+            name: np.concatenate([getattr(other, name), getattr(self, name)])
+            for name in self._array_fields()
+        }
+        _, first = np.unique(combined["dates"], return_index=True)
+        return PriceHistory(
+            company_id=self.company_id,
+            **{name: a[first] for name, a in combined.items()},
+        )
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Build PriceDataRead-shaped dictionaries straight from the columns"""
+        columns: Dict[str, List[Any]] = {
+            "date": np.datetime_as_string(self.dates, unit="s").tolist()
+        }
+        for name in PRICE_COLUMNS:
+            values = getattr(self, name)
+            # JSON has no NaN; missing values go back to null
+            column = values.astype(object)
+            column[np.isnan(values)] = None
+            columns[name] = column.tolist()
+        columns["id"] = self.ids.tolist()
+
+        company_id = self.company_id
+        names = list(columns)
+        return [
+            {**dict(zip(names, row)), "company_id": company_id}
+            for row in zip(*columns.values())
+        ]
+
+    def _take(self, index: slice) -> "PriceHistory":
+        return PriceHistory(
+            company_id=self.company_id,
+            **{name: getattr(self, name)[index] for name in self._array_fields()},
+        )
+
+    @staticmethod
+    def _array_fields() -> List[str]:
+        return [f.name for f in fields(PriceHistory) if f.name != "company_id"]
+
+
+class PriceHistoryCache:
+    """
+    Process-wide LRU cache of per-company price histories.
+
+    Entries are evicted least-recently-used first once the total size of the
+    cached arrays exceeds max_bytes, and are reloaded after ttl_seconds so
+    writes made by other processes become visible. A max_bytes of 0
+    disables the cache.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float = 0):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[PriceHistory, float]]" = OrderedDict()
+        self._size = 0
+        # When each company's history last changed in this process, and
+        # when everything was last dropped
+        self._written_at: Dict[int, float] = {}
+        self._cleared_at = -math.inf
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, company_id: int) -> Optional[PriceHistory]:
+        """Return a cached history, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(company_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            history, loaded_at = entry
+            if self.ttl_seconds and time.monotonic() - loaded_at > self.ttl_seconds:
+                self._pop(company_id)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(company_id)
+            self.hits += 1
+            return history
+
+    def put(self, history: PriceHistory, replica_lag: float = 0) -> None:
+        """
+        Cache a freshly loaded history, evicting older entries as needed.
+
+        With replica_lag, the history was read from a replica up to that
+        many seconds behind, and is dropped if the company's prices changed
+        that recently, as it may predate the write.
+        """
+        if not self.enabled or history.nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            written_at = max(
+                self._cleared_at, self._written_at.get(history.company_id, -math.inf)
+            )
+            if now - written_at < replica_lag:
+                return
+            self._store(history, now)
+
+    def update(self, history: PriceHistory) -> None:
+        """Merge freshly written rows into a cached entry, if there is one"""
+        with self._lock:
+            self._written_at[history.company_id] = time.monotonic()
+            entry = self._entries.get(history.company_id)
+            if entry is None:
+                return
+
+            merged = entry[0].merge(history)
+            if merged.nbytes > self.max_bytes:
+                self._pop(history.company_id)
+            else:
+                # Keep the original load time so the TTL still bounds how
+                # long writes from other processes can go unseen
+                self._store(merged, entry[1])
+
+    def invalidate(self, company_id: Optional[int] = None) -> None:
+        """Drop one company's history, or everything when company_id is None"""
+        with self._lock:
+            if company_id is None:
+                self._entries.clear()
+                self._written_at.clear()
+                self._cleared_at = time.monotonic()
+                self._size = 0
+            else:
+                self._written_at[company_id] = time.monotonic()
+                self._pop(company_id)
+
+    def _store(self, history: PriceHistory, loaded_at: float) -> None:
+        self._pop(history.company_id)
+        self._entries[history.company_id] = (history, loaded_at)
+        self._size += history.nbytes
+
+        while self._size > self.max_bytes:
+            evicted, _ = self._entries.popitem(last=False)[1]
+            self._size -= evicted.nbytes
+            logger.debug(f"Evicted price history for company {evicted.company_id}")
+
+    def _pop(self, company_id: int) -> None:
+        entry = self._entries.pop(company_id, None)
+        if entry is not None:
+            self._size -= entry[0].nbytes
+
+
+# Shared by every PriceDataRepository in this process
+price_history_cache = PriceHistoryCache(
+    max_bytes=settings.price_cache_max_bytes,
+    ttl_seconds=settings.price_cache_ttl_seconds,
+)
@@ -1,16 +1,84 @@
 # src/stockalpha/repositories/price_data_repository.py
-from datetime import date, datetime
-from typing import List, Optional, Set, Tuple
+import csv
+import io
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from stockalpha.api.schemas import PriceDataCreate, PriceDataRead
-from stockalpha.models.entities import PriceData
-from stockalpha.repositories.base_repository import BaseRepository
+from stockalpha.models.entities import Company, PriceData
+from stockalpha.repositories.base_repository import BaseRepository, dialect_insert
+from stockalpha.repositories.pagination import Keyset
+from stockalpha.repositories.price_cache import (
+    PRICE_COLUMNS,
+    PriceHistory,
+    price_history_cache,
+)
+from stockalpha.repositories.universe_snapshot import universe_panel_cache
+
+# Companies per query issued by get_histories
+HISTORY_CHUNK_SIZE = 1000
+
+# Rows per COPY / multi-row INSERT issued by bulk_ingest
+BULK_CHUNK_SIZE = 50000
+
+# Columns accepted by bulk_ingest
+INGEST_COLUMNS = (
+    "company_id",
+    "date",
+    "open",
+    "high",
+    "low",
+    "close",
+    "adjusted_close",
+    "volume",
+)
+
+# Column order expected by PriceHistory.from_rows
+HISTORY_COLUMNS = (
+    PriceData.id,
+    PriceData.date,
+    PriceData.open,
+    PriceData.high,
+    PriceData.low,
+    PriceData.close,
+    PriceData.adjusted_close,
+    PriceData.volume,
+)
+
+# Flat row layout shared by exports and columnar responses
+ROW_COLUMNS = (*HISTORY_COLUMNS, PriceData.company_id)
 
 
 class PriceDataRepository(BaseRepository[PriceData, PriceDataCreate, PriceDataCreate]):
+    # Newest first across companies; a single company's history reads oldest
+    # first. Both encode cursors the same way.
+    keyset = Keyset(
+        columns=(PriceData.date, PriceData.id), values=lambda p: (p.date, p.id)
+    )
+    company_keyset = Keyset(
+        columns=(PriceData.date, PriceData.id),
+        values=lambda p: (p.date, p.id),
+        descending=False,
+    )
+
     def __init__(self):
         super().__init__(PriceData)
 
@@ -34,6 +102,152 @@ class PriceDataRepository(BaseRepository[PriceData, PriceDataCreate, PriceDataCr
 
         return query.order_by(PriceData.date).offset(skip).limit(limit).all()
 
+    def get_filtered(
+        self,
+        db: Session,
+        company_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> List[Any]:
+        """
+        Get price data with optional company and date filters.
+
+        When a cursor from next_cursor is given, the page starts after it
+        and skip is ignored. When columns (including id and date) are given,
+        plain rows are returned instead of ORM objects.
+        """
+        keyset = self.company_keyset if company_id else self.keyset
+        query = db.query(*columns) if columns else db.query(PriceData)
+
+        if company_id:
+            query = query.filter(PriceData.company_id == company_id)
+
+        if start_date:
+            query = query.filter(PriceData.date >= start_date)
+
+        if end_date:
+            query = query.filter(PriceData.date <= end_date)
+
+        query = query.order_by(*keyset.order_by())
+        if cursor:
+            return query.filter(keyset.after(cursor)).limit(limit).all()
+
+        return query.offset(skip).limit(limit).all()
+
+    def get_history(
+        self,
+        db: Session,
+        company_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: Optional[int] = None,
+        replica_lag: float = 0,
+    ) -> PriceHistory:
+        """
+        Get a company's price history as columnar arrays.
+
+        The full history is loaded with one column query and kept in the
+        process-wide price cache, so later windows are served by binary
+        search over the cached arrays without touching the database. When db
+        reads from a replica, pass its maximum lag as replica_lag.
+        """
+        history = price_history_cache.get(company_id)
+
+        if history is None:
+            query = db.query(*HISTORY_COLUMNS).filter(
+                PriceData.company_id == company_id
+            )
+
+            if not price_history_cache.enabled:
+                # Without a cache, only load the requested window
+                if start_date:
+                    query = query.filter(PriceData.date >= start_date)
+                if end_date:
+                    query = query.filter(PriceData.date <= end_date)
+                rows = query.order_by(PriceData.date).limit(limit).all()
+                return PriceHistory.from_rows(company_id, rows)
+
+            history = PriceHistory.from_rows(
+                company_id, query.order_by(PriceData.date).all()
+            )
+            price_history_cache.put(history, replica_lag=replica_lag)
+
+        return history.window(start_date=start_date, end_date=end_date, limit=limit)
+
+    def get_histories(
+        self, db: Session, company_ids: Sequence[int], replica_lag: float = 0
+    ) -> List[PriceHistory]:
+        """
+        Get full price histories for many companies.
+
+        Cached histories are reused and the rest are loaded together, one
+        query per HISTORY_CHUNK_SIZE companies, then cached.
+        """
+        histories: Dict[int, PriceHistory] = {}
+        missing = []
+        for company_id in company_ids:
+            history = price_history_cache.get(company_id)
+            if history is None:
+                missing.append(company_id)
+            else:
+                histories[company_id] = history
+
+        for start in range(0, len(missing), HISTORY_CHUNK_SIZE):
+            chunk = missing[start : start + HISTORY_CHUNK_SIZE]
+            rows = (
+                db.query(PriceData.company_id, *HISTORY_COLUMNS)
+                .filter(PriceData.company_id.in_(chunk))
+                .order_by(PriceData.company_id, PriceData.date)
+                .all()
+            )
+            for company_id, group in groupby(rows, key=itemgetter(0)):
+                history = PriceHistory.from_rows(company_id, [r[1:] for r in group])
+                price_history_cache.put(history, replica_lag=replica_lag)
+                histories[company_id] = history
+
+        return [
+            histories.get(company_id) or PriceHistory.from_rows(company_id, [])
+            for company_id in company_ids
+        ]
+
+    def stream_rows(
+        self,
+        db: Session,
+        company_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        batch_size: int = 5000,
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Stream price rows in batches of plain tuples.
+
+        Rows come from a server-side cursor (yield_per), so memory stays
+        bounded by batch_size however large the range is. Tuples follow
+        ROW_COLUMNS order.
+        """
+        query = db.query(*ROW_COLUMNS)
+
+        if company_id:
+            query = query.filter(PriceData.company_id == company_id)
+
+        if start_date:
+            query = query.filter(PriceData.date >= start_date)
+
+        if end_date:
+            query = query.filter(PriceData.date <= end_date)
+
+        result = db.execute(
+            query.order_by(
+                PriceData.company_id, PriceData.date
+            ).statement.execution_options(yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
     def get_by_date(
         self, db: Session, company_id: int, date_value: date
     ) -> Optional[PriceData]:
@@ -44,51 +258,280 @@ class PriceDataRepository(BaseRepository[PriceData, PriceDataCreate, PriceDataCr
             .first()
         )
 
+    def get_watermarks(
+        self, db: Session, company_ids: Optional[Sequence[int]] = None
+    ) -> Dict[int, Optional[datetime]]:
+        """
+        Latest price date per company, None for companies without prices.
+
+        Each company's maximum is a single seek into idx_company_date rather
+        than an aggregate over the whole table.
+        """
+        latest = (
+            select(func.max(PriceData.date))
+            .where(PriceData.company_id == Company.id)
+            .scalar_subquery()
+        )
+        query = select(Company.id, latest)
+        if company_ids is not None:
+            query = query.where(Company.id.in_(company_ids))
+        return dict(db.execute(query).tuples().all())
+
+    def get_latest_closes(
+        self, db: Session, company_ids: Optional[Sequence[int]] = None
+    ) -> Dict[int, Optional[float]]:
+        """Latest close per company, None for companies without prices"""
+        latest = (
+            select(PriceData.close)
+            .where(PriceData.company_id == Company.id)
+            .order_by(PriceData.date.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        query = select(Company.id, latest)
+        if company_ids is not None:
+            query = query.where(Company.id.in_(company_ids))
+        return dict(db.execute(query).tuples().all())
+
+    def get_close_rows(
+        self,
+        db: Session,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        company_ids: Optional[List[int]] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """Get (company_id, date, close, adjusted_close) tuples for a window"""
+        query = db.query(
+            PriceData.company_id,
+            PriceData.date,
+            PriceData.close,
+            PriceData.adjusted_close,
+        )
+
+        if company_ids:
+            query = query.filter(PriceData.company_id.in_(company_ids))
+
+        if start_date:
+            query = query.filter(PriceData.date >= start_date)
+
+        if end_date:
+            query = query.filter(PriceData.date <= end_date)
+
+        return [tuple(row) for row in query.all()]
+
+    def get_bar_rows(
+        self,
+        db: Session,
+        start_date: date,
+        end_date: date,
+        company_ids: Optional[Sequence[int]] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """Get (company_id, date, *PRICE_COLUMNS) tuples for whole days"""
+        query = select(
+            PriceData.company_id,
+            PriceData.date,
+            *(getattr(PriceData, name) for name in PRICE_COLUMNS),
+        ).where(
+            PriceData.date >= datetime.combine(start_date, datetime.min.time()),
+            PriceData.date
+            < datetime.combine(end_date + timedelta(days=1), datetime.min.time()),
+        )
+        if company_ids is not None:
+            query = query.where(PriceData.company_id.in_(company_ids))
+        return [tuple(row) for row in db.execute(query)]
+
     def create_batch(
         self, db: Session, price_data_list: List[PriceDataCreate]
     ) -> List[PriceData]:
-        """Create multiple price data entries in batch - optimized version"""
+        """
+        Create multiple price data entries in batch.
+
+        Rows whose (company_id, date) already exist are skipped by the
+        idx_company_date unique index (ON CONFLICT DO NOTHING), and the
+        inserted rows come back fully populated through bulk_insert.
+        """
         if not price_data_list:
             return []
 
-        # Get unique company_ids and dates from the input list
-        company_ids = list({p.company_id for p in price_data_list})
-        dates = list({p.date for p in price_data_list})
+        # The first row wins when the batch repeats a (company_id, date) key
+        rows: Dict[Tuple[int, datetime], Dict[str, Any]] = {}
+        for price_data in price_data_list:
+            rows.setdefault(
+                (price_data.company_id, price_data.date), price_data.model_dump()
+            )
+        result = self.bulk_insert(
+            db, list(rows.values()), skip_conflicts_on=["company_id", "date"]
+        )
+
+        self._update_cache(result)
+        return result
 
-        # Bulk retrieve existing entries
-        existing_entries = (
-            db.query(PriceData)
-            .filter(PriceData.company_id.in_(company_ids), PriceData.date.in_(dates))
-            .all()
+    def bulk_ingest(
+        self, db: Session, rows: Iterable[Dict[str, Any]], return_ids: bool = True
+    ) -> List[int]:
+        """
+        Ingest raw price rows without building ORM objects.
+
+        rows are dictionaries with PriceData column names. On PostgreSQL
+        (psycopg2) each chunk is streamed with COPY into a temporary staging
+        table and moved across with INSERT ... SELECT ... ON CONFLICT DO
+        NOTHING; elsewhere a multi-row INSERT ... ON CONFLICT DO NOTHING is
+        used. Returns the ids of the inserted rows (duplicates are skipped),
+        or an empty list when return_ids is False.
+        """
+        use_copy = (
+            db.get_bind().dialect.name == "postgresql"
+            and db.get_bind().dialect.driver == "psycopg2"
         )
 
-        # Create a set of (company_id, date) tuples for quick lookup
-        existing_keys: Set[Tuple[int, datetime]] = {
-            (entry.company_id, entry.date) for entry in existing_entries
-        }
+        inserted_ids: List[int] = []
+        touched_companies: Set[int] = set()
+        chunk: List[Dict[str, Any]] = []
 
-        # Create new objects for entries that don't exist yet
-        new_entries = []
-        for price_data in price_data_list:
-            key = (price_data.company_id, price_data.date)
-            if key not in existing_keys:
-                # Try to use model_dump for Pydantic v2 compatibility
-                try:
-                    obj_data = price_data.model_dump()
-                except AttributeError:
-                    obj_data = jsonable_encoder(price_data)
-
-                new_entries.append(PriceData(**obj_data))
-
-        # Bulk insert new entries
-        if new_entries:
-            db.bulk_save_objects(new_entries)
-            db.commit()
-
-        # Return all created objects
-        result = []
-        for entry in new_entries:
-            db.refresh(entry)
-            result.append(entry)
+        def flush() -> None:
+            if not chunk:
+                return
+            touched_companies.update(row["company_id"] for row in chunk)
+            if use_copy:
+                ids = self._copy_chunk(db, chunk)
+            else:
+                ids = self._insert_chunk(db, chunk)
+            if return_ids:
+                inserted_ids.extend(ids)
+            chunk.clear()
 
-        return result
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                flush()
+        flush()
+        db.commit()
+        self._invalidate()
+
+        for company_id in touched_companies:
+            price_history_cache.invalidate(company_id)
+
+        return inserted_ids
+
+    def _insert_chunk(self, db: Session, chunk: List[Dict[str, Any]]) -> List[int]:
+        stmt = (
+            dialect_insert(db, PriceData.__table__)
+            .on_conflict_do_nothing(index_elements=["company_id", "date"])
+            .returning(PriceData.id)
+        )
+        # Executed as batched multi-row VALUES ("insertmanyvalues")
+        values = [
+            {column: row.get(column) for column in INGEST_COLUMNS} for row in chunk
+        ]
+        return list(db.scalars(stmt, values))
+
+    def _copy_chunk(self, db: Session, chunk: List[Dict[str, Any]]) -> List[int]:
+        preparer = db.get_bind().dialect.identifier_preparer
+        table = preparer.quote(PriceData.__table__.name)
+        columns = ", ".join(preparer.quote(column) for column in INGEST_COLUMNS)
+        key = ", ".join(preparer.quote(column) for column in ("company_id", "date"))
+
+        # seq numbers rows in COPY order, so the first of duplicates wins as
+        # in create_batch
+        db.execute(
+            text(
+                "CREATE TEMP TABLE IF NOT EXISTS price_data_staging "
+                "(company_id integer, date timestamp, open double precision, "
+                "high double precision, low double precision, "
+                "close double precision, adjusted_close double precision, "
+                "volume double precision, seq bigserial) ON COMMIT DELETE ROWS"
+            )
+        )
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            [row.get(column) for column in INGEST_COLUMNS] for row in chunk
+        )
+        buffer.seek(0)
+
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY price_data_staging ({columns}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+        ids = db.scalars(
+            text(
+                f"INSERT INTO {table} ({columns}, created_at, updated_at) "
+                f"SELECT DISTINCT ON ({key}) {columns}, "
+                "timezone('utc', now()), timezone('utc', now()) "
+                f"FROM price_data_staging ORDER BY {key}, seq "
+                f"ON CONFLICT ({key}) DO NOTHING RETURNING id"
+            )
+        ).all()
+        db.execute(text("TRUNCATE price_data_staging"))
+        return list(ids)
+
+    def create(self, db: Session, *, obj_in: PriceDataCreate) -> PriceData:
+        """Create new entry and add it to the cached history"""
+        db_obj = super().create(db, obj_in=obj_in)
+        self._update_cache([db_obj])
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: PriceData,
+        obj_in: Union[PriceDataCreate, Dict[str, Any]],
+    ) -> PriceData:
+        """Update entry and drop the company's cached history"""
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        price_history_cache.invalidate(db_obj.company_id)
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> PriceData:
+        """Remove entry and drop the company's cached history"""
+        existing = self.get(db, id=id)
+        company_id = existing.company_id if existing else None
+
+        obj = super().remove(db, id=id)
+        price_history_cache.invalidate(company_id)
+        return obj
+
+    async def acreate(self, db: AsyncSession, *, obj_in: PriceDataCreate) -> PriceData:
+        """Create new entry and add it to the cached history"""
+        db_obj = await super().acreate(db, obj_in=obj_in)
+        self._update_cache([db_obj])
+        return db_obj
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: PriceData,
+        obj_in: Union[PriceDataCreate, Dict[str, Any]],
+    ) -> PriceData:
+        """Update entry and drop the company's cached history"""
+        db_obj = await super().aupdate(db, db_obj=db_obj, obj_in=obj_in)
+        price_history_cache.invalidate(db_obj.company_id)
+        return db_obj
+
+    async def aremove(self, db: AsyncSession, *, id: int) -> PriceData:
+        """Remove entry and drop the company's cached history"""
+        obj = await super().aremove(db, id=id)
+        price_history_cache.invalidate(obj.company_id)
+        return obj
+
+    def _invalidate(self) -> None:
+        super()._invalidate()
+        universe_panel_cache.invalidate()
+
+    def _update_cache(self, entries: List[PriceData]) -> None:
+        """Merge newly written rows into cached histories"""
+        rows_by_company: Dict[int, List[Tuple[Any, ...]]] = defaultdict(list)
+        for entry in entries:
+            rows_by_company[entry.company_id].append(
+                tuple(getattr(entry, column.key) for column in HISTORY_COLUMNS)
+            )
+
+        for company_id, rows in rows_by_company.items():
+            price_history_cache.update(PriceHistory.from_rows(company_id, rows))
@@ -1,16 +1,37 @@
 # src/stockalpha/repositories/signal_repository.py
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple
 
-from fastapi.encoders import jsonable_encoder
+from sqlalchemy import String, cast, func, or_, select, tuple_
 from sqlalchemy.orm import Session
 
 from stockalpha.api.schemas import SignalCreate, SignalRead
 from stockalpha.models.signals import Signal
 from stockalpha.repositories.base_repository import BaseRepository
+from stockalpha.repositories.pagination import Keyset
+from stockalpha.repositories.universe_snapshot import universe_panel_cache
+
+# Flat row layout for columnar responses; JSON details are returned as text
+ROW_COLUMNS = (
+    Signal.id,
+    Signal.company_id,
+    Signal.date,
+    Signal.signal_type,
+    Signal.direction,
+    Signal.strength,
+    Signal.confidence,
+    Signal.reason,
+    Signal.source_announcement_id,
+    cast(Signal.source_details, String).label("source_details"),
+    Signal.created_at,
+    Signal.updated_at,
+)
 
 
 class SignalRepository(BaseRepository[Signal, SignalCreate, SignalCreate]):
+    keyset = Keyset(columns=(Signal.date, Signal.id), values=lambda s: (s.date, s.id))
+    max_page_size = 500
+
     def __init__(self):
         super().__init__(Signal)
 
@@ -20,14 +41,15 @@ class SignalRepository(BaseRepository[Signal, SignalCreate, SignalCreate]):
         company_id: int,
         days: int = 30,
         signal_type: Optional[str] = None,
-    ) -> List[Signal]:
-        """Get signals for a specific company"""
+        columns: Optional[Sequence[Any]] = None,
+    ) -> List[Any]:
+        """Get signals for a specific company, as rows of columns if given"""
         # Prevent excessive queries
         days = min(days, 365)  # Limit to 1 year max
 
         cutoff_date = datetime.now().date() - timedelta(days=days)
 
-        query = db.query(Signal).filter(
+        query = (db.query(*columns) if columns else db.query(Signal)).filter(
             Signal.company_id == company_id, Signal.date >= cutoff_date
         )
 
@@ -65,12 +87,20 @@ class SignalRepository(BaseRepository[Signal, SignalCreate, SignalCreate]):
         min_confidence: float = 0.0,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[Signal]:
-        """Get signals with various filters applied"""
+        cursor: Optional[str] = None,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> List[Any]:
+        """
+        Get signals with various filters applied.
+
+        When a cursor from next_cursor is given, the page starts after it
+        and skip is ignored. When columns (including id and date) are given,
+        plain rows are returned instead of ORM objects.
+        """
         # Prevent excessive queries
-        limit = min(limit, 500)
+        limit = min(limit, self.max_page_size)
 
-        query = db.query(Signal)
+        query = db.query(*columns) if columns else db.query(Signal)
 
         if company_id:
             query = query.filter(Signal.company_id == company_id)
@@ -90,35 +120,78 @@ class SignalRepository(BaseRepository[Signal, SignalCreate, SignalCreate]):
         if min_confidence > 0:
             query = query.filter(Signal.confidence >= min_confidence)
 
-        return query.order_by(Signal.date.desc()).offset(skip).limit(limit).all()
+        query = query.order_by(*self.keyset.order_by())
+        if cursor:
+            return query.filter(self.keyset.after(cursor)).limit(limit).all()
+
+        return query.offset(skip).limit(limit).all()
+
+    def get_direction_rows(
+        self,
+        db: Session,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        company_ids: Optional[List[int]] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """Get (company_id, date, direction, confidence) tuples in date order"""
+        query = db.query(
+            Signal.company_id, Signal.date, Signal.direction, Signal.confidence
+        )
+
+        if company_ids:
+            query = query.filter(Signal.company_id.in_(company_ids))
+
+        if start_date:
+            query = query.filter(Signal.date >= start_date)
+
+        if end_date:
+            query = query.filter(Signal.date <= end_date)
+
+        return [tuple(row) for row in query.order_by(Signal.date, Signal.id).all()]
+
+    def get_as_of_rows(
+        self,
+        db: Session,
+        start_date: date,
+        end_date: date,
+        company_ids: Optional[Sequence[int]] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Get (company_id, date, direction, confidence) tuples for as-of joins.
+
+        Covers the signals dated within the window plus each company's
+        latest signal before it, ordered by company, date and id.
+        """
+        start = datetime.combine(start_date, datetime.min.time())
+        end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        before = select(Signal.company_id, func.max(Signal.date)).where(
+            Signal.date < start
+        )
+        window = (Signal.date >= start) & (Signal.date < end)
+        if company_ids is not None:
+            before = before.where(Signal.company_id.in_(company_ids))
+            window = window & Signal.company_id.in_(company_ids)
+
+        query = (
+            select(Signal.company_id, Signal.date, Signal.direction, Signal.confidence)
+            .where(
+                or_(
+                    window,
+                    tuple_(Signal.company_id, Signal.date).in_(
+                        before.group_by(Signal.company_id)
+                    ),
+                )
+            )
+            .order_by(Signal.company_id, Signal.date, Signal.id)
+        )
+        return [tuple(row) for row in db.execute(query)]
 
     def create_batch(
         self, db: Session, signal_list: List[SignalCreate]
     ) -> List[Signal]:
-        """Create multiple signals in batch"""
-        if not signal_list:
-            return []
-
-        # Prepare objects for bulk insert
-        new_entries = []
-        for signal in signal_list:
-            # Try to use model_dump for Pydantic v2 compatibility
-            try:
-                obj_data = signal.model_dump()
-            except AttributeError:
-                obj_data = jsonable_encoder(signal)
-
-            new_entries.append(Signal(**obj_data))
-
-        # Bulk insert
-        if new_entries:
-            db.bulk_save_objects(new_entries)
-            db.commit()
-
-        # Return all created objects
-        result = []
-        for entry in new_entries:
-            db.refresh(entry)
-            result.append(entry)
-
-        return result
+        """Create multiple signals with a single INSERT ... RETURNING"""
+        return self.bulk_insert(db, [self._dump(signal) for signal in signal_list])
+
+    def _invalidate(self) -> None:
+        super()._invalidate()
+        universe_panel_cache.invalidate()
@@ -0,0 +1,320 @@
+# src/stockalpha/repositories/universe_snapshot.py
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from stockalpha.repositories.fundamentals_snapshot import REPORTED_METRICS
+from stockalpha.repositories.price_cache import PRICE_COLUMNS
+from stockalpha.utils.config import settings
+
+# (company_id, date, *PRICE_COLUMNS)
+BarRow = Tuple[Any, ...]
+# (company_id, report_date, fiscal_year, fiscal_quarter, *REPORTED_METRICS)
+FundamentalRow = Tuple[Any, ...]
+# (company_id, date, direction, confidence)
+SignalRow = Tuple[Any, ...]
+
+FUNDAMENTAL_FIELDS = ("fiscal_year", "fiscal_quarter", *REPORTED_METRICS)
+SIGNAL_FIELDS = ("signal_direction", "signal_confidence")
+
+# Every (T, N) array of a panel, in column order; *_date fields are
+# datetime64[D], the rest float64
+PANEL_FIELDS = (
+    *PRICE_COLUMNS,
+    "report_date",
+    *FUNDAMENTAL_FIELDS,
+    "signal_date",
+    *SIGNAL_FIELDS,
+)
+DATE_FIELDS = ("report_date", "signal_date")
+
+# Proleptic Gregorian ordinal of 1970-01-01, the datetime64 epoch
+_EPOCH_ORDINAL = 719163
+
+# (company ids or None for all companies, start date, end date, period)
+PanelKey = Tuple[Optional[Tuple[int, ...]], date, date, str]
+
+
+def _days(rows: Sequence[Tuple[Any, ...]], index: int) -> np.ndarray:
+    """Day numbers since the epoch of a date or datetime column"""
+    return np.fromiter(
+        (row[index].toordinal() - _EPOCH_ORDINAL for row in rows),
+        dtype=np.int64,
+        count=len(rows),
+    )
+
+
+def _floats(rows: Sequence[Tuple[Any, ...]], index: int) -> np.ndarray:
+    return np.fromiter(
+        (np.nan if row[index] is None else row[index] for row in rows),
+        dtype=np.float64,
+        count=len(rows),
+    )
+
+
+def as_of_index(
+    row_companies: np.ndarray,
+    row_days: np.ndarray,
+    company_ids: np.ndarray,
+    days: np.ndarray,
+) -> np.ndarray:
+    """
+    For each (day, company), the row latest on or before that day.
+
+    Returns a (T, N) int64 array of row positions, -1 where the company has
+    no row yet. Rows are ordered by company and day (stably, so among rows of
+    the same day the last one wins) and every lookup is one binary search
+    over the combined key, for all companies at once.
+    """
+    result = np.full((len(days), len(company_ids)), -1, dtype=np.int64)
+    if not len(row_days) or not len(days) or not len(company_ids):
+        return result
+
+    company_idx = np.searchsorted(company_ids, row_companies)
+    company_idx = np.minimum(company_idx, len(company_ids) - 1)
+    known = company_ids[company_idx] == row_companies
+
+    lowest = min(row_days.min(), days.min())
+    span = max(row_days.max(), days.max()) - lowest + 1
+    keys = company_idx * span + (row_days - lowest)
+    order = np.lexsort((np.arange(len(keys)), keys))
+    order = order[known[order]]
+    keys = keys[order]
+
+    queries = np.arange(len(company_ids))[None, :] * span + (days - lowest)[:, None]
+    positions = np.searchsorted(keys, queries, side="right") - 1
+    # A match from the previous company's rows means none for this company
+    found = positions >= 0
+    found[found] = keys[positions[found]] // span == np.nonzero(found)[1]
+    result[found] = order[positions[found]]
+    return result
+
+
+@dataclass
+class UniversePanel:
+    """
+    Point-in-time (date x company) panel of prices, fundamentals and signals.
+
+    Row t holds only what was known on dates[t]: that day's bar (NaN where
+    the company did not trade), the latest report dated on or before it,
+    and the latest signal dated on or before it. Values of restated
+    fundamentals are the stored, latest ones.
+    """
+
+    start_date: date
+    end_date: date
+    period: str
+    dates: np.ndarray  # datetime64[D], shape (T,), days with any bar
+    company_ids: np.ndarray  # int64, shape (N,)
+    fields: Dict[str, np.ndarray]  # PANEL_FIELDS, each shape (T, N)
+
+    @classmethod
+    def build(
+        cls,
+        start_date: date,
+        end_date: date,
+        period: str,
+        bar_rows: Sequence[BarRow],
+        fundamental_rows: Sequence[FundamentalRow] = (),
+        signal_rows: Sequence[SignalRow] = (),
+        company_ids: Optional[Sequence[int]] = None,
+    ) -> "UniversePanel":
+        """
+        Build from long-format rows.
+
+        fundamental_rows and signal_rows must include each company's latest
+        row before start_date for values to be filled from the first day.
+        The company axis is company_ids, or the companies with bars.
+        """
+        bar_companies = np.fromiter(
+            (r[0] for r in bar_rows), dtype=np.int64, count=len(bar_rows)
+        )
+        bar_days = _days(bar_rows, 1)
+        companies = np.unique(
+            bar_companies
+            if company_ids is None
+            else np.asarray(company_ids, dtype=np.int64)
+        )
+        company_idx = np.searchsorted(companies, bar_companies)
+        company_idx = np.minimum(company_idx, max(len(companies) - 1, 0))
+        keep = (
+            companies[company_idx] == bar_companies
+            if len(companies)
+            else np.zeros(len(bar_rows), dtype=bool)
+        )
+        days, day_idx = np.unique(bar_days[keep], return_inverse=True)
+        shape = (len(days), len(companies))
+
+        fields: Dict[str, np.ndarray] = {}
+        for offset, name in enumerate(PRICE_COLUMNS, start=2):
+            values = np.full(shape, np.nan)
+            values[day_idx, company_idx[keep]] = _floats(bar_rows, offset)[keep]
+            fields[name] = values
+
+        for date_field, names, rows in (
+            ("report_date", FUNDAMENTAL_FIELDS, fundamental_rows),
+            ("signal_date", SIGNAL_FIELDS, signal_rows),
+        ):
+            row_companies = np.fromiter(
+                (r[0] for r in rows), dtype=np.int64, count=len(rows)
+            )
+            row_days = _days(rows, 1)
+            index = as_of_index(row_companies, row_days, companies, days)
+            found = index >= 0
+
+            known = np.full(shape, np.datetime64("NaT"), dtype="datetime64[D]")
+            known[found] = row_days[index[found]].astype("datetime64[D]")
+            fields[date_field] = known
+            for offset, name in enumerate(names, start=2):
+                values = np.full(shape, np.nan)
+                values[found] = _floats(rows, offset)[index[found]]
+                fields[name] = values
+
+        return cls(
+            start_date=start_date,
+            end_date=end_date,
+            period=period,
+            dates=days.astype("datetime64[D]"),
+            company_ids=companies,
+            fields=fields,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.dates), len(self.company_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.dates.nbytes
+            + self.company_ids.nbytes
+            + sum(values.nbytes for values in self.fields.values())
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        The panel as nested lists, one [T][N] list per field.
+
+        JSON has no NaN or NaT; missing values are null and dates are ISO
+        strings.
+        """
+        fields = {}
+        for name, values in self.fields.items():
+            if name in DATE_FIELDS:
+                column = np.datetime_as_string(values, unit="D").astype(object)
+                column[np.isnat(values)] = None
+            else:
+                column = values.astype(object)
+                column[np.isnan(values)] = None
+            fields[name] = column.tolist()
+
+        return {
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+            "period": self.period,
+            "dates": np.datetime_as_string(self.dates, unit="D").tolist(),
+            "company_ids": self.company_ids.tolist(),
+            "fields": fields,
+        }
+
+
+class UniversePanelCache:
+    """
+    Process-wide LRU cache of UniversePanel by (universe, date range).
+
+    Price, fundamental and signal writes in this process invalidate it.
+    Entries are evicted least-recently-used first once their total size
+    exceeds max_bytes, and are rebuilt after ttl_seconds so writes from
+    other processes become visible. A max_bytes of 0 disables the cache.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float = 0):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[PanelKey, Tuple[UniversePanel, float]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._generation = 0
+        self._invalidated_at = -math.inf
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        company_ids: Optional[Sequence[int]],
+        start_date: date,
+        end_date: date,
+        period: str,
+    ) -> PanelKey:
+        universe = None if company_ids is None else tuple(sorted(set(company_ids)))
+        return universe, start_date, end_date, period
+
+    @property
+    def generation(self) -> int:
+        """Pass to put so a panel loaded across an invalidation is dropped"""
+        return self._generation
+
+    def get(self, key: PanelKey) -> Optional[UniversePanel]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            panel, loaded_at = entry
+            if self.ttl_seconds and time.monotonic() - loaded_at > self.ttl_seconds:
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return panel
+
+    def put(
+        self,
+        key: PanelKey,
+        panel: UniversePanel,
+        generation: int,
+        replica_lag: float = 0,
+    ) -> None:
+        """
+        Cache a panel loaded at generation.
+
+        With replica_lag, the panel was read from a replica up to that many
+        seconds behind, and is dropped if it was loaded that soon after an
+        invalidation, as it may predate the write.
+        """
+        if panel.nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            if time.monotonic() - self._invalidated_at < replica_lag:
+                return
+            self._pop(key)
+            self._entries[key] = (panel, time.monotonic())
+            self._size += panel.nbytes
+            while self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = time.monotonic()
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: PanelKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[0].nbytes
+
+
+# Shared by every repository that writes panel data in this process
+universe_panel_cache = UniversePanelCache(
+    max_bytes=settings.universe_cache_max_bytes,
+    ttl_seconds=settings.universe_cache_ttl_seconds,
+)
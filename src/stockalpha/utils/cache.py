@@ -0,0 +1,192 @@
+# src/stockalpha/utils/cache.py
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from stockalpha.utils.config import settings
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is only needed for that backend
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_PREFIX = "stockalpha:response:"
+VERSION_PREFIX = "stockalpha:version:"
+INVALIDATED_PREFIX = "stockalpha:invalidated:"
+
+
+class MemoryCacheBackend:
+    """In-process LRU of byte strings with per-entry expiry"""
+
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if time.monotonic() > expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_counters(self, keys: Sequence[str]) -> List[int]:
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+    def incr(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def set_counter(self, key: str, value: int) -> None:
+        with self._lock:
+            self._counters[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class RedisCacheBackend:
+    """Cache shared by every process through Redis"""
+
+    blocking = True
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        if redis is None:
+            raise RuntimeError("The redis package is required for the Redis cache")
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self.client.set(key, value, ex=max(1, math.ceil(ttl_seconds)))
+
+    def get_counters(self, keys: Sequence[str]) -> List[int]:
+        return [int(value or 0) for value in self.client.mget(keys)]
+
+    def incr(self, key: str) -> None:
+        self.client.incr(key)
+
+    def set_counter(self, key: str, value: int) -> None:
+        self.client.set(key, value)
+
+
+class ResponseCache:
+    """
+    Cache of serialized GET responses, invalidated per table.
+
+    Every key embeds the current version of each table the response was
+    built from, and repository writes bump their table's version, so entries
+    made stale by a write are never read again and age out of the backend.
+    Versions live in the backend: with the in-process backend, writes made
+    by other processes only show up once entries expire after ttl_seconds.
+    The backend also records when each table was last invalidated, so that
+    responses read from a lagging replica are not cached under the new
+    version.
+    A ttl_seconds of 0 disables the cache.
+    """
+
+    def __init__(self, backend: Any, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @property
+    def blocking(self) -> bool:
+        """Whether calls do network I/O and belong off the event loop"""
+        return self.backend.blocking
+
+    def key(self, path: str, tables: Sequence[str]) -> Optional[str]:
+        """Cache key for a request path at the tables' current versions"""
+        try:
+            versions = self.backend.get_counters(
+                [f"{VERSION_PREFIX}{table}" for table in tables]
+            )
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return None
+        return f"{RESPONSE_PREFIX}{path}#{','.join(map(str, versions))}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        try:
+            self.backend.set(key, value, self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    def invalidated_within(self, tables: Sequence[str], seconds: float) -> bool:
+        """Whether any of the tables was invalidated in the last `seconds`"""
+        try:
+            stamps = self.backend.get_counters(
+                [f"{INVALIDATED_PREFIX}{table}" for table in tables]
+            )
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return True
+        return max(stamps, default=0) > (time.time() - seconds) * 1000
+
+    def invalidate(self, *tables: str) -> None:
+        """Expire every cached response built from these tables"""
+        if not self.enabled:
+            return
+
+        now_ms = int(time.time() * 1000)
+        for table in tables:
+            try:
+                self.backend.incr(f"{VERSION_PREFIX}{table}")
+                self.backend.set_counter(f"{INVALIDATED_PREFIX}{table}", now_ms)
+            except Exception as e:
+                logger.error(f"Failed to invalidate cached {table} responses: {e}")
+
+
+def create_response_cache() -> ResponseCache:
+    """Build the response cache from settings and system.cache_ttl_seconds"""
+    ttl_seconds = settings.yaml_config.get("system", {}).get("cache_ttl_seconds", 0)
+    backend: Union[MemoryCacheBackend, RedisCacheBackend]
+    if settings.response_cache_backend == "redis":
+        backend = RedisCacheBackend.from_url(settings.redis_url)
+    else:
+        backend = MemoryCacheBackend(settings.response_cache_max_entries)
+    return ResponseCache(backend, ttl_seconds=ttl_seconds or 0)
+
+
+# Shared by the API routes and the repositories that invalidate it
+response_cache = create_response_cache()
@@ -1,7 +1,7 @@
 # src/stockalpha/utils/config.py
 import os
 from functools import lru_cache
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 import yaml
 from pydantic import PostgresDsn
@@ -26,6 +26,58 @@ class Settings(BaseSettings):
     database_url: PostgresDsn
     db_echo: bool = False
 
+    # Connection pool settings, per engine and per process
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced
+    # "always" pings on every checkout, "idle" only after db_pool_ping_idle_seconds
+    # unused in the pool, "never" relies on errors to discard dead connections
+    db_pool_pre_ping: Literal["always", "idle", "never"] = "idle"
+    db_pool_ping_idle_seconds: float = 30.0
+
+    # Read replicas for read-only routes (a JSON list in the environment)
+    database_replica_urls: List[PostgresDsn] = []
+    db_replica_strategy: Literal["round_robin", "least_connections"] = "round_robin"
+    # Replicas lagging further behind are skipped; also how long a client
+    # reads from the primary after its own writes
+    db_replica_max_lag_seconds: float = 5.0
+    db_replica_check_seconds: float = 2.0
+
+    # In-memory price history cache (0 disables it)
+    price_cache_max_bytes: int = 256 * 1024 * 1024
+    price_cache_ttl_seconds: float = 300.0
+
+    # In-memory cache of point-in-time universe panels (0 disables it)
+    universe_cache_max_bytes: int = 512 * 1024 * 1024
+    universe_cache_ttl_seconds: float = 300.0
+
+    # Response cache for GET routes; the TTL is system.cache_ttl_seconds in
+    # the YAML config, and the cache is off without it
+    response_cache_backend: Literal["memory", "redis"] = "memory"
+    response_cache_max_entries: int = 1024
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Seconds before the in-memory company index is reloaded, so companies
+    # added by other processes become visible
+    company_index_ttl_seconds: float = 300.0
+
+    # Seconds before the screener's fundamentals snapshot is rebuilt, so new
+    # prices and writes from other processes are picked up
+    screener_snapshot_ttl_seconds: float = 300.0
+
+    # Background worker settings
+    worker_concurrency: int = 4
+    worker_poll_interval: float = 1.0
+    # Running jobs whose heartbeat is older than this are requeued, or
+    # failed once they have been claimed worker_max_attempts times
+    worker_stale_job_seconds: int = 300
+    worker_heartbeat_seconds: float = 30.0
+    worker_max_attempts: int = 3
+    # Processes per sweep job; None uses every CPU
+    sweep_max_workers: Optional[int] = None
+    embedded_worker: bool = False  # Consume jobs inside the API process
+
     # Additional config from YAML (if needed)
     yaml_config: Dict[str, Any] = {}
 
@@ -34,10 +86,19 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
+def load_yaml_config(path: Optional[str]) -> Dict[str, Any]:
+    """Load the YAML config file named by CONFIG_PATH, if there is one"""
+    if not path or not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+
 @lru_cache()
 def get_settings() -> Settings:
     """Get application settings (cached)"""
-    return Settings()
+    return Settings(yaml_config=load_yaml_config(os.getenv("CONFIG_PATH")))
 
 
 settings = get_settings()
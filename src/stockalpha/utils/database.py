@@ -1,21 +1,96 @@
 # src/stockalpha/utils/database.py
 import logging
-from typing import Generator
+import time
+import weakref
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from starlette.requests import HTTPConnection
 
 from stockalpha.utils.config import settings
+from stockalpha.utils.pool import (
+    MeteredAsyncAdaptedQueuePool,
+    MeteredQueuePool,
+    get_pool_metrics,
+    instrument_pool,
+)
+from stockalpha.utils.replicas import Replica, ReplicaRouter
 
 logger = logging.getLogger(__name__)
 
+
+def pool_options() -> Dict[str, Any]:
+    """Engine keyword arguments for the configured connection pool"""
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping == "always",
+    }
+
+
+def _instrument(engine: Any) -> None:
+    instrument_pool(
+        engine,
+        pre_ping=settings.db_pool_pre_ping,
+        ping_idle_seconds=settings.db_pool_ping_idle_seconds,
+    )
+
+
+def _create_engine(url: str) -> Engine:
+    engine = create_engine(
+        url, poolclass=MeteredQueuePool, echo=settings.db_echo, **pool_options()
+    )
+    _instrument(engine)
+    return engine
+
+
+# The sync engine on the same database as each async engine, keyed by the
+# async engine's sync_engine, which is what AsyncSession.get_bind() returns
+_sync_engines: "weakref.WeakKeyDictionary[Engine, Engine]" = weakref.WeakKeyDictionary()
+
+
+def _create_async_engine(url: str, sync_engine: Engine) -> AsyncEngine:
+    async_engine = create_async_engine(
+        async_database_url(url),
+        poolclass=MeteredAsyncAdaptedQueuePool,
+        echo=settings.db_echo,
+        **pool_options(),
+    )
+    _instrument(async_engine.sync_engine)
+    _sync_engines[async_engine.sync_engine] = sync_engine
+    return async_engine
+
+
+def sync_engine_for(async_session: AsyncSession) -> Engine:
+    """
+    A sync engine on the database an AsyncSession is bound to.
+
+    Engines created here share the configured pools; for async engines
+    created elsewhere, a sync engine on the same URL is made on first use.
+    """
+    bind = async_session.get_bind().engine
+    sync_engine = _sync_engines.get(bind)
+    if sync_engine is None:
+        url = bind.url.set(drivername=bind.url.get_backend_name())
+        sync_engine = _sync_engines[bind] = create_engine(url, poolclass=NullPool)
+    return sync_engine
+
+
 # Create engine
-engine = create_engine(
-    str(settings.database_url),
-    pool_pre_ping=True,
-    echo=settings.db_echo,
-)
+engine = _create_engine(str(settings.database_url))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -30,10 +105,154 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+# asyncio drivers used for each backend by the async session path
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the driver of a database URL for its asyncio counterpart"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend}")
+    return parsed.set(
+        drivername=f"{backend}+{ASYNC_DRIVERS[backend]}"
+    ).render_as_string(hide_password=False)
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """Create the async engine on first use, so its driver stays optional"""
+    return _create_async_engine(str(settings.database_url), engine)
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(
+        bind=get_async_engine(), autoflush=False, expire_on_commit=False
+    )
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session"""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def _replica(name: str, url: str) -> Replica:
+    replica_engine = _create_engine(url)
+    return Replica(
+        name, replica_engine, lambda: _create_async_engine(url, replica_engine)
+    )
+
+
+# Read replicas; read-only routes fall back to the primary without them
+replica_router = ReplicaRouter(
+    [
+        _replica(f"replica-{i}", str(url))
+        for i, url in enumerate(settings.database_replica_urls)
+    ],
+    strategy=settings.db_replica_strategy,
+    max_lag_seconds=settings.db_replica_max_lag_seconds,
+    check_seconds=settings.db_replica_check_seconds,
+)
+
+# Clients send this header, or carry this cookie (a UNIX timestamp set by the
+# API after each write), to read their own writes from the primary
+READ_PRIMARY_HEADER = "X-Read-Primary"
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+def reads_from_primary(connection: HTTPConnection) -> bool:
+    """Whether a read request must see the primary's latest writes"""
+    if connection.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true"):
+        return True
+
+    try:
+        return float(connection.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _choose_replica(request: HTTPConnection) -> Optional[Replica]:
+    replica = None if reads_from_primary(request) else replica_router.choose()
+    # Recorded for the response cache, as replica reads may miss recent writes
+    request.state.read_replica = replica.name if replica else None
+    return replica
+
+
+def replica_lag(request: HTTPConnection) -> float:
+    """
+    How far behind the primary a request's read session may be.
+
+    Caches pass it on so that data read from a replica soon after a write,
+    which may predate the write, is not kept.
+    """
+    if getattr(request.state, "read_replica", None) is None:
+        return 0.0
+    return settings.db_replica_max_lag_seconds
+
+
+def get_read_db(request: HTTPConnection) -> Generator[Session, None, None]:
+    """Get database session for a read-only route, on a replica if possible"""
+    replica = _choose_replica(request)
+    db = SessionLocal(bind=replica.engine) if replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    request: HTTPConnection,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session for a read-only route, on a replica if possible"""
+    replica = _choose_replica(request)
+    factory = get_async_sessionmaker()
+    async with factory(bind=replica.async_engine) if replica else factory() as db:
+        yield db
+
+
+def pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Pool occupancy and checkout metrics for each engine in this process"""
+    engines = {"sync": engine}
+    if get_async_engine.cache_info().currsize:
+        engines["async"] = get_async_engine().sync_engine
+    for replica in replica_router.replicas:
+        engines[replica.name] = replica.engine
+        if replica._async_engine is not None:
+            engines[f"{replica.name}-async"] = replica._async_engine.sync_engine
+
+    snapshots = {}
+    for name, metered in engines.items():
+        metrics = get_pool_metrics(metered.pool)
+        if metrics is not None:
+            snapshots[name] = metrics.snapshot(metered.pool)
+    return snapshots
+
+
 def init_db() -> None:
     """Initialize database tables"""
     from stockalpha.models.base import Base
+    from stockalpha.models.partitioning import create_tables, ensure_partitions
+    from stockalpha.models.promoted import install_promoted_fields
+    from stockalpha.models.search import install_search_index
 
     logger.info("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    # Tables created earlier miss the search index, promoted columns
+    # configured since, and indexes added to their models since
+    with engine.begin() as connection:
+        create_tables(connection)
+        install_search_index(connection)
+        install_promoted_fields(connection)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                try:
+                    with connection.begin_nested():
+                        index.create(connection, checkfirst=True)
+                except IntegrityError as e:
+                    # A new unique index over rows that break it; the rest of
+                    # the schema is still brought up to date
+                    logger.error(f"Could not create index {index.name}: {e}")
+        ensure_partitions(connection)
     logger.info("Database tables created successfully")
@@ -0,0 +1,205 @@
+# src/stockalpha/utils/pool.py
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the checkout latency histogram buckets
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+
+class PoolMetrics:
+    """Counters and timings for one engine's connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self.waits = 0  # checkouts that found the pool exhausted
+        self.timeouts = 0
+        self.overflow_peak = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        self.checkout_buckets = [0] * (len(CHECKOUT_BUCKETS) + 1)
+        self.held_seconds_total = 0.0
+
+    def record_checkout(self, seconds: float, waited: bool, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.waits += waited
+            self.overflow_peak = max(self.overflow_peak, overflow)
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+            self.checkout_buckets[bisect.bisect_left(CHECKOUT_BUCKETS, seconds)] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.waits += 1
+            self.timeouts += 1
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """Current pool occupancy plus the counters collected so far"""
+        with self._lock:
+            checkouts = self.checkouts
+            data: Dict[str, Any] = {
+                "connects": self.connects,
+                "checkouts": checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "pings": self.pings,
+                "ping_failures": self.ping_failures,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "overflow_peak": self.overflow_peak,
+                "checkout_seconds_mean": (
+                    self.checkout_seconds_total / checkouts if checkouts else 0.0
+                ),
+                "checkout_seconds_max": self.checkout_seconds_max,
+                "checkout_seconds_buckets": dict(
+                    zip([*map(str, CHECKOUT_BUCKETS), "+Inf"], self.checkout_buckets)
+                ),
+                "held_seconds_total": self.held_seconds_total,
+            }
+
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return data
+
+
+# Metrics of each instrumented pool, carried over when a pool is recreated
+_pool_metrics: "WeakKeyDictionary[Pool, PoolMetrics]" = WeakKeyDictionary()
+
+
+def get_pool_metrics(pool: Pool) -> Optional[PoolMetrics]:
+    """The PoolMetrics fed by a pool, if its engine was instrumented"""
+    return _pool_metrics.get(pool)
+
+
+class _MeteredPoolMixin(QueuePool):
+    """Times every checkout, including the time spent waiting for a slot"""
+
+    def __init__(
+        self, creator: Any, pool_size: int = 5, max_overflow: int = 10, **kwargs: Any
+    ):
+        super().__init__(
+            creator, pool_size=pool_size, max_overflow=max_overflow, **kwargs
+        )
+        self.max_overflow = max_overflow
+
+    def _do_get(self) -> Any:
+        metrics = _pool_metrics.get(self)
+        if metrics is None:
+            return super()._do_get()
+
+        exhausted = (
+            self.max_overflow > -1
+            and self.checkedin() == 0
+            and self.checkedout() >= self.size() + self.max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+
+        metrics.record_checkout(
+            time.perf_counter() - start, exhausted, max(self.overflow(), 0)
+        )
+        return entry
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        metrics = _pool_metrics.get(self)
+        if metrics is not None:
+            _pool_metrics[pool] = metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin):
+    pass
+
+
+class MeteredAsyncAdaptedQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(
+    engine: Engine, pre_ping: str, ping_idle_seconds: float
+) -> PoolMetrics:
+    """
+    Attach pool event listeners that feed a fresh PoolMetrics.
+
+    Checkout latency is only timed when the engine uses one of the metered
+    pool classes above; the event-based counters work with any pool.
+
+    With the "idle" pre-ping strategy, connections are only pinged on
+    checkout after sitting in the pool for longer than ping_idle_seconds,
+    instead of paying a round trip on every checkout.
+    """
+    if pre_ping not in PRE_PING_STRATEGIES:
+        raise ValueError(f"Unknown pre-ping strategy: {pre_ping}")
+
+    metrics = _pool_metrics[engine.pool] = PoolMetrics()
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection: Any, record: Any) -> None:
+        metrics.increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+        now = time.monotonic()
+        checked_in_at: Optional[float] = record.info.get("checked_in_at")
+        record.info["checked_out_at"] = now
+
+        if (
+            pre_ping == "idle"
+            and checked_in_at is not None
+            and now - checked_in_at > ping_idle_seconds
+        ):
+            metrics.increment("pings")
+            try:
+                engine.dialect.do_ping(dbapi_connection)
+            except Exception as e:
+                metrics.increment("ping_failures")
+                logger.warning(f"Idle connection failed ping, reconnecting: {e}")
+                # Makes the pool discard this connection and retry
+                raise exc.DisconnectionError() from e
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection: Any, record: Any) -> None:
+        now = time.monotonic()
+        metrics.increment("checkins")
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.increment("held_seconds_total", now - checked_out_at)
+        record.info["checked_in_at"] = now
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection: Any, record: Any, exception: Any) -> None:
+        metrics.increment("invalidations")
+
+    return metrics
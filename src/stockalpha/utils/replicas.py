@@ -0,0 +1,154 @@
+# src/stockalpha/utils/replicas.py
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+REPLICA_STRATEGIES = ("round_robin", "least_connections")
+
+# Seconds of replay lag on a PostgreSQL standby; 0 when it has replayed
+# everything it received, so an idle primary does not look like lag
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """)
+
+
+class Replica:
+    """A read replica's engines and its last measured replication lag"""
+
+    def __init__(
+        self,
+        name: str,
+        engine: Engine,
+        async_engine_factory: Optional[Callable[[], AsyncEngine]] = None,
+    ):
+        self.name = name
+        self.engine = engine
+        self._async_engine_factory = async_engine_factory
+        self._async_engine: Optional[AsyncEngine] = None
+        self.lag_seconds = math.inf  # Unknown until first measured
+        self.checked_at: Optional[float] = None
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        if self._async_engine is None:
+            if self._async_engine_factory is None:
+                raise RuntimeError(f"Replica {self.name} has no async engine")
+            self._async_engine = self._async_engine_factory()
+        return self._async_engine
+
+    @property
+    def connections(self) -> int:
+        """Connections currently checked out across both pools"""
+        pools = [self.engine.pool]
+        if self._async_engine is not None:
+            pools.append(self._async_engine.sync_engine.pool)
+        return sum(getattr(pool, "checkedout", lambda: 0)() for pool in pools)
+
+    def measure_lag(self) -> float:
+        """Query the replica for its lag; unreachable replicas get infinity"""
+        try:
+            with self.engine.connect() as conn:
+                if self.engine.dialect.name == "postgresql":
+                    lag = float(conn.execute(LAG_QUERY).scalar() or 0)
+                else:
+                    conn.execute(text("SELECT 1"))
+                    lag = 0.0
+        except Exception as e:
+            logger.warning(f"Replica {self.name} is unreachable: {e}")
+            lag = math.inf
+
+        self.lag_seconds = lag
+        self.checked_at = time.monotonic()
+        return lag
+
+
+class ReplicaRouter:
+    """
+    Pick a replica for read-only sessions.
+
+    Replicas are chosen round-robin or by fewest checked-out connections,
+    among those whose lag was measured within the last few check intervals
+    and is below max_lag_seconds. choose() returns None when no replica
+    qualifies, and callers then read from the primary. Lag is refreshed by a
+    background thread, so choosing never touches the database.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        strategy: str = "round_robin",
+        max_lag_seconds: float = 5.0,
+        check_seconds: float = 2.0,
+    ):
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+
+        self.replicas = replicas
+        self.strategy = strategy
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self._counter = itertools.count()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def available(self) -> List[Replica]:
+        """Replicas with a recent lag measurement inside the limit"""
+        # Measurements older than a few intervals mean the monitor is stuck
+        stale_before = time.monotonic() - 3 * self.check_seconds
+        return [
+            r
+            for r in self.replicas
+            if r.checked_at is not None
+            and r.checked_at >= stale_before
+            and r.lag_seconds <= self.max_lag_seconds
+        ]
+
+    def choose(self) -> Optional[Replica]:
+        candidates = self.available()
+        if not candidates:
+            return None
+
+        if self.strategy == "least_connections":
+            return min(candidates, key=lambda r: r.connections)
+        return candidates[next(self._counter) % len(candidates)]
+
+    def refresh(self) -> None:
+        for replica in self.replicas:
+            replica.measure_lag()
+
+    def start(self) -> None:
+        """Measure every replica once, then keep measuring in the background"""
+        if not self.replicas or self._thread is not None:
+            return
+
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._monitor, name="replica-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _monitor(self) -> None:
+        while not self._stop.wait(self.check_seconds):
+            self.refresh()
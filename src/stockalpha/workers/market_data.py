@@ -0,0 +1,121 @@
+# src/stockalpha/workers/market_data.py
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from stockalpha.collectors.market_data import MarketDataProvider
+from stockalpha.repositories import get_repository
+from stockalpha.repositories.company import CompanyRepository
+from stockalpha.repositories.price_data_repository import PriceDataRepository
+from stockalpha.utils.config import settings
+from stockalpha.utils.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], Session]
+
+# Fetched rows buffered before they are written with one bulk_ingest call
+INGEST_FLUSH_ROWS = 10000
+
+
+@dataclass
+class MarketDataIngestStats:
+    companies: int = 0  # Fetched successfully
+    up_to_date: int = 0  # Nothing to fetch
+    failed: int = 0
+    bars: int = 0  # Returned by the provider
+    inserted: int = 0
+
+
+def fetch_start(
+    watermark: Optional[datetime], end: date, max_history_years: float
+) -> date:
+    """First date to fetch: the day after the watermark, or the history limit"""
+    if watermark is not None:
+        return watermark.date() + timedelta(days=1)
+    return end - timedelta(days=round(365.25 * max_history_years))
+
+
+def ingest_market_data(
+    provider: MarketDataProvider,
+    company_ids: Optional[Sequence[int]] = None,
+    end: Optional[date] = None,
+    max_workers: Optional[int] = None,
+    session_factory: SessionFactory = SessionLocal,
+) -> MarketDataIngestStats:
+    """
+    Fetch the price bars each company is missing and bulk insert them.
+
+    A company's high-water mark is its latest stored price date, and only
+    bars after it up to `end` (default today) are requested; companies
+    without prices get collection.market_data.max_history_years of history.
+    Fetches run on up to max_workers threads, throttled by the provider's
+    rate limit, while the calling thread writes their results through
+    PriceDataRepository.bulk_ingest. A run that stops early resumes from
+    the new watermarks.
+    """
+    config = settings.yaml_config.get("collection", {}).get("market_data", {})
+    max_workers = max_workers or config.get("max_concurrency", 4)
+    max_history_years = config.get("max_history_years", 5)
+    end = end or date.today()
+    price_repo = get_repository(PriceDataRepository)
+    company_repo = get_repository(CompanyRepository)
+    stats = MarketDataIngestStats()
+
+    def fetch(company_id: int, ticker: str, start: date) -> List[Dict[str, Any]]:
+        return [
+            {"company_id": company_id, **bar}
+            for bar in provider.fetch_bars(ticker, start, end)
+            if start <= bar["date"].date() <= end
+        ]
+
+    db = session_factory()
+    try:
+        windows = {}
+        for company_id, watermark in price_repo.get_watermarks(db, company_ids).items():
+            start = fetch_start(watermark, end, max_history_years)
+            if start > end:
+                stats.up_to_date += 1
+            else:
+                windows[company_id] = start
+
+        rows: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="market-data"
+        ) as executor:
+            futures = {
+                executor.submit(
+                    fetch,
+                    company_id,
+                    company_repo.get_entry(db, company_id).ticker,
+                    start,
+                ): company_id
+                for company_id, start in windows.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    bars = future.result()
+                except Exception:
+                    logger.exception(
+                        f"{provider.name} fetch failed for company {futures[future]}"
+                    )
+                    stats.failed += 1
+                    continue
+
+                stats.companies += 1
+                stats.bars += len(bars)
+                rows.extend(bars)
+                if len(rows) >= INGEST_FLUSH_ROWS:
+                    stats.inserted += len(price_repo.bulk_ingest(db, rows))
+                    rows = []
+
+        if rows:
+            stats.inserted += len(price_repo.bulk_ingest(db, rows))
+    finally:
+        db.close()
+
+    return stats
@@ -0,0 +1,196 @@
+# src/stockalpha/workers/signals.py
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from stockalpha.analysis.announcement_signals import AnnouncementSignalScorer
+from stockalpha.analysis.classifier import AnnouncementClassifier, get_classifier
+from stockalpha.models.signals import Signal
+from stockalpha.repositories import get_repository
+from stockalpha.repositories.announcement_repository import AnnouncementRepository
+from stockalpha.repositories.signal_repository import SignalRepository
+from stockalpha.utils.cache import response_cache
+from stockalpha.utils.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], Session]
+
+# Announcements read, scored and written per transaction
+ANNOUNCEMENT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class SignalPipelineStats:
+    announcements: int = 0  # Marked processed
+    classified: int = 0
+    skipped: int = 0  # Not classified, left for a later run
+    signals: int = 0
+    chunks: int = 0
+
+    def __iadd__(self, other: "SignalPipelineStats") -> "SignalPipelineStats":
+        self.announcements += other.announcements
+        self.classified += other.classified
+        self.skipped += other.skipped
+        self.signals += other.signals
+        self.chunks += other.chunks
+        return self
+
+
+def classify_rows(
+    db: Session, rows: Sequence[Any], classifier: AnnouncementClassifier
+) -> List[Any]:
+    """
+    Classify rows that have no sentiment score yet and stage the results.
+
+    Returns every row with its classification filled in. The UPDATE joins
+    the caller's transaction.
+    """
+    announcement_repo = get_repository(AnnouncementRepository)
+    pending = [row.id for row in rows if row.sentiment_score is None]
+    if not pending:
+        return list(rows)
+
+    texts = announcement_repo.get_texts(db, pending)
+    results = classifier.classify([(row.title, row.content) for row in texts])
+    updates = {
+        row.id: {"id": row.id, **result._asdict()}
+        for row, result in zip(texts, results)
+    }
+    announcement_repo.update_classifications(db, list(updates.values()))
+
+    return [
+        (
+            SimpleNamespace(**{**row._asdict(), **updates[row.id]})
+            if row.id in updates
+            else row
+        )
+        for row in rows
+    ]
+
+
+def generate_announcement_signals(
+    db: Session,
+    scorer: Optional[AnnouncementSignalScorer] = None,
+    classifier: Optional[AnnouncementClassifier] = None,
+    chunk_size: int = ANNOUNCEMENT_CHUNK_SIZE,
+    partition: int = 0,
+    partitions: int = 1,
+    company_ids: Optional[Sequence[int]] = None,
+) -> SignalPipelineStats:
+    """
+    Emit signals for unprocessed announcements in one company_id partition.
+
+    Announcements without a sentiment score are classified first when a
+    classifier is configured, and otherwise stay unprocessed until they
+    are. Each chunk's classifications and signals are written and its
+    announcements flagged processed in the same transaction, so an
+    interrupted run leaves no partial chunk and the next run resumes where
+    it stopped. With company_ids, only those companies' announcements are
+    processed.
+    """
+    scorer = scorer or AnnouncementSignalScorer.from_config()
+    classifier = classifier or get_classifier()
+    announcement_repo = get_repository(AnnouncementRepository)
+    signal_repo = get_repository(SignalRepository)
+    stats = SignalPipelineStats()
+
+    after_id = 0
+    while True:
+        rows = announcement_repo.get_unprocessed(
+            db,
+            after_id=after_id,
+            limit=chunk_size,
+            partition=partition,
+            partitions=partitions,
+            company_ids=company_ids,
+        )
+        if not rows:
+            break
+        after_id = rows[-1].id
+
+        if classifier is not None:
+            stats.classified += sum(row.sentiment_score is None for row in rows)
+            rows = classify_rows(db, rows, classifier)
+
+        scored = [row for row in rows if row.sentiment_score is not None]
+        created = signal_repo.bulk_insert(db, scorer.score(scored), commit=False)
+        announcement_repo.mark_processed(db, [row.id for row in scored])
+        db.commit()
+
+        stats.announcements += len(scored)
+        stats.skipped += len(rows) - len(scored)
+        stats.signals += len(created)
+        stats.chunks += 1
+
+    if stats.signals:
+        response_cache.invalidate(Signal.__table__.name)
+    return stats
+
+
+def _run_partition(
+    partition: int,
+    partitions: int,
+    chunk_size: int,
+    company_ids: Optional[Sequence[int]],
+    session_factory: SessionFactory,
+) -> SignalPipelineStats:
+    db = session_factory()
+    try:
+        stats = generate_announcement_signals(
+            db,
+            chunk_size=chunk_size,
+            partition=partition,
+            partitions=partitions,
+            company_ids=company_ids,
+        )
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    logger.info(
+        f"Partition {partition}/{partitions}: {stats.announcements} announcements, "
+        f"{stats.signals} signals ({stats.classified} classified), "
+        f"{stats.skipped} awaiting classification"
+    )
+    return stats
+
+
+def run_signal_pipeline(
+    partitions: int = 1,
+    partition: Optional[int] = None,
+    chunk_size: int = ANNOUNCEMENT_CHUNK_SIZE,
+    company_ids: Optional[Sequence[int]] = None,
+    session_factory: SessionFactory = SessionLocal,
+) -> SignalPipelineStats:
+    """
+    Generate announcement signals across company_id partitions.
+
+    Runs every partition on its own thread and session, or only `partition`
+    when given, so partitions can also be spread over separate processes.
+    """
+    if partitions < 1:
+        raise ValueError("partitions must be at least 1")
+    if partition is not None and not 0 <= partition < partitions:
+        raise ValueError(f"partition must be between 0 and {partitions - 1}")
+
+    selected = range(partitions) if partition is None else [partition]
+
+    total = SignalPipelineStats()
+    with ThreadPoolExecutor(
+        max_workers=len(selected), thread_name_prefix="signal-pipeline"
+    ) as executor:
+        for stats in executor.map(
+            lambda p: _run_partition(
+                p, partitions, chunk_size, company_ids, session_factory
+            ),
+            selected,
+        ):
+            total += stats
+    return total
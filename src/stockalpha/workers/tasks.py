@@ -0,0 +1,210 @@
+# src/stockalpha/workers/tasks.py
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import timedelta
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from stockalpha.api.schemas import BacktestResultCreate
+from stockalpha.backtesting.engine import load_panel, run_panel_backtest
+from stockalpha.backtesting.sweep import expand_grid, run_parameter_sweep
+from stockalpha.models.signals import BacktestJob
+from stockalpha.repositories import get_repository
+from stockalpha.repositories.backtest_job_repository import BacktestJobRepository
+from stockalpha.repositories.backtest_repository import BacktestRepository
+from stockalpha.utils.config import settings
+from stockalpha.utils.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], Session]
+
+
+def execute_backtest_job(db: Session, job: BacktestJob, worker_id: str) -> int:
+    """Run a claimed backtest job, store its result and return the backtest id"""
+    job_repo = get_repository(BacktestJobRepository)
+    backtest_repo = get_repository(BacktestRepository)
+
+    job_repo.update_progress(db, job.id, 0.1, "Loading price and signal data")
+    panel = load_panel(
+        db,
+        start_date=job.start_date,
+        end_date=job.end_date,
+        company_ids=job.parameters.get("company_ids"),
+    )
+
+    job_repo.update_progress(
+        db,
+        job.id,
+        0.4,
+        f"Running backtest over {len(panel.dates)} bars "
+        f"x {len(panel.company_ids)} companies",
+    )
+    result = run_panel_backtest(panel, job.strategy_type, job.parameters)
+
+    job_repo.update_progress(db, job.id, 0.9, "Saving results")
+    backtest = backtest_repo.create(
+        db,
+        obj_in=BacktestResultCreate(
+            name=job.name or f"{job.strategy_type} Backtest - job {job.id}",
+            strategy_type=job.strategy_type,
+            parameters=job.parameters,
+            start_date=job.start_date,
+            end_date=job.end_date,
+            **result.metrics(),
+        ),
+    )
+
+    if not job_repo.complete(db, job.id, worker_id, backtest_id=backtest.id):
+        logger.warning(f"Backtest job {job.id} was requeued; result not recorded")
+    return backtest.id
+
+
+def execute_sweep_job(db: Session, job: BacktestJob, worker_id: str) -> List[int]:
+    """Run a claimed sweep job, store its results and return the backtest ids"""
+    job_repo = get_repository(BacktestJobRepository)
+
+    runs = len(expand_grid(job.parameter_grid, job.parameters))
+    job_repo.update_progress(db, job.id, 0.1, f"Running {runs} backtests")
+    backtests = run_parameter_sweep(
+        db,
+        strategy_type=job.strategy_type,
+        parameter_grid=job.parameter_grid,
+        start_date=job.start_date,
+        end_date=job.end_date,
+        base_parameters=job.parameters,
+        name=job.name,
+        created_by=job.created_by,
+        max_workers=settings.sweep_max_workers,
+    )
+
+    backtest_ids = [backtest.id for backtest in backtests]
+    if not job_repo.complete(db, job.id, worker_id, backtest_ids=backtest_ids):
+        logger.warning(f"Sweep job {job.id} was requeued; results not recorded")
+    return backtest_ids
+
+
+def _run_job(job_id: int, worker_id: str, session_factory: SessionFactory) -> None:
+    db = session_factory()
+    job_repo = get_repository(BacktestJobRepository)
+    try:
+        job = job_repo.get(db, id=job_id)
+        if job.parameter_grid is not None:
+            backtest_ids = execute_sweep_job(db, job, worker_id)
+            logger.info(f"Sweep job {job_id} completed ({len(backtest_ids)} backtests)")
+        else:
+            backtest_id = execute_backtest_job(db, job, worker_id)
+            logger.info(f"Backtest job {job_id} completed (backtest {backtest_id})")
+    except Exception as e:
+        logger.exception(f"Backtest job {job_id} failed")
+        db.rollback()
+        job_repo.fail(db, job_id, worker_id, error=str(e))
+    finally:
+        db.close()
+
+
+def _maintain_jobs(worker_id: str, session_factory: SessionFactory) -> None:
+    """Send this worker's heartbeat, then recover jobs of workers that died"""
+    job_repo = get_repository(BacktestJobRepository)
+    db = session_factory()
+    try:
+        job_repo.heartbeat(db, worker_id)
+        requeued = job_repo.requeue_stale(
+            db,
+            older_than=timedelta(seconds=settings.worker_stale_job_seconds),
+            max_attempts=settings.worker_max_attempts,
+        )
+        if requeued:
+            logger.warning(f"Requeued {requeued} stale backtest jobs")
+    except Exception:
+        logger.exception("Failed to maintain backtest jobs")
+    finally:
+        db.close()
+
+
+def process_tasks(
+    concurrency: Optional[int] = None,
+    poll_interval: Optional[float] = None,
+    once: bool = False,
+    stop_event: Optional[threading.Event] = None,
+    session_factory: SessionFactory = SessionLocal,
+) -> None:
+    """
+    Consume queued backtest jobs until stopped.
+
+    At most `concurrency` jobs run at a time. When the queue is empty the
+    worker polls every `poll_interval` seconds, or returns if `once` is set.
+    Every worker_heartbeat_seconds it refreshes the heartbeat of its running
+    jobs and requeues those of workers that stopped, until its own jobs have
+    finished.
+    """
+    concurrency = concurrency or settings.worker_concurrency
+    poll_interval = poll_interval or settings.worker_poll_interval
+    stop_event = stop_event or threading.Event()
+    # Unique per run: a restarted worker can get the same pid (e.g. pid 1 in
+    # a container) and must not keep its predecessor's jobs alive
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    job_repo = get_repository(BacktestJobRepository)
+
+    slots = threading.BoundedSemaphore(concurrency)
+    running: Set[Future] = set()
+    next_maintenance = 0.0
+    logger.info(f"Worker {worker_id} consuming jobs (concurrency={concurrency})")
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="backtest-worker"
+    ) as executor:
+        while not stop_event.is_set():
+            if time.monotonic() >= next_maintenance:
+                _maintain_jobs(worker_id, session_factory)
+                next_maintenance = time.monotonic() + settings.worker_heartbeat_seconds
+            running = {future for future in running if not future.done()}
+
+            # Only claim a job once there is a free slot to run it
+            if not slots.acquire(timeout=poll_interval):
+                continue
+
+            db = session_factory()
+            try:
+                job = job_repo.claim_next(db, worker_id=worker_id)
+            finally:
+                db.close()
+
+            if job is None:
+                slots.release()
+                if once:
+                    break
+                stop_event.wait(poll_interval)
+                continue
+
+            logger.info(f"Claimed backtest job {job.id}")
+            future = executor.submit(_run_job, job.id, worker_id, session_factory)
+            future.add_done_callback(lambda _: slots.release())
+            running.add(future)
+
+        # Keep heartbeats going while jobs claimed before stopping finish
+        while running:
+            running = wait(running, timeout=settings.worker_heartbeat_seconds)[1]
+            if running:
+                _maintain_jobs(worker_id, session_factory)
+
+
+def start_background_worker(
+    session_factory: SessionFactory = SessionLocal,
+) -> threading.Event:
+    """Consume jobs on a daemon thread; set the returned event to stop it"""
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=process_tasks,
+        kwargs={"stop_event": stop_event, "session_factory": session_factory},
+        name="embedded-backtest-worker",
+        daemon=True,
+    )
+    thread.start()
+    return stop_event
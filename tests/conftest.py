@@ -2,13 +2,20 @@
 import os
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from stockalpha.api.main import app
 from stockalpha.models.base import Base
-from stockalpha.utils.database import get_db
+from stockalpha.utils.database import (
+    async_database_url,
+    get_async_db,
+    get_async_read_db,
+    get_db,
+    get_read_db,
+)
 
 # Create a test database
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
@@ -52,6 +59,19 @@ def db_session(db_engine):
         session.close()
 
 
+@pytest.fixture
+def statements(db_session):
+    """SQL statements executed on the test database while the test runs"""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", record)
+    yield executed
+    event.remove(db_session.get_bind(), "before_cursor_execute", record)
+
+
 @pytest.fixture
 def client(db_session):
     """Create test client with database session override"""
@@ -64,7 +84,22 @@ def client(db_session):
         finally:
             pass
 
+    # Async routes read the same database through aiosqlite
+    async_engine = create_async_engine(
+        async_database_url(SQLALCHEMY_TEST_DATABASE_URL), poolclass=NullPool
+    )
+    AsyncTestingSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
 
     with TestClient(app) as client:
         yield client
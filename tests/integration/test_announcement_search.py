@@ -0,0 +1,66 @@
+# tests/integration/test_announcement_search.py
+
+
+def test_search_announcements(client):
+    """Test ranked full-text search with cursor pagination and filters"""
+    response = client.post(
+        "/api/v1/companies/", json={"ticker": "SRCH", "name": "Search Co."}
+    )
+    company_id = response.json()["id"]
+    for day, title, content in [
+        (1, "Zeppelin fleet expansion", "Orders three zeppelin airships"),
+        (2, "Quarterly results", "Revenue from the zeppelin division grew"),
+        (3, "Zeppelin recall", None),
+        (4, "Dividend declared", "No airships mentioned"),
+    ]:
+        client.post(
+            "/api/v1/announcements/",
+            json={
+                "company_id": company_id,
+                "date": f"2024-05-0{day}T00:00:00",
+                "title": title,
+                "content": content,
+            },
+        )
+
+    response = client.get("/api/v1/announcements/search", params={"q": "zeppelin"})
+    assert response.status_code == 200
+    results = response.json()
+    assert len(results) == 3
+    # Title matches rank above a mention in the body
+    assert results[-1]["title"] == "Quarterly results"
+    ranks = [r["rank"] for r in results]
+    assert ranks == sorted(ranks, reverse=True)
+
+    # Every term must match, and search syntax in the input is inert
+    response = client.get(
+        "/api/v1/announcements/search", params={"q": 'zeppelin airships "'}
+    )
+    assert [r["title"] for r in response.json()] == ["Zeppelin fleet expansion"]
+
+    # Pages follow the cursor in rank and in date order
+    for order, expected in [
+        ("rank", [r["title"] for r in results]),
+        ("date", ["Zeppelin recall", "Quarterly results", "Zeppelin fleet expansion"]),
+    ]:
+        params = {"q": "zeppelin", "order": order, "limit": 2}
+        titles = []
+        while True:
+            response = client.get("/api/v1/announcements/search", params=params)
+            titles += [r["title"] for r in response.json()]
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+        assert titles == expected
+
+    response = client.get(
+        "/api/v1/announcements/search",
+        params={"q": "zeppelin", "start_date": "2024-05-02T00:00:00", "limit": 5},
+    )
+    assert {r["title"] for r in response.json()} == {
+        "Quarterly results",
+        "Zeppelin recall",
+    }
+
+    response = client.get("/api/v1/announcements/search", params={"q": ""})
+    assert response.status_code == 422
@@ -0,0 +1,120 @@
+# tests/integration/test_backtest_api.py
+from sqlalchemy.orm import sessionmaker
+
+from stockalpha.workers.tasks import process_tasks
+
+
+def test_run_backtest_job(client, db_engine):
+    """Test queueing a backtest and polling the job until it completes"""
+    company_id = client.post(
+        "/api/v1/companies/", json={"ticker": "JOBS", "name": "Job Co."}
+    ).json()["id"]
+    for day, close in enumerate([100.0, 110.0, 121.0, 108.9], start=1):
+        client.post(
+            "/api/v1/market-data/",
+            json={
+                "company_id": company_id,
+                "date": f"2030-01-0{day}T00:00:00",
+                "close": close,
+            },
+        )
+    client.post(
+        "/api/v1/signals/",
+        json={
+            "company_id": company_id,
+            "date": "2030-01-01T00:00:00",
+            "signal_type": "technical",
+            "direction": 1,
+            "strength": 1.0,
+            "confidence": 0.9,
+        },
+    )
+
+    # Queue the backtest
+    response = client.post(
+        "/api/v1/backtests/run/",
+        json={
+            "strategy_type": "signal",
+            "parameters": {"holding_days": 10, "company_ids": [company_id]},
+            "start_date": "2030-01-01T00:00:00",
+            "end_date": "2030-01-31T00:00:00",
+        },
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+
+    # Drain the queue
+    process_tasks(
+        concurrency=1,
+        poll_interval=0.01,
+        once=True,
+        session_factory=sessionmaker(bind=db_engine),
+    )
+
+    job = client.get(f"/api/v1/backtests/jobs/{job['id']}").json()
+    assert job["status"] == "completed"
+    assert job["progress"] == 1.0
+
+    backtest = client.get(f"/api/v1/backtests/{job['backtest_id']}").json()
+    assert abs(backtest["total_return"] - 0.089) < 1e-9
+    assert backtest["trades_count"] == 1
+
+    # Unknown strategies are rejected before they reach the queue
+    response = client.post(
+        "/api/v1/backtests/run/",
+        json={
+            "strategy_type": "unknown",
+            "parameters": {},
+            "start_date": "2030-01-01T00:00:00",
+            "end_date": "2030-01-31T00:00:00",
+        },
+    )
+    assert response.status_code == 400
+
+
+def test_run_sweep_job(client, db_engine):
+    """Test queueing a parameter sweep and reading its stored backtests"""
+    company_id = client.post(
+        "/api/v1/companies/", json={"ticker": "SWEEP", "name": "Sweep Co."}
+    ).json()["id"]
+    for day, close in enumerate([100.0, 101.0, 99.0, 103.0], start=1):
+        client.post(
+            "/api/v1/market-data/",
+            json={
+                "company_id": company_id,
+                "date": f"2031-01-0{day}T00:00:00",
+                "close": close,
+            },
+        )
+
+    request = {
+        "strategy_type": "signal",
+        "parameter_grid": {"holding_days": [1, 2, 3]},
+        "parameters": {"company_ids": [company_id]},
+        "start_date": "2031-01-01T00:00:00",
+        "end_date": "2031-01-31T00:00:00",
+    }
+    response = client.post("/api/v1/backtests/sweep/", json=request)
+    assert response.status_code == 202
+    job = response.json()
+
+    process_tasks(
+        concurrency=1,
+        poll_interval=0.01,
+        once=True,
+        session_factory=sessionmaker(bind=db_engine),
+    )
+
+    job = client.get(f"/api/v1/backtests/jobs/{job['id']}").json()
+    assert job["status"] == "completed"
+    assert len(job["backtest_ids"]) == 3
+    backtests = client.get(
+        "/api/v1/backtests/compare/", params={"backtest_ids": job["backtest_ids"]}
+    ).json()
+    assert sorted(b["parameters"]["holding_days"] for b in backtests) == [1, 2, 3]
+
+    # The panel is loaded once per sweep, so companies cannot be swept
+    request["parameter_grid"] = {"company_ids": [[company_id], []]}
+    response = client.post("/api/v1/backtests/sweep/", json=request)
+    assert response.status_code == 400
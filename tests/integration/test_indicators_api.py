@@ -0,0 +1,62 @@
+# tests/integration/test_indicators_api.py
+import pytest
+
+
+@pytest.fixture
+def company_id(client):
+    response = client.post(
+        "/api/v1/companies/", json={"ticker": "INDC", "name": "Indicator Co."}
+    )
+    if response.status_code == 400:
+        return client.get("/api/v1/companies/ticker/INDC").json()["id"]
+    return response.json()["id"]
+
+
+def test_company_indicators(client, company_id):
+    """Test indicator series for a company, including appended bars"""
+    client.post(
+        "/api/v1/market-data/bulk/",
+        json=[
+            {
+                "company_id": company_id,
+                "date": f"2034-01-{day:02d}T00:00:00",
+                "close": day,
+            }
+            for day in range(1, 21)
+        ],
+    )
+    params = {"indicators": ["SMA:5", "RSI:3"]}
+
+    response = client.get(f"/api/v1/companies/{company_id}/indicators/", params=params)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["dates"]) == 20
+    assert data["values"]["SMA:5"][:5] == [None, None, None, None, 3.0]
+    assert data["values"]["RSI:3"][-1] == 100.0
+
+    client.post(
+        "/api/v1/market-data/",
+        json={"company_id": company_id, "date": "2034-01-21T00:00:00", "close": 21},
+    )
+    response = client.get(
+        f"/api/v1/companies/{company_id}/indicators/",
+        params={**params, "start_date": "2034-01-20"},
+    )
+    assert response.json()["values"]["SMA:5"] == [18.0, 19.0]
+
+    response = client.get(
+        "/api/v1/indicators/latest/",
+        params={"company_ids": [company_id], "indicators": ["SMA:5"]},
+    )
+    assert response.json() == [
+        {
+            "company_id": company_id,
+            "date": "2034-01-21T00:00:00",
+            "values": {"SMA:5": 19.0},
+        }
+    ]
+
+    response = client.get(
+        f"/api/v1/companies/{company_id}/indicators/", params={"indicators": "BAD:1"}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,124 @@
+# tests/integration/test_market_data_api.py
+import json
+
+import pytest
+
+
+@pytest.fixture
+def company_id(client):
+    response = client.post(
+        "/api/v1/companies/", json={"ticker": "EXPT", "name": "Export Co."}
+    )
+    if response.status_code == 400:
+        return client.get("/api/v1/companies/ticker/EXPT").json()["id"]
+    return response.json()["id"]
+
+
+def test_export_company_price_data(client, company_id):
+    """Test streaming a company's price history as NDJSON and CSV"""
+    client.post(
+        "/api/v1/market-data/bulk/",
+        json=[
+            {"company_id": company_id, "date": f"2031-02-0{day}T00:00:00", "close": day}
+            for day in range(1, 4)
+        ],
+    )
+
+    response = client.get(f"/api/v1/companies/{company_id}/market-data/export/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["close"] for row in rows] == [1.0, 2.0, 3.0]
+    assert rows[0]["date"] == "2031-02-01T00:00:00"
+
+    response = client.get(
+        f"/api/v1/companies/{company_id}/market-data/export/",
+        params={"format": "csv", "start_date": "2031-02-02"},
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].startswith("id,date,open")
+    assert len(lines) == 3
+
+    response = client.get("/api/v1/companies/999999/market-data/export/")
+    assert response.status_code == 404
+
+
+def test_list_price_data_cursor_pagination(client, company_id):
+    """Test walking a company's price history with keyset cursors"""
+    client.post(
+        "/api/v1/market-data/bulk/",
+        json=[
+            {"company_id": company_id, "date": f"2032-03-0{day}T00:00:00", "close": day}
+            for day in range(1, 6)
+        ],
+    )
+    params = {"company_id": company_id, "start_date": "2032-03-01", "limit": 2}
+
+    closes = []
+    cursor = None
+    while True:
+        response = client.get(
+            "/api/v1/market-data/",
+            params={**params, "cursor": cursor} if cursor else params,
+        )
+        assert response.status_code == 200
+        closes += [row["close"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert closes == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    # A cursor only continues the listing it came from
+    cursor = client.get("/api/v1/market-data/", params=params).headers["X-Next-Cursor"]
+    response = client.get(
+        "/api/v1/market-data/",
+        params={**params, "start_date": "2032-03-02", "cursor": cursor},
+    )
+    assert response.status_code == 400
+
+    response = client.get("/api/v1/market-data/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_price_data_arrow_and_parquet(client, company_id):
+    """Test columnar price data responses negotiated through Accept"""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    client.post(
+        "/api/v1/market-data/bulk/",
+        json=[
+            {"company_id": company_id, "date": f"2033-04-0{day}T00:00:00", "close": day}
+            for day in range(1, 4)
+        ],
+    )
+    params = {"start_date": "2033-04-01"}
+
+    response = client.get(
+        f"/api/v1/companies/{company_id}/market-data/",
+        params={**params, "end_date": "2033-04-30"},
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("close").to_pylist() == [1.0, 2.0, 3.0]
+    assert table.column("open").null_count == 3
+
+    response = client.get(
+        "/api/v1/market-data/",
+        params={**params, "company_id": company_id, "limit": 2},
+        headers={"Accept": "application/vnd.apache.parquet"},
+    )
+    assert response.status_code == 200
+    assert "x-next-cursor" in response.headers
+    table = pq.read_table(pa.BufferReader(response.content))
+    assert table.column_names[:2] == ["id", "date"]
+    assert table.num_rows == 2
+
+    response = client.get(
+        f"/api/v1/companies/{company_id}/market-data/export/",
+        params={**params, "format": "arrow"},
+    )
+    assert response.status_code == 200
+    assert pa.ipc.open_stream(response.content).read_all().num_rows == 3
@@ -0,0 +1,110 @@
+# tests/integration/test_response_cache.py
+import pytest
+from fastapi import Request
+
+from stockalpha.api.main import app
+from stockalpha.utils.cache import MemoryCacheBackend, RedisCacheBackend, response_cache
+from stockalpha.utils.config import settings
+from stockalpha.utils.database import get_async_read_db
+
+
+@pytest.fixture
+def enabled_cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "backend", MemoryCacheBackend(100))
+    monkeypatch.setattr(response_cache, "ttl_seconds", 60)
+    return response_cache
+
+
+def test_cached_fundamentals_are_invalidated_by_writes(client, enabled_cache):
+    """Test cache hits, 304 revalidation and invalidation on create"""
+    company = client.post(
+        "/api/v1/companies/", json={"ticker": "CACH", "name": "Cache Co."}
+    ).json()
+    url = f"/api/v1/companies/{company['id']}/fundamentals/"
+
+    first = client.get(url)
+    assert first.headers["X-Cache"] == "MISS"
+    assert first.json() == []
+
+    second = client.get(url)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+    not_modified = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    client.post(
+        "/api/v1/fundamentals/",
+        json={
+            "company_id": company["id"],
+            "period": "annual",
+            "fiscal_year": 2030,
+            "report_date": "2030-12-31T00:00:00",
+        },
+    )
+    third = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert third.status_code == 200
+    assert third.headers["X-Cache"] == "MISS"
+    assert len(third.json()) == 1
+
+
+def test_replica_reads_after_writes_are_not_cached(client, enabled_cache, monkeypatch):
+    """Test skipping the cache for replica reads within the lag of a write"""
+    primary_read = app.dependency_overrides[get_async_read_db]
+
+    async def replica_read(request: Request):
+        request.state.read_replica = "replica-0"
+        async for db in primary_read():
+            yield db
+
+    monkeypatch.setitem(app.dependency_overrides, get_async_read_db, replica_read)
+    monkeypatch.setattr(settings, "db_replica_max_lag_seconds", 60.0)
+
+    company = client.post(
+        "/api/v1/companies/", json={"ticker": "LAGS", "name": "Lag Co."}
+    ).json()
+    url = f"/api/v1/companies/{company['id']}/fundamentals/"
+
+    # The replica may not have the write yet, so its answer is not kept
+    assert "X-Cache" not in client.get(url).headers
+    assert "X-Cache" not in client.get(url).headers
+
+    monkeypatch.setattr(settings, "db_replica_max_lag_seconds", 0.0)
+    assert client.get(url).headers["X-Cache"] == "MISS"
+    assert client.get(url).headers["X-Cache"] == "HIT"
+
+
+class FakeRedis:
+    """The subset of the redis client used by RedisCacheBackend"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+
+def test_redis_backend(client, monkeypatch):
+    """Test the Redis backend against a fake client"""
+    monkeypatch.setattr(response_cache, "backend", RedisCacheBackend(FakeRedis()))
+    monkeypatch.setattr(response_cache, "ttl_seconds", 60)
+
+    company = client.post(
+        "/api/v1/companies/", json={"ticker": "RDIS", "name": "Redis Co."}
+    ).json()
+    url = f"/api/v1/companies/{company['id']}"
+
+    assert client.get(url).headers["X-Cache"] == "MISS"
+    assert client.get(url).headers["X-Cache"] == "HIT"
+    response_cache.invalidate("company")
+    assert client.get(url).headers["X-Cache"] == "MISS"
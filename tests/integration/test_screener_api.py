@@ -0,0 +1,88 @@
+# tests/integration/test_screener_api.py
+
+
+def _fundamentals(company_id, year, revenue, net_income, eps):
+    return {
+        "company_id": company_id,
+        "period": "annual",
+        "fiscal_year": year,
+        "report_date": f"{year + 1}-02-15T00:00:00",
+        "revenue": revenue,
+        "net_income": net_income,
+        "eps": eps,
+        "total_liabilities": 50.0,
+        "total_equity": 100.0,
+    }
+
+
+def test_screener(client):
+    """Test screening latest fundamentals, refreshed after batch writes"""
+    companies = {}
+    for ticker in ("SCRA", "SCRB", "SCRC"):
+        response = client.post(
+            "/api/v1/companies/",
+            json={"ticker": ticker, "name": f"{ticker} Inc.", "sector": "Screening"},
+        )
+        companies[ticker] = response.json()["id"]
+
+    # SCRA: P/E 10, growth 20%; SCRB: P/E 30, growth 50%; SCRC: a loss
+    rows = []
+    for ticker, close, eps, revenues in [
+        ("SCRA", 50.0, 5.0, (100.0, 120.0)),
+        ("SCRB", 60.0, 2.0, (100.0, 150.0)),
+        ("SCRC", 10.0, -1.0, (100.0, 90.0)),
+    ]:
+        company_id = companies[ticker]
+        rows += [
+            _fundamentals(company_id, 2022, revenues[0], 10.0, eps),
+            _fundamentals(company_id, 2023, revenues[1], 12.0, eps),
+        ]
+        client.post(
+            "/api/v1/market-data/",
+            json={"company_id": company_id, "date": "2024-03-01", "close": close},
+        )
+    client.post("/api/v1/fundamentals/batch/", json=rows)
+
+    response = client.get(
+        "/api/v1/screener",
+        params={
+            "q": "sector == 'Screening' and pe < 15 and revenue_growth > 10%",
+        },
+    )
+    assert response.status_code == 200
+    [result] = response.json()
+    assert result["ticker"] == "SCRA"
+    assert result["fiscal_year"] == 2023
+    assert result["metrics"]["pe"] == 10.0
+    assert round(result["metrics"]["revenue_growth"], 6) == 0.2
+
+    response = client.get(
+        "/api/v1/screener",
+        params={"q": "sector = 'Screening'", "sort": "pe", "order": "desc"},
+    )
+    # Undefined P/E (a loss) sorts last
+    assert [r["ticker"] for r in response.json()] == ["SCRB", "SCRA", "SCRC"]
+    assert response.json()[-1]["metrics"]["pe"] is None
+
+    # New fundamentals show up in the next screen
+    client.post(
+        "/api/v1/fundamentals/batch/",
+        json=[_fundamentals(companies["SCRB"], 2024, 160.0, 20.0, 7.5)],
+    )
+    response = client.get(
+        "/api/v1/screener",
+        params={"q": "sector == 'Screening' and pe < 15", "sort": "pe"},
+    )
+    assert [r["ticker"] for r in response.json()] == ["SCRB", "SCRA"]
+
+    # SCRC's missing P/E matches neither a comparison nor its negation
+    for expression in ("pe != 10", "not pe >= 10", "not (pe > 9 or pe < 5)"):
+        response = client.get(
+            "/api/v1/screener",
+            params={"q": f"sector == 'Screening' and {expression}"},
+        )
+        assert [r["ticker"] for r in response.json()] == ["SCRB"]
+
+    for expression in ("pe <", "pe < 'x'", "unknown > 1", "sector > 'A'"):
+        response = client.get("/api/v1/screener", params={"q": expression})
+        assert response.status_code == 400
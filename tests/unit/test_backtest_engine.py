@@ -0,0 +1,113 @@
+# tests/unit/test_backtest_engine.py
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from stockalpha.backtesting.engine import build_panel, run_panel_backtest
+from stockalpha.backtesting.sweep import expand_grid, run_sweep
+
+
+def _price_rows(prices_by_company):
+    start = datetime(2024, 1, 1)
+    rows = []
+    for company_id, prices in prices_by_company.items():
+        for offset, price in enumerate(prices):
+            rows.append((company_id, start + timedelta(days=offset), price, None))
+    return rows
+
+
+def test_build_panel_forward_fills_missing_prices():
+    """Test that gaps in a company's history are forward-filled"""
+    rows = _price_rows({1: [10.0, 11.0, 12.0], 2: [20.0, 21.0, 22.0]})
+    rows = [row for row in rows if not (row[0] == 2 and row[1].day == 2)]
+
+    panel = build_panel(rows)
+
+    assert panel.prices.shape == (3, 2)
+    assert list(panel.company_ids) == [1, 2]
+    assert panel.prices[1, 1] == 20.0
+
+
+def test_signal_strategy_metrics():
+    """Test a single long signal held to the end of the window"""
+    rows = _price_rows({1: [100.0, 110.0, 121.0, 108.9]})
+    signals = [(1, datetime(2024, 1, 1), 1, 0.9)]
+
+    panel = build_panel(rows, signals)
+    result = run_panel_backtest(panel, "signal", {"holding_days": 10})
+
+    # Long from the first close: +10%, +10%, -10%
+    assert result.total_return == pytest.approx(0.089)
+    assert result.max_drawdown == pytest.approx(0.1)
+    assert result.trades_count == 1
+    assert result.win_rate == 1.0
+    assert result.trades[0]["entry_date"] == "2024-01-01"
+    assert result.trades[0]["return"] == pytest.approx(0.089)
+    assert len(result.equity_curve) == 4
+    assert result.equity_curve[-1]["equity"] == pytest.approx(1.089)
+
+
+def test_signal_strategy_respects_confidence_and_holding_period():
+    """Test that weak signals are ignored and positions expire"""
+    rows = _price_rows({1: [100.0, 110.0, 121.0, 133.1]})
+    signals = [(1, datetime(2024, 1, 1), 1, 0.9), (1, datetime(2024, 1, 2), -1, 0.1)]
+
+    panel = build_panel(rows, signals)
+    result = run_panel_backtest(
+        panel, "signal", {"holding_days": 1, "min_confidence": 0.5}
+    )
+
+    assert result.trades_count == 1
+    assert result.total_return == pytest.approx(0.1)
+
+
+def test_unknown_strategy_raises():
+    """Test that an unknown strategy type is rejected"""
+    panel = build_panel(_price_rows({1: [1.0, 2.0]}))
+
+    with pytest.raises(ValueError):
+        run_panel_backtest(panel, "does-not-exist", {})
+
+
+def test_momentum_strategy_picks_top_performer():
+    """Test that momentum goes long the strongest company"""
+    rows = _price_rows(
+        {1: [10.0, 11.0, 12.0, 13.0], 2: [10.0, 9.0, 8.0, 7.0]},
+    )
+
+    panel = build_panel(rows)
+    result = run_panel_backtest(panel, "momentum", {"lookback": 1, "top_n": 1})
+
+    assert result.trades_count == 1
+    assert result.trades[0]["company_id"] == 1
+    assert np.isfinite(result.sharpe_ratio)
+
+    with pytest.raises(ValueError, match="lookback"):
+        run_panel_backtest(panel, "momentum", {"lookback": 0, "top_n": 1})
+
+
+def test_expand_grid():
+    """Test that a parameter grid expands to its cartesian product"""
+    parameter_sets = expand_grid(
+        {"holding_days": [5, 10], "long_only": [True, False]}, {"min_confidence": 0.5}
+    )
+
+    assert len(parameter_sets) == 4
+    assert {"holding_days": 10, "long_only": True, "min_confidence": 0.5} in (
+        parameter_sets
+    )
+
+
+def test_run_sweep_matches_single_runs():
+    """Test that pooled runs over the shared panel match in-process runs"""
+    rows = _price_rows({1: [100.0, 110.0, 99.0, 120.0, 118.0, 130.0]})
+    signals = [(1, datetime(2024, 1, 1), 1, 0.9), (1, datetime(2024, 1, 4), -1, 0.6)]
+    panel = build_panel(rows, signals)
+    parameter_sets = expand_grid({"holding_days": [1, 2, 3, 5]})
+
+    results = run_sweep(panel, "signal", parameter_sets, max_workers=2)
+
+    assert [r.total_return for r in results] == [
+        run_panel_backtest(panel, "signal", p).total_return for p in parameter_sets
+    ]
@@ -0,0 +1,96 @@
+# tests/unit/test_backtest_jobs.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from stockalpha.api.schemas import BacktestJobCreate
+from stockalpha.models.signals import BacktestJob
+from stockalpha.repositories.backtest_job_repository import (
+    COMPLETED,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    BacktestJobRepository,
+)
+
+
+def test_requeue_stale_jobs(db_session):
+    """Test recovering jobs by heartbeat, up to the maximum attempts"""
+    repo = BacktestJobRepository()
+    now = datetime.utcnow()
+
+    def running(worker_id, attempts, heartbeat_at):
+        job = repo.enqueue(
+            db_session,
+            obj_in=BacktestJobCreate(
+                strategy_type="signal",
+                parameters={},
+                start_date=datetime(2030, 1, 1),
+                end_date=datetime(2030, 2, 1),
+            ),
+        )
+        db_session.execute(
+            update(BacktestJob)
+            .where(BacktestJob.id == job.id)
+            .values(
+                status=RUNNING,
+                worker_id=worker_id,
+                attempts=attempts,
+                heartbeat_at=heartbeat_at,
+            )
+        )
+        db_session.commit()
+        return job
+
+    alive = running("alive", 1, now - timedelta(hours=1))
+    dead = running("dead", 1, now - timedelta(hours=1))
+    poison = running("poison", 3, now - timedelta(hours=1))
+
+    # A live worker keeps its long job from being requeued
+    assert repo.heartbeat(db_session, "alive") == 1
+    requeued = repo.requeue_stale(
+        db_session, older_than=timedelta(minutes=5), max_attempts=3
+    )
+    assert requeued == 1
+
+    for job in (alive, dead, poison):
+        db_session.refresh(job)
+    assert (alive.status, dead.status, poison.status) == (RUNNING, QUEUED, FAILED)
+    assert dead.worker_id is None
+    assert "3 attempts" in poison.error
+
+    for job in (alive, dead, poison):
+        repo.remove(db_session, id=job.id)
+
+
+def test_requeued_job_is_finished_only_by_its_new_worker(db_session):
+    """Test a worker whose job was requeued cannot overwrite the new owner's run"""
+    repo = BacktestJobRepository()
+    job = repo.enqueue(
+        db_session,
+        obj_in=BacktestJobCreate(
+            strategy_type="signal",
+            parameters={},
+            start_date=datetime(2031, 1, 1),
+            end_date=datetime(2031, 2, 1),
+        ),
+    )
+    assert repo.claim_next(db_session, worker_id="first").id == job.id
+    db_session.execute(
+        update(BacktestJob)
+        .where(BacktestJob.id == job.id)
+        .values(heartbeat_at=datetime.utcnow() - timedelta(hours=1))
+    )
+    db_session.commit()
+    assert repo.requeue_stale(db_session, timedelta(minutes=5), max_attempts=3) == 1
+    assert repo.claim_next(db_session, worker_id="second").id == job.id
+
+    assert not repo.fail(db_session, job.id, "first", error="lost connection")
+    assert not repo.complete(db_session, job.id, "first", backtest_ids=[])
+    db_session.refresh(job)
+    assert (job.status, job.worker_id, job.error) == (RUNNING, "second", None)
+
+    assert repo.complete(db_session, job.id, "second", backtest_ids=[])
+    db_session.refresh(job)
+    assert job.status == COMPLETED
+    repo.remove(db_session, id=job.id)
@@ -2,6 +2,7 @@
 import pytest
 
 from stockalpha.api.schemas import CompanyCreate
+from stockalpha.models.entities import Company
 from stockalpha.repositories.company import company_repository
 
 
@@ -56,3 +57,23 @@ def test_get_by_ticker(db_session):
     # Try to get non-existent company
     non_existent = company_repository.get_by_ticker(db_session, ticker="NONEXISTENT")
     assert non_existent is None
+
+
+def test_company_index(db_session, statements):
+    """Test existence checks and ticker lookups served from the index"""
+    created = company_repository.create(
+        db_session, obj_in=CompanyCreate(ticker="IDXA", name="Index A")
+    )
+    assert company_repository.exists(db_session, id=created.id)
+
+    statements.clear()
+    assert company_repository.exists(db_session, id=created.id)
+    assert company_repository.get_id_by_ticker(db_session, "IDXA") == created.id
+    assert statements == []
+
+    # Rows written behind the repository's back are found by a query
+    other = Company(ticker="IDXB", name="Index B")
+    db_session.add(other)
+    db_session.commit()
+    assert company_repository.get_id_by_ticker(db_session, "IDXB") == other.id
+    assert not company_repository.exists(db_session, id=other.id + 1000)
@@ -0,0 +1,16 @@
+# tests/unit/test_database.py
+import pytest
+
+from stockalpha.utils.database import async_database_url
+
+
+def test_async_database_url():
+    """Test mapping sync database URLs onto asyncio drivers"""
+    assert (
+        async_database_url("postgresql+psycopg2://user:secret@db:5432/stocks")
+        == "postgresql+asyncpg://user:secret@db:5432/stocks"
+    )
+    assert async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+    with pytest.raises(ValueError):
+        async_database_url("mysql://user@db/stocks")
@@ -0,0 +1,171 @@
+# tests/unit/test_fundamental_data_repository.py
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from stockalpha.api.schemas import CompanyCreate, FundamentalDataCreate
+from stockalpha.models.entities import FundamentalData
+from stockalpha.repositories.company import company_repository
+from stockalpha.repositories.fundamental_data_repository import (
+    FundamentalDataRepository,
+)
+from stockalpha.repositories.fundamental_ratio_repository import (
+    fundamental_ratio_repository,
+)
+from stockalpha.repositories.fundamentals_snapshot import fundamentals_snapshot_cache
+
+
+def test_create_batch_dedup_and_upsert(db_session, statements):
+    """Test set-based duplicate detection and in-place upserts"""
+    company_id = (
+        company_repository.get_id_by_ticker(db_session, ticker="FUND")
+        or company_repository.create(
+            db_session, obj_in=CompanyCreate(ticker="FUND", name="Fundamental Co.")
+        ).id
+    )
+    repo = FundamentalDataRepository()
+
+    def period(quarter, revenue):
+        return FundamentalDataCreate(
+            company_id=company_id,
+            period="annual" if quarter is None else "quarterly",
+            fiscal_year=2023,
+            fiscal_quarter=quarter,
+            report_date=datetime(2024, 1, 31),
+            revenue=revenue,
+        )
+
+    batch = [period(None, 100.0), period(1, 10.0), period(2, 20.0)]
+    assert len(repo.create_batch(db_session, fundamental_data_list=batch)) == 3
+
+    # Annual rows (no fiscal_quarter) are recognized as duplicates too
+    statements.clear()
+    assert repo.create_batch(db_session, fundamental_data_list=batch) == []
+    assert len(statements) == 1
+
+    statements.clear()
+    changed = [period(None, 100.0), period(1, 11.0), period(3, 30.0)]
+    result = repo.create_batch(db_session, fundamental_data_list=changed, upsert=True)
+    # Existence check, insert, update and reload of the updated rows, plus the
+    # ratio refresh: read, upsert and prune
+    assert len(statements) == 7
+    assert [(f.fiscal_quarter, f.revenue) for f in result] == [(3, 30.0), (1, 11.0)]
+    assert (
+        repo.get_by_period(
+            db_session, company_id=company_id, fiscal_year=2023, fiscal_quarter=1
+        ).revenue
+        == 11.0
+    )
+
+    # The unique index covers annual rows as well
+    with pytest.raises(IntegrityError):
+        repo.bulk_insert(db_session, [repo._dump(period(None, 1.0))])
+    db_session.rollback()
+
+
+def test_promoted_fields(db_session):
+    """Test statement values promoted to columns on write, filter and backfill"""
+    company_id = company_repository.create(
+        db_session, obj_in=CompanyCreate(ticker="PROMO", name="Promoted Co.")
+    ).id
+    repo = FundamentalDataRepository()
+
+    def year(fiscal_year, cash_flow):
+        return FundamentalDataCreate(
+            company_id=company_id,
+            period="annual",
+            fiscal_year=fiscal_year,
+            report_date=datetime(fiscal_year + 1, 2, 1),
+            cash_flow_data=cash_flow,
+        )
+
+    low, high, missing = repo.create_batch(
+        db_session,
+        fundamental_data_list=[
+            year(2021, {"freeCashFlow": 50.0}),
+            year(2022, {"freeCashFlow": "1,500", "operatingCashFlow": 2000}),
+            year(2023, {"freeCashFlow": None}),
+        ],
+    )
+    assert (low.free_cash_flow, high.free_cash_flow) == (50.0, 1500.0)
+    assert missing.free_cash_flow is None
+
+    def filtered(*field_filters):
+        return [
+            f.fiscal_year
+            for f in repo.get_filtered(
+                db_session, company_id=company_id, field_filters=field_filters
+            )
+        ]
+
+    assert filtered(("free_cash_flow", ">=", 100.0)) == [2022]
+    assert filtered(("free_cash_flow", "<", 100.0)) == [2021]
+
+    # Statement updates keep the promoted columns in sync
+    repo.update(
+        db_session, db_obj=low, obj_in={"cash_flow_data": {"freeCashFlow": 200}}
+    )
+    assert filtered(("free_cash_flow", ">", 100.0)) == [2022, 2021]
+
+    # Columns left empty, as after adding a field, are filled by the backfill
+    db_session.execute(update(FundamentalData).values(free_cash_flow=None))
+    db_session.commit()
+    assert filtered(("free_cash_flow", ">", 0.0)) == []
+    assert repo.backfill_promoted(db_session) >= 2
+    assert filtered(("free_cash_flow", ">", 0.0)) == [2022, 2021]
+    assert repo.backfill_promoted(db_session) == 0
+
+
+def test_ratio_refresh_failure_keeps_fundamentals(db_session, monkeypatch):
+    """Test a failed ratio refresh neither loses the write nor raises"""
+    company_id = company_repository.create(
+        db_session, obj_in=CompanyCreate(ticker="RFSH", name="Refresh Co.")
+    ).id
+    repo = FundamentalDataRepository()
+
+    def fail(db, company_ids):
+        raise RuntimeError("ratio store unavailable")
+
+    monkeypatch.setattr(fundamental_ratio_repository, "refresh", fail)
+    for year in (2023, 2022):
+        repo.create(
+            db_session,
+            obj_in=FundamentalDataCreate(
+                company_id=company_id,
+                period="annual",
+                fiscal_year=year,
+                report_date=datetime(year + 1, 1, 31),
+            ),
+        )
+    repo.create(
+        db_session,
+        obj_in=FundamentalDataCreate(
+            company_id=company_id,
+            period="quarterly",
+            fiscal_year=2023,
+            fiscal_quarter=4,
+            report_date=datetime(2024, 1, 31),
+        ),
+    )
+
+    # Annual rows sort after the year's quarters on every database
+    assert [
+        (f.fiscal_year, f.fiscal_quarter)
+        for f in repo.get_by_company(db_session, company_id=company_id)
+    ] == [(2023, 4), (2023, None), (2022, None)]
+
+
+def test_snapshot_not_cached_from_lagging_replica(db_session):
+    """Test a snapshot read soon after a write from a lagging replica is rebuilt"""
+    company_repository.create(
+        db_session, obj_in=CompanyCreate(ticker="SNAP", name="Snapshot Co.")
+    )
+    repo = FundamentalDataRepository()
+
+    fundamentals_snapshot_cache.invalidate()
+    lagging = repo.get_snapshot(db_session, period="annual", replica_lag=60)
+    assert repo.get_snapshot(db_session, period="annual", replica_lag=60) is not lagging
+    cached = repo.get_snapshot(db_session, period="annual")
+    assert repo.get_snapshot(db_session, period="annual", replica_lag=60) is cached
@@ -0,0 +1,69 @@
+# tests/unit/test_fundamental_ratio_repository.py
+from datetime import datetime
+
+from stockalpha.api.schemas import CompanyCreate, FundamentalDataCreate
+from stockalpha.repositories.company import company_repository
+from stockalpha.repositories.fundamental_data_repository import (
+    FundamentalDataRepository,
+)
+from stockalpha.repositories.fundamental_ratio_repository import (
+    fundamental_ratio_repository,
+)
+
+
+def test_ratios_follow_fundamentals_writes(db_session):
+    """Test ratio computation and incremental refresh on fundamentals writes"""
+    company_id = company_repository.create(
+        db_session, obj_in=CompanyCreate(ticker="RATIO", name="Ratio Co.")
+    ).id
+    repo = FundamentalDataRepository()
+
+    def quarter(year, quarter, revenue, net_income):
+        return FundamentalDataCreate(
+            company_id=company_id,
+            period="quarterly",
+            fiscal_year=year,
+            fiscal_quarter=quarter,
+            report_date=datetime(year, quarter * 3, 28),
+            revenue=revenue,
+            net_income=net_income,
+            total_assets=400.0,
+            total_liabilities=200.0,
+            total_equity=200.0,
+        )
+
+    repo.create_batch(
+        db_session,
+        fundamental_data_list=[
+            quarter(2022, 4, 80.0, 8.0),
+            quarter(2023, 3, 90.0, 9.0),
+            quarter(2023, 4, 100.0, -10.0),
+        ],
+    )
+    latest = fundamental_ratio_repository.get_by_company(db_session, company_id)[0]
+    assert (latest.fiscal_year, latest.fiscal_quarter) == (2023, 4)
+    assert latest.net_margin == -0.1
+    assert latest.roe == -0.05
+    assert latest.debt_to_equity == 1.0
+    assert latest.debt_to_assets == 0.5
+    assert latest.revenue_growth_yoy == 0.25
+    assert latest.net_income_growth_yoy == -2.25
+    assert round(latest.revenue_growth_qoq, 6) == round(10 / 90, 6)
+    # Missing inputs leave a ratio undefined rather than zero
+    assert latest.eps_growth_yoy is None
+
+    # A new quarter is picked up, with growth against the one before it
+    repo.create_batch(db_session, fundamental_data_list=[quarter(2024, 1, 110.0, 11.0)])
+    ratios = fundamental_ratio_repository.get_by_company(db_session, company_id)
+    assert len(ratios) == 4
+    assert ratios[0].net_income_growth_qoq == 2.1
+
+    # Removing a period removes its ratios and the growth depending on it
+    oldest = repo.get_by_period(
+        db_session, company_id=company_id, fiscal_year=2022, fiscal_quarter=4
+    )
+    repo.remove(db_session, id=oldest.id)
+    ratios = fundamental_ratio_repository.get_by_company(db_session, company_id)
+    assert len(ratios) == 3
+    db_session.refresh(ratios[1])
+    assert ratios[1].revenue_growth_yoy is None
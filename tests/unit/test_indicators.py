@@ -0,0 +1,144 @@
+# tests/unit/test_indicators.py
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from stockalpha.analysis.indicators import (
+    IndicatorCache,
+    IndicatorSet,
+    compute_indicators,
+    parse_indicator,
+    parse_indicators,
+)
+from stockalpha.repositories.price_cache import PriceHistory
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(7)
+    return 100 + np.cumsum(rng.normal(size=400))
+
+
+def _history(closes, company_id=1):
+    rows = [
+        (i + 1, datetime(2030, 1, 1) + timedelta(days=i), None, None, None, close)
+        + (None, None)
+        for i, close in enumerate(closes)
+    ]
+    return PriceHistory.from_rows(company_id, rows)
+
+
+def test_parse_indicators():
+    """Test parsing config-style indicator specs"""
+    keys = [i.key for i in parse_indicators()]
+    assert keys == ["SMA:20", "SMA:50", "SMA:200", "RSI:14", "MACD:12:26:9"]
+    assert parse_indicator("macd:12:26:9").output_keys[1] == "MACD:12:26:9:signal"
+
+    for spec in ("FOO:3", "SMA", "SMA:x", "MACD:12:26", "RSI:0"):
+        with pytest.raises(ValueError):
+            parse_indicator(spec)
+
+
+def test_kernels_match_reference(closes):
+    """Test SMA and RSI against straightforward implementations"""
+    outputs = compute_indicators(closes, parse_indicators(["SMA:20", "RSI:14"]))
+
+    assert np.isnan(outputs["SMA:20"][18])
+    assert outputs["SMA:20"][19] == pytest.approx(closes[:20].mean())
+    assert outputs["SMA:20"][-1] == pytest.approx(closes[-20:].mean())
+
+    delta = np.diff(closes)
+    avg_gain = np.maximum(delta[:14], 0).mean()
+    avg_loss = np.maximum(-delta[:14], 0).mean()
+    for d in delta[14:30]:
+        avg_gain += (max(d, 0) - avg_gain) / 14
+        avg_loss += (max(-d, 0) - avg_loss) / 14
+    assert np.isnan(outputs["RSI:14"][13])
+    assert outputs["RSI:14"][30] == pytest.approx(100 - 100 / (1 + avg_gain / avg_loss))
+
+
+def test_streaming_updates_match_batch(closes):
+    """Test that appending bars one at a time reproduces the full computation"""
+    indicators = parse_indicators()
+    expected = compute_indicators(closes, indicators)
+
+    for warm_up in (0, 10, 300):
+        stream = IndicatorSet(indicators, closes[:warm_up])
+        for t in range(warm_up, len(closes)):
+            for key, value in stream.update(closes[t]).items():
+                np.testing.assert_allclose(value, expected[key][t], rtol=1e-9)
+
+
+def test_panel_matches_single_series(closes):
+    """Test computing a ragged universe at once with right-aligned columns"""
+    indicators = parse_indicators()
+    panel = np.full((len(closes), 2), np.nan)
+    panel[:, 0] = closes
+    panel[100:, 1] = closes[:300]
+
+    outputs = compute_indicators(panel, indicators)
+    for key, series in compute_indicators(closes, indicators).items():
+        np.testing.assert_allclose(outputs[key][:, 0], series)
+        np.testing.assert_allclose(outputs[key][100:, 1], series[:300])
+
+
+def test_indicator_cache_extends_appended_bars(closes):
+    """Test that the cache streams new bars and recomputes on edits"""
+    cache = IndicatorCache()
+    indicators = parse_indicators(["SMA:5", "MACD:3:6:2"])
+
+    frame = cache.get(_history(closes[:350]), indicators)
+    assert len(frame) == 350
+
+    frame = cache.get(_history(closes), indicators)
+    expected = compute_indicators(closes, indicators)
+    for key, series in expected.items():
+        np.testing.assert_allclose(frame.values[key], series)
+
+    edited = closes.copy()
+    edited[10] += 5
+    frame = cache.get(_history(edited), indicators)
+    np.testing.assert_allclose(
+        frame.values["SMA:5"], compute_indicators(edited, indicators)["SMA:5"]
+    )
+
+
+def test_nan_bars_are_skipped_by_batch_and_streaming(closes):
+    """Test that NaN bars are skipped alike by the kernels and the streams"""
+    indicators = parse_indicators(["SMA:20", "EMA:10", "RSI:14", "MACD:12:26:9"])
+    gappy = closes.copy()
+    gappy[:5] = np.nan
+    gappy[150:153] = np.nan
+    gappy[250] = np.nan
+    valid = ~np.isnan(gappy)
+
+    expected = compute_indicators(gappy, indicators)
+    dense = compute_indicators(gappy[valid], indicators)
+    for key, series in expected.items():
+        assert np.isnan(series[~valid]).all()
+        np.testing.assert_allclose(series[valid], dense[key])
+
+    for warm_up in (0, 151, 300):
+        stream = IndicatorSet(indicators, gappy[:warm_up])
+        for t in range(warm_up, len(gappy)):
+            for key, value in stream.update(gappy[t]).items():
+                np.testing.assert_allclose(value, expected[key][t], rtol=1e-9)
+
+
+def test_indicator_cache_hits_with_nan_closes(closes):
+    """Test that histories holding NaN closes are extended, not recomputed"""
+    cache = IndicatorCache()
+    indicators = parse_indicators(["SMA:5"])
+    gappy = closes.copy()
+    gappy[100] = np.nan
+
+    first = cache.get(_history(gappy[:300]), indicators)
+    second = cache.get(_history(gappy[:350]), indicators)
+    third = cache.get(_history(gappy), indicators)
+    # Streamed into the first frame's buffer rather than recomputed
+    assert np.shares_memory(second.values["SMA:5"], third.values["SMA:5"])
+    np.testing.assert_allclose(
+        third.values["SMA:5"], compute_indicators(gappy, indicators)["SMA:5"]
+    )
+    assert len(first) == 300
@@ -0,0 +1,69 @@
+# tests/unit/test_market_data_ingest.py
+from datetime import date, datetime
+
+from sqlalchemy.orm import sessionmaker
+
+from stockalpha.api.schemas import CompanyCreate
+from stockalpha.collectors.market_data import CsvMarketDataProvider
+from stockalpha.models.entities import PriceData
+from stockalpha.repositories.company import company_repository
+from stockalpha.workers.market_data import ingest_market_data
+
+
+class RecordingProvider(CsvMarketDataProvider):
+    def __init__(self, directory):
+        super().__init__(directory, requests_per_second=100)
+        self.requests = []
+
+    def fetch(self, ticker, start, end):
+        self.requests.append((ticker, start, end))
+        return super().fetch(ticker, start, end)
+
+
+def test_ingest_market_data_from_watermark(db_session, tmp_path):
+    """Test that only bars after each company's latest price are fetched"""
+    company_id = company_repository.create(
+        db_session, obj_in=CompanyCreate(ticker="INGS", name="Ingest Co.")
+    ).id
+    db_session.add_all(
+        PriceData(company_id=company_id, date=datetime(2024, 6, day), close=day)
+        for day in (3, 4)
+    )
+    db_session.commit()
+
+    (tmp_path / "INGS.csv").write_text(
+        "date,open,high,low,close,adjusted_close,volume\n"
+        + "".join(
+            f"2024-06-0{day},{day},{day},{day},{day},,1000\n" for day in range(3, 8)
+        )
+    )
+    provider = RecordingProvider(str(tmp_path))
+    session_factory = sessionmaker(bind=db_session.get_bind())
+
+    stats = ingest_market_data(
+        provider,
+        company_ids=[company_id],
+        end=date(2024, 6, 6),
+        session_factory=session_factory,
+    )
+    assert provider.requests == [("INGS", date(2024, 6, 5), date(2024, 6, 6))]
+    assert (stats.companies, stats.bars, stats.inserted) == (1, 2, 2)
+
+    closes = (
+        db_session.query(PriceData.date, PriceData.close, PriceData.adjusted_close)
+        .filter(PriceData.company_id == company_id)
+        .order_by(PriceData.date)
+        .all()
+    )
+    assert [close for _, close, _ in closes] == [3, 4, 5, 6]
+    assert closes[-1].adjusted_close is None
+
+    # A rerun for the same end date has nothing to fetch
+    stats = ingest_market_data(
+        provider,
+        company_ids=[company_id],
+        end=date(2024, 6, 6),
+        session_factory=session_factory,
+    )
+    assert (stats.up_to_date, stats.companies, stats.inserted) == (1, 0, 0)
+    assert len(provider.requests) == 1
@@ -0,0 +1,151 @@
+# tests/unit/test_partitioning.py
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert, text
+
+from stockalpha.api.schemas import CompanyCreate, SignalCreate
+from stockalpha.models import partitioning
+from stockalpha.models.entities import Company, PriceData
+from stockalpha.models.partitioning import (
+    PartitionSpec,
+    create_tables,
+    enforce_retention,
+    ensure_partitions,
+    load_partition_specs,
+)
+from stockalpha.models.signals import Signal
+from stockalpha.repositories.company import company_repository
+from stockalpha.repositories.signal_repository import SignalRepository
+
+
+def test_partition_ranges():
+    """Test partition bounds and names by interval"""
+    monthly = PartitionSpec("signal", "month")
+    start = monthly.floor(datetime(2024, 12, 15, 9, 30))
+    assert start == datetime(2024, 12, 1)
+    assert monthly.next(start) == datetime(2025, 1, 1)
+    assert monthly.partition_name(start) == "signal_p202412"
+
+    yearly = PartitionSpec("pricedata", "year")
+    start = yearly.floor(datetime(2024, 6, 1))
+    assert (yearly.next(start), yearly.partition_name(start)) == (
+        datetime(2025, 1, 1),
+        "pricedata_p2024",
+    )
+
+    specs = load_partition_specs({"signal": {"retention_days": "365"}})
+    assert specs["signal"].retention_days == 365
+    with pytest.raises(ValueError, match="'signal'"):
+        load_partition_specs({"signal": {"retention_days": 0}})
+
+
+def test_retention_without_partitions(db_session):
+    """Test retention falling back to a DELETE where tables are not partitioned"""
+    company_id = company_repository.create(
+        db_session, obj_in=CompanyCreate(ticker="RETAIN", name="Retention Co.")
+    ).id
+    SignalRepository().create_batch(
+        db_session,
+        [
+            SignalCreate(
+                company_id=company_id,
+                date=datetime(year, 1, 2),
+                signal_type="technical",
+                direction=1,
+                strength=0.5,
+                confidence=0.5,
+            )
+            for year in (2015, 2016, 2030)
+        ],
+    )
+
+    connection = db_session.connection()
+    assert ensure_partitions(connection) == []
+    result = enforce_retention(connection, "signal", datetime(2017, 1, 1))
+    db_session.commit()
+
+    assert result.dropped == []
+    assert result.deleted == 2
+    dates = db_session.query(Signal.date).filter(Signal.company_id == company_id)
+    assert [d for (d,) in dates] == [datetime(2030, 1, 2)]
+
+
+# Partitioning only happens on PostgreSQL; these tests run when one is given
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+@pytest.fixture
+def pg_connection(monkeypatch):
+    """A PostgreSQL connection on a scratch schema, rolled back afterwards"""
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+
+    monkeypatch.setattr(
+        partitioning,
+        "partition_specs",
+        lambda: {
+            "pricedata": PartitionSpec("pricedata", "year"),
+            "signal": PartitionSpec("signal", "month"),
+        },
+    )
+    engine = create_engine(POSTGRES_URL)
+    schema = f"test_{uuid.uuid4().hex}"
+    # DDL is transactional on PostgreSQL, so the rollback drops the schema
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        connection.execute(text(f'CREATE SCHEMA "{schema}"'))
+        connection.execute(text(f'SET LOCAL search_path TO "{schema}"'))
+        try:
+            yield connection
+        finally:
+            transaction.rollback()
+    engine.dispose()
+
+
+def _partition_rows(connection, table):
+    return dict(
+        connection.execute(
+            text(f"SELECT tableoid::regclass::text, count(*) FROM {table} GROUP BY 1")
+        ).all()
+    )
+
+
+def test_partitioned_tables(pg_connection):
+    """Test partitioned creation, moving default rows and dropping by retention"""
+    create_tables(pg_connection)
+    create_tables(pg_connection)
+    assert partitioning._is_partitioned(pg_connection, "pricedata")
+    assert partitioning._is_partitioned(pg_connection, "signal")
+
+    # Rows written before any range partition covers them
+    now = datetime.utcnow()
+    company_id = pg_connection.execute(
+        insert(Company)
+        .values(ticker="PART", name="Partition Co.", created_at=now, updated_at=now)
+        .returning(Company.id)
+    ).scalar_one()
+    pg_connection.execute(
+        insert(PriceData),
+        [
+            {"company_id": company_id, "date": datetime(year, month, 1), "close": 1.0}
+            for year in (2018, 2019)
+            for month in (1, 7)
+        ],
+    )
+    assert _partition_rows(pg_connection, "pricedata") == {"pricedata_default": 4}
+
+    created = ensure_partitions(pg_connection, until=datetime(2020, 6, 1))
+    assert created[:3] == ["pricedata_p2018", "pricedata_p2019", "pricedata_p2020"]
+    assert "signal_p202009" in created
+    assert _partition_rows(pg_connection, "pricedata") == {
+        "pricedata_p2018": 2,
+        "pricedata_p2019": 2,
+    }
+    assert ensure_partitions(pg_connection, until=datetime(2020, 6, 1)) == []
+
+    result = enforce_retention(pg_connection, "pricedata", datetime(2019, 3, 1))
+    assert (result.dropped, result.deleted) == (["pricedata_p2018"], 1)
+    assert _partition_rows(pg_connection, "pricedata") == {"pricedata_p2019": 1}
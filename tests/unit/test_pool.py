@@ -0,0 +1,66 @@
+# tests/unit/test_pool.py
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from stockalpha.utils.pool import MeteredQueuePool, get_pool_metrics, instrument_pool
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_metrics_count_checkouts_waits_and_timeouts(engine):
+    """Test checkout metrics collected from an exhausted pool"""
+    metrics = instrument_pool(engine, pre_ping="never", ping_idle_seconds=0)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    snapshot = metrics.snapshot(engine.pool)
+    assert snapshot["connects"] == 1
+    assert snapshot["checkouts"] == 1
+    assert snapshot["checkins"] == 1
+    assert snapshot["waits"] == 1
+    assert snapshot["timeouts"] == 1
+    assert snapshot["checked_out"] == 0
+    assert sum(snapshot["checkout_seconds_buckets"].values()) == 1
+
+
+def test_idle_pre_ping(engine):
+    """Test that only connections idle past the threshold are pinged"""
+    metrics = instrument_pool(engine, pre_ping="idle", ping_idle_seconds=0)
+
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    # The first checkout opens a fresh connection, which needs no ping
+    assert metrics.pings == 2
+    assert metrics.ping_failures == 0
+
+    with pytest.raises(ValueError):
+        instrument_pool(engine, pre_ping="sometimes", ping_idle_seconds=0)
+
+
+def test_pool_metrics_survive_dispose(engine):
+    """Test that a recreated pool keeps feeding the same metrics"""
+    metrics = instrument_pool(engine, pre_ping="never", ping_idle_seconds=0)
+    assert get_pool_metrics(engine.pool) is metrics
+
+    engine.dispose()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert get_pool_metrics(engine.pool) is metrics
+    assert metrics.checkouts == 1
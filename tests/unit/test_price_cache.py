@@ -0,0 +1,99 @@
+# tests/unit/test_price_cache.py
+from datetime import date, datetime
+
+import numpy as np
+
+from stockalpha.repositories.price_cache import PriceHistory, PriceHistoryCache
+
+
+def _history(company_id, days, start_id=1):
+    rows = [
+        (start_id + i, datetime(2024, 1, day), None, None, None, float(day), None, 1e6)
+        for i, day in enumerate(days)
+    ]
+    return PriceHistory.from_rows(company_id, rows)
+
+
+def test_window_is_inclusive():
+    """Test date windows include both end dates"""
+    history = _history(1, [1, 2, 3, 4, 5])
+
+    window = history.window(start_date=date(2024, 1, 2), end_date=date(2024, 1, 4))
+
+    assert window.close.tolist() == [2.0, 3.0, 4.0]
+    assert window.to_records()[0] == {
+        "date": "2024-01-02T00:00:00",
+        "open": None,
+        "high": None,
+        "low": None,
+        "close": 2.0,
+        "adjusted_close": None,
+        "volume": 1e6,
+        "id": 2,
+        "company_id": 1,
+    }
+
+
+def test_merge_keeps_dates_sorted_and_unique():
+    """Test merging appended and back-filled rows"""
+    history = _history(1, [2, 4])
+
+    appended = history.merge(_history(1, [5, 6], start_id=10))
+    assert appended.close.tolist() == [2.0, 4.0, 5.0, 6.0]
+
+    backfilled = history.merge(_history(1, [1, 4], start_id=20))
+    assert backfilled.close.tolist() == [1.0, 2.0, 4.0]
+    assert backfilled.ids.tolist() == [20, 1, 21]
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+    """Test LRU eviction once the byte budget is exceeded"""
+    entry_size = _history(1, [1, 2, 3]).nbytes
+    cache = PriceHistoryCache(max_bytes=entry_size * 2)
+
+    cache.put(_history(1, [1, 2, 3]))
+    cache.put(_history(2, [1, 2, 3]))
+    assert cache.get(1) is not None  # 1 is now most recently used
+
+    cache.put(_history(3, [1, 2, 3]))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.get(3) is not None
+    assert cache.size == entry_size * 2
+
+
+def test_cache_update_only_touches_cached_companies():
+    """Test that writes merge into cached entries and skip the rest"""
+    cache = PriceHistoryCache(max_bytes=1 << 20)
+    cache.put(_history(1, [1, 2]))
+
+    cache.update(_history(1, [3], start_id=10))
+    cache.update(_history(2, [3], start_id=11))
+
+    assert cache.get(1).close.tolist() == [1.0, 2.0, 3.0]
+    assert cache.get(2) is None
+    assert np.isnan(cache.get(1).open).all()
+
+
+def test_cache_skips_replica_reads_soon_after_a_write():
+    """Test histories read from a lagging replica after a write are not kept"""
+    cache = PriceHistoryCache(max_bytes=1 << 20)
+    cache.put(_history(1, [1, 2]), replica_lag=60)
+    assert cache.get(1) is not None
+
+    # Only the written company is affected
+    cache.invalidate(1)
+    cache.put(_history(1, [1, 2]), replica_lag=60)
+    cache.put(_history(2, [1, 2]), replica_lag=60)
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+
+    cache.update(_history(2, [3], start_id=10))
+    cache.invalidate(2)
+    cache.put(_history(2, [1, 2]), replica_lag=60)
+    assert cache.get(2) is None
+
+    # Reads from the primary are always kept
+    cache.put(_history(1, [1, 2]))
+    assert cache.get(1) is not None
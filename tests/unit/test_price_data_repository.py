@@ -0,0 +1,53 @@
+# tests/unit/test_price_data_repository.py
+from datetime import datetime
+
+import pytest
+
+from stockalpha.api.schemas import CompanyCreate, PriceDataCreate
+from stockalpha.repositories.company import company_repository
+from stockalpha.repositories.price_data_repository import PriceDataRepository
+
+
+@pytest.fixture
+def company(db_session):
+    # The test database is shared by the whole session
+    return company_repository.get_by_ticker(
+        db_session, ticker="PRICE"
+    ) or company_repository.create(
+        db_session, obj_in=CompanyCreate(ticker="PRICE", name="Price Co.")
+    )
+
+
+def test_create_batch_skips_existing_rows(db_session, company):
+    """Test that create_batch only inserts new (company_id, date) rows"""
+    repo = PriceDataRepository()
+    batch = [
+        PriceDataCreate(company_id=company.id, date=datetime(2024, 1, day), close=day)
+        for day in (1, 2, 3)
+    ]
+
+    created = repo.create_batch(db_session, price_data_list=batch + batch[:1])
+    assert [p.close for p in created] == [1.0, 2.0, 3.0]
+    assert all(p.id is not None and p.created_at is not None for p in created)
+
+    created = repo.create_batch(
+        db_session,
+        price_data_list=batch
+        + [PriceDataCreate(company_id=company.id, date=datetime(2024, 1, 4), close=4)],
+    )
+    assert [p.close for p in created] == [4.0]
+
+
+def test_bulk_ingest_returns_inserted_ids(db_session, company):
+    """Test that bulk_ingest inserts raw rows and skips duplicates"""
+    repo = PriceDataRepository()
+    rows = [
+        {"company_id": company.id, "date": datetime(2023, 6, day), "close": 1.0}
+        for day in (1, 2)
+    ]
+
+    ids = repo.bulk_ingest(db_session, rows=rows + rows)
+    assert len(ids) == 2
+
+    assert repo.bulk_ingest(db_session, rows=rows) == []
+    assert repo.get_by_date(db_session, company.id, datetime(2023, 6, 2)).id in ids
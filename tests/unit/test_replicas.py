@@ -0,0 +1,56 @@
+# tests/unit/test_replicas.py
+import math
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from stockalpha.utils.replicas import Replica, ReplicaRouter
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    replicas = [
+        Replica(
+            name, create_engine(f"sqlite:///{tmp_path / name}.db", poolclass=QueuePool)
+        )
+        for name in ("a", "b")
+    ]
+    yield replicas
+    for replica in replicas:
+        replica.engine.dispose()
+
+
+def test_round_robin_skips_lagging_replicas(replicas):
+    """Test round-robin choice among replicas within the lag limit"""
+    router = ReplicaRouter(replicas, max_lag_seconds=1.0)
+    assert router.choose() is None  # Not measured yet
+
+    router.refresh()
+    assert [router.choose().name for _ in range(4)] == ["a", "b", "a", "b"]
+
+    replicas[0].lag_seconds = 10.0
+    assert {router.choose().name for _ in range(4)} == {"b"}
+
+    replicas[1].lag_seconds = math.inf
+    assert router.choose() is None
+
+
+def test_least_connections(replicas):
+    """Test choosing the replica with fewest checked-out connections"""
+    router = ReplicaRouter(replicas, strategy="least_connections")
+    router.refresh()
+
+    with replicas[0].engine.connect():
+        assert replicas[0].connections == 1
+        assert router.choose().name == "b"
+
+
+def test_stale_measurements_are_ignored(replicas):
+    """Test that replicas are skipped once their lag check is outdated"""
+    router = ReplicaRouter(replicas, check_seconds=1.0)
+    router.refresh()
+    for replica in replicas:
+        replica.checked_at -= 10
+
+    assert router.choose() is None
@@ -0,0 +1,157 @@
+# tests/unit/test_signal_pipeline.py
+import pickle
+from datetime import datetime
+
+import pytest
+
+from stockalpha.analysis.announcement_signals import AnnouncementSignalScorer
+from stockalpha.analysis.classifier import AnnouncementClassifier
+from stockalpha.api.schemas import CompanyCreate
+from stockalpha.models.entities import Announcement
+from stockalpha.models.signals import Signal
+from stockalpha.repositories.company import company_repository
+from stockalpha.workers.signals import (
+    generate_announcement_signals,
+    run_signal_pipeline,
+)
+
+
+class KeywordCategoryModel:
+    """Stand-in for a fitted classifier: 'beat' reads as earnings"""
+
+    classes_ = ["earnings", "legal", "other"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, texts):
+        self.calls += 1
+        return [
+            [0.8, 0.1, 0.1] if "beat" in text else [0.4, 0.35, 0.25] for text in texts
+        ]
+
+
+class KeywordSentimentModel:
+    def predict(self, texts):
+        return [0.9 if "beat" in text else -0.2 for text in texts]
+
+
+def test_generate_announcement_signals(db_session):
+    """Test chunked, idempotent signal generation for one partition"""
+    company_id = (
+        company_repository.get_id_by_ticker(db_session, ticker="ANNS")
+        or company_repository.create(
+            db_session, obj_in=CompanyCreate(ticker="ANNS", name="Announcing Co.")
+        ).id
+    )
+    announcements = [
+        Announcement(
+            company_id=company_id,
+            date=datetime(2024, 3, day),
+            title=f"Announcement {day}",
+            primary_category=category,
+            sentiment_score=sentiment,
+        )
+        for day, category, sentiment in [
+            (1, "earnings", 0.8),  # Strong buy
+            (2, "earnings", -0.9),  # Strong sell
+            (3, "earnings", 0.05),  # Neutral
+            (4, "other", 0.9),  # Category too weak for the threshold
+            (5, "guidance", None),  # Not classified yet
+        ]
+    ]
+    db_session.add_all(announcements)
+    db_session.commit()
+    ids = [a.id for a in announcements]
+
+    scorer = AnnouncementSignalScorer(min_confidence=0.7)
+    # Only this company, not announcements left by other tests
+    stats = generate_announcement_signals(
+        db_session, scorer=scorer, chunk_size=2, company_ids=[company_id]
+    )
+    assert stats.signals == 2
+    assert stats.skipped == 1
+
+    signals = (
+        db_session.query(Signal)
+        .filter(Signal.source_announcement_id.in_(ids))
+        .order_by(Signal.source_announcement_id)
+        .all()
+    )
+    assert [(s.source_announcement_id, s.direction) for s in signals] == [
+        (ids[0], 1),
+        (ids[1], -1),
+    ]
+    assert signals[0].date == datetime(2024, 3, 1)
+
+    processed = dict(
+        db_session.query(Announcement.id, Announcement.processed).filter(
+            Announcement.id.in_(ids)
+        )
+    )
+    assert [processed[i] for i in ids] == [True, True, True, True, False]
+
+    # A rerun only revisits the unclassified announcement
+    stats = generate_announcement_signals(
+        db_session, scorer=scorer, company_ids=[company_id]
+    )
+    assert (stats.announcements, stats.signals) == (0, 0)
+
+    with pytest.raises(ValueError):
+        run_signal_pipeline(partitions=2, partition=2)
+
+
+def test_generate_announcement_signals_classifies(db_session, tmp_path):
+    """Test unscored announcements are classified once and written back"""
+    model_path = tmp_path / "classifier.pkl"
+    with open(model_path, "wb") as f:
+        pickle.dump(
+            {"category": KeywordCategoryModel(), "sentiment": KeywordSentimentModel()},
+            f,
+        )
+    classifier = AnnouncementClassifier(str(model_path))
+
+    company_id = company_repository.create(
+        db_session, obj_in=CompanyCreate(ticker="CLSF", name="Classified Co.")
+    ).id
+    announcements = [
+        Announcement(
+            company_id=company_id,
+            date=datetime(2024, 4, day),
+            title=title,
+            content="Quarterly results",
+        )
+        for day, title in [(1, "Results beat"), (2, "Results beat"), (3, "Lawsuit")]
+    ]
+    db_session.add_all(announcements)
+    db_session.commit()
+    ids = [a.id for a in announcements]
+
+    stats = generate_announcement_signals(
+        db_session,
+        scorer=AnnouncementSignalScorer(min_confidence=0.7),
+        classifier=classifier,
+        # Only this company, not announcements left by other tests
+        company_ids=[company_id],
+    )
+    assert (stats.classified, stats.skipped, stats.signals) == (3, 0, 2)
+
+    # The repeated text is classified once, in a single model call
+    assert (classifier.misses, classifier.hits) == (2, 0)
+    assert classifier.model["category"].calls == 1
+    classifier.classify([("Lawsuit", "Quarterly results")])
+    assert classifier.hits == 1
+
+    rows = (
+        db_session.query(Announcement)
+        .filter(Announcement.id.in_(ids))
+        .order_by(Announcement.id)
+        .all()
+    )
+    assert [(a.primary_category, a.sub_categories) for a in rows] == [
+        ("earnings", []),
+        ("earnings", []),
+        ("other", ["legal"]),
+    ]
+    assert [a.sentiment_score for a in rows] == [0.9, 0.9, -0.2]
+    assert all(a.processed for a in rows)
@@ -0,0 +1,36 @@
+# tests/unit/test_signal_repository.py
+from datetime import datetime
+
+from stockalpha.api.schemas import CompanyCreate, SignalCreate
+from stockalpha.repositories.company import company_repository
+from stockalpha.repositories.signal_repository import SignalRepository
+
+
+def test_create_batch_returns_populated_rows_in_one_statement(db_session, statements):
+    """Test that create_batch inserts with RETURNING instead of refreshing rows"""
+    company = company_repository.get_by_ticker(
+        db_session, ticker="SIGB"
+    ) or company_repository.create(
+        db_session, obj_in=CompanyCreate(ticker="SIGB", name="Signal Batch Co.")
+    )
+    batch = [
+        SignalCreate(
+            company_id=company.id,
+            date=datetime(2024, 2, day),
+            signal_type="test",
+            direction=1,
+            strength=day / 10,
+            confidence=0.9,
+            reason="odd day" if day % 2 else None,
+            source_details={"day": day},
+        )
+        for day in range(1, 11)
+    ]
+
+    statements.clear()
+    created = SignalRepository().create_batch(db_session, signal_list=batch)
+    assert len([s for s in statements if s.lstrip().startswith("INSERT")]) == 1
+    assert not [s for s in statements if s.lstrip().startswith("SELECT")]
+    assert [s.strength for s in created] == [day / 10 for day in range(1, 11)]
+    assert all(s.id is not None and s.created_at is not None for s in created)
+    assert created[-1].source_details == {"day": 10}
@@ -0,0 +1,123 @@
+# tests/unit/test_universe_snapshot.py
+from datetime import date, datetime
+
+import numpy as np
+
+from stockalpha.api.schemas import (
+    CompanyCreate,
+    FundamentalDataCreate,
+    PriceDataCreate,
+    SignalCreate,
+)
+from stockalpha.backtesting.universe import load_universe_panel
+from stockalpha.repositories.company import company_repository
+from stockalpha.repositories.fundamental_data_repository import (
+    FundamentalDataRepository,
+)
+from stockalpha.repositories.price_data_repository import PriceDataRepository
+from stockalpha.repositories.signal_repository import SignalRepository
+from stockalpha.repositories.universe_snapshot import universe_panel_cache
+
+
+def test_panel_is_point_in_time(db_session):
+    """Test that each day only sees reports and signals dated on or before it"""
+    companies = [
+        company_repository.create(
+            db_session, obj_in=CompanyCreate(ticker=ticker, name=f"{ticker} Inc.")
+        ).id
+        for ticker in ("PITA", "PITB")
+    ]
+    first, second = companies
+    PriceDataRepository().create_batch(
+        db_session,
+        [
+            PriceDataCreate(
+                company_id=company_id, date=datetime(2024, 1, day), close=day
+            )
+            for company_id in companies
+            for day in (2, 3, 4, 5)
+            # The second company did not trade on the 3rd
+            if (company_id, day) != (second, 3)
+        ],
+    )
+
+    def report(year, quarter, reported, revenue):
+        return FundamentalDataCreate(
+            company_id=first,
+            period="quarterly",
+            fiscal_year=year,
+            fiscal_quarter=quarter,
+            report_date=reported,
+            revenue=revenue,
+        )
+
+    FundamentalDataRepository().create_batch(
+        db_session,
+        fundamental_data_list=[
+            # Before the window; known from its first day
+            report(2023, 2, datetime(2023, 8, 1), 80.0),
+            report(2023, 3, datetime(2023, 11, 1), 90.0),
+            # Within the window; known from the day it was reported
+            report(2023, 4, datetime(2024, 1, 4, 16, 30), 100.0),
+        ],
+    )
+    SignalRepository().create_batch(
+        db_session,
+        [
+            SignalCreate(
+                company_id=second,
+                date=datetime(2024, 1, 3),
+                signal_type="technical",
+                direction=-1,
+                strength=0.5,
+                confidence=0.7,
+            )
+        ],
+    )
+
+    panel = load_universe_panel(
+        db_session, date(2024, 1, 2), date(2024, 1, 5), company_ids=companies
+    )
+    assert panel.shape == (4, 2)
+    assert list(panel.company_ids) == companies
+    close = panel.fields["close"]
+    assert np.isnan(close[1, 1]) and close[1, 0] == 3.0
+
+    revenue = panel.fields["revenue"][:, 0]
+    assert list(revenue) == [90.0, 90.0, 100.0, 100.0]
+    assert panel.fields["report_date"][0, 0] == np.datetime64("2023-11-01")
+    assert np.isnan(panel.fields["revenue"][:, 1]).all()
+
+    direction = panel.fields["signal_direction"][:, 1]
+    assert np.isnan(direction[0]) and list(direction[1:]) == [-1.0, -1.0, -1.0]
+    assert panel.to_json()["fields"]["signal_direction"][0] == [None, None]
+
+    # Served from the cache until any of the three tables is written
+    same = load_universe_panel(
+        db_session, date(2024, 1, 2), date(2024, 1, 5), company_ids=companies
+    )
+    assert same is panel
+    PriceDataRepository().create_batch(
+        db_session,
+        [PriceDataCreate(company_id=second, date=datetime(2024, 1, 3), close=3)],
+    )
+    panel = load_universe_panel(
+        db_session, date(2024, 1, 2), date(2024, 1, 5), company_ids=companies
+    )
+    assert panel is not same and panel.fields["close"][1, 1] == 3.0
+
+    # A universe restricts the company axis, keeping companies without bars
+    universe_panel_cache.invalidate()
+    panel = load_universe_panel(
+        db_session, date(2024, 1, 5), date(2024, 1, 5), company_ids=[second, 0]
+    )
+    assert list(panel.company_ids) == [0, second]
+    assert np.isnan(panel.fields["close"][0, 0]) and panel.fields["close"][0, 1] == 5.0
+
+    # A replica read that soon after a write may miss it, so it is not kept
+    universe_panel_cache.invalidate()
+    args = (db_session, date(2024, 1, 5), date(2024, 1, 5), [second])
+    lagging = load_universe_panel(*args, replica_lag=60)
+    assert load_universe_panel(*args, replica_lag=60) is not lagging
+    cached = load_universe_panel(*args)
+    assert load_universe_panel(*args, replica_lag=60) is cached